@@ -0,0 +1,319 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+
+from grafo_csr import GrafoCSR
+from grafos import (camino_mas_corto, recomendar_amigos, obtener_subgrafo,
+                    analizar_grafo, merge_sort_posts_por_likes, VisualizadorGrafo)
+
+
+# Benchmark de los algoritmos de grafos.py sobre redes sociales sinteticas
+#
+# Cada generador es determinista para una semilla dada (usa su propio
+# random.Random), asi dos commits miden exactamente los mismos grafos.
+# Por cada (modelo, tamaño, funcion) se guarda el mejor tiempo de varias
+# repeticiones y, en una corrida aparte bajo tracemalloc, el pico de
+# memoria y los bloques que quedaron asignados al terminar.
+
+TAMAÑOS_POR_DEFECTO = (1000, 10000, 100000)
+MODELOS = ("erdos_renyi", "barabasi_albert", "watts_strogatz")
+GRADO_MEDIO = 10
+CONSULTAS = 100          # pares / usuarios por medicion
+NODOS_LAYOUT = 100       # el layout es O(n^2): se mide sobre un vecindario
+
+
+# Generadores de grafos (listas de aristas con ids como en amistades.xlsx)
+def generar_erdos_renyi(n, grado_medio=GRADO_MEDIO, semilla=0):
+    #G(n, m): m = n * grado_medio / 2 aristas elegidas al azar sin repetir
+    rng = random.Random(semilla)
+    m = n * grado_medio // 2
+    vistas = set()
+    aristas = []
+    while len(aristas) < m:
+        a = rng.randrange(n)
+        b = rng.randrange(n)
+        if a == b:
+            continue
+        par = (a, b) if a < b else (b, a)
+        if par in vistas:
+            continue
+        vistas.add(par)
+        aristas.append((str(a), str(b)))
+    return aristas
+
+
+def generar_barabasi_albert(n, grado_medio=GRADO_MEDIO, semilla=0):
+    """
+    Union preferencial: cada nodo nuevo se conecta a m = grado_medio / 2
+    nodos existentes elegidos con probabilidad proporcional a su grado
+    (grados con distribucion de ley de potencias).
+    """
+    rng = random.Random(semilla)
+    m = max(1, grado_medio // 2)
+    aristas = []
+    extremos = []   # cada nodo aparece una vez por arista: muestreo por grado
+    # Nucleo inicial: m + 1 nodos completamente conectados
+    for a in range(m + 1):
+        for b in range(a + 1, m + 1):
+            aristas.append((str(a), str(b)))
+            extremos.extend((a, b))
+    for nodo in range(m + 1, n):
+        elegidos = set()
+        while len(elegidos) < m:
+            elegidos.add(extremos[rng.randrange(len(extremos))])
+        for destino in elegidos:
+            aristas.append((str(nodo), str(destino)))
+            extremos.extend((nodo, destino))
+    return aristas
+
+
+def generar_watts_strogatz(n, grado_medio=GRADO_MEDIO, semilla=0, p=0.1):
+    """
+    Mundo pequeño: anillo donde cada nodo se une a sus grado_medio / 2
+    vecinos siguientes; cada arista se reconecta con probabilidad p.
+    """
+    rng = random.Random(semilla)
+    k = max(1, grado_medio // 2)
+    adyacentes = set()
+    for a in range(n):
+        for salto in range(1, k + 1):
+            b = (a + salto) % n
+            if rng.random() < p:
+                b = rng.randrange(n)
+                while b == a or (min(a, b), max(a, b)) in adyacentes:
+                    b = rng.randrange(n)
+            par = (a, b) if a < b else (b, a)
+            if a != b:
+                adyacentes.add(par)
+    return [(str(a), str(b)) for a, b in sorted(adyacentes)]
+
+
+GENERADORES = {
+    "erdos_renyi": generar_erdos_renyi,
+    "barabasi_albert": generar_barabasi_albert,
+    "watts_strogatz": generar_watts_strogatz,
+}
+
+
+# Medicion
+def medir(funcion, repeticiones=3):
+    """
+    Ejecuta funcion() varias veces y retorna un diccionario con:
+    - segundos: mejor tiempo de pared
+    - pico_bytes: pico de memoria de Python durante la llamada (tracemalloc)
+    - bloques_netos: bloques que siguen asignados al terminar (incluye el resultado)
+    - colecciones_gc: recolecciones de la generacion 0 (presion de asignaciones)
+    """
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    gc.collect()
+    colecciones = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    resultado = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    colecciones = gc.get_stats()[0]["collections"] - colecciones
+
+    diferencia = despues.compare_to(antes, "filename")
+    bloques = sum(d.count_diff for d in diferencia)
+    del resultado
+
+    return {
+        "segundos": mejor,
+        "pico_bytes": pico,
+        "bloques_netos": bloques,
+        "colecciones_gc": colecciones,
+    }
+
+
+def _vecindario(grafo, inicio, limite):
+    #Los primeros `limite` nodos alcanzados por BFS desde inicio
+    vistos = {inicio}
+    cola = deque([inicio])
+    while cola and len(vistos) < limite:
+        for vecino in grafo[cola.popleft()]:
+            if vecino not in vistos:
+                vistos.add(vecino)
+                cola.append(vecino)
+                if len(vistos) >= limite:
+                    break
+    return vistos
+
+
+def casos_de_prueba(grafo, semilla=0, consultas=CONSULTAS, nodos_layout=NODOS_LAYOUT):
+    """
+    Retorna [(nombre, funcion), ...] con las funciones de grafos.py a medir
+    sobre el grafo dado. Las entradas (pares, usuarios, likes) se eligen con
+    la semilla para que sean iguales entre corridas.
+    """
+    rng = random.Random(semilla)
+    ids = list(grafo.keys())
+    usuarios = {id_: f"Usuario {id_}" for id_ in ids}
+    pares = [(rng.choice(ids), rng.choice(ids)) for _ in range(consultas)]
+    consultados = [rng.choice(ids) for _ in range(consultas)]
+    centrales = [rng.choice(ids) for _ in range(5)]
+    likes_por_post = [(i, rng.randrange(1000)) for i in range(len(ids))]
+
+    nodos_layout = _vecindario(grafo, consultados[0], nodos_layout)
+    visualizador = VisualizadorGrafo(None, grafo, usuarios)
+    visualizador.cache_layouts = None   # medir el calculo, no la cache
+
+    def layout():
+        random.seed(semilla)  # posiciones iniciales del layout
+        return visualizador.calcular_layout_fuerza(nodos_layout)
+
+    return [
+        ("camino_mas_corto",
+         lambda: [camino_mas_corto(grafo, a, b) for a, b in pares]),
+        ("recomendar_amigos",
+         lambda: [recomendar_amigos(grafo, u, k=10) for u in consultados]),
+        ("obtener_subgrafo",
+         lambda: obtener_subgrafo(grafo, centrales, saltos=2)),
+        ("analizar_grafo",
+         lambda: analizar_grafo(grafo, usuarios)),
+        ("merge_sort_posts_por_likes",
+         lambda: merge_sort_posts_por_likes(likes_por_post)),
+        ("calcular_layout_fuerza",
+         layout),
+    ]
+
+
+def ejecutar(tamaños=TAMAÑOS_POR_DEFECTO, modelos=MODELOS, semilla=0,
+             repeticiones=3, funciones=None, representacion="csr"):
+    """
+    Corre todos los casos para cada modelo y tamaño.
+
+    Args:
+        representacion: "csr" (GrafoCSR, como la app) o "dict" ({id: [vecinos]})
+        funciones: nombres de funciones a medir (None = todas)
+
+    Returns:
+        lista de filas (diccionarios) con los resultados
+    """
+    filas = []
+    for modelo in modelos:
+        for n in tamaños:
+            inicio = time.perf_counter()
+            aristas = GENERADORES[modelo](n, semilla=semilla)
+            if representacion == "csr":
+                grafo = GrafoCSR.desde_aristas(aristas)
+            else:
+                grafo = {}
+                for a, b in aristas:
+                    grafo.setdefault(a, []).append(b)
+                    grafo.setdefault(b, []).append(a)
+            generacion = time.perf_counter() - inicio
+            del aristas
+
+            for nombre, funcion in casos_de_prueba(grafo, semilla):
+                if funciones and nombre not in funciones:
+                    continue
+                fila = {
+                    "modelo": modelo,
+                    "nodos": len(grafo),
+                    "aristas": sum(len(v) for v in grafo.values()) // 2,
+                    "representacion": representacion,
+                    "funcion": nombre,
+                    "generacion_s": generacion,
+                }
+                fila.update(medir(funcion, repeticiones))
+                filas.append(fila)
+                print(f"{modelo:<16}{n:>9} {nombre:<28}{fila['segundos']:>10.4f} s"
+                      f"{fila['pico_bytes'] / 1e6:>10.2f} MB", file=sys.stderr)
+    return filas
+
+
+# Reporte
+def _commit_actual():
+    #Hash del commit de git, con "-dirty" si hay cambios sin commitear (None fuera de git)
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, cwd=carpeta).stdout.strip()
+        cambios = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                 capture_output=True, text=True, cwd=carpeta).stdout.strip()
+    except OSError:
+        return None
+    if not commit:
+        return None
+    return commit + "-dirty" if cambios else commit
+
+
+def metadatos(semilla, repeticiones):
+    return {
+        "commit": _commit_actual(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": semilla,
+        "repeticiones": repeticiones,
+    }
+
+
+def guardar_json(ruta, filas, meta):
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump({"metadatos": meta, "resultados": filas}, f, indent=2,
+                  ensure_ascii=False)
+
+
+def guardar_csv(ruta, filas, meta):
+    #Una fila por medicion; commit y fecha en cada fila para juntar varios CSV
+    if not filas:
+        return
+    columnas = ["commit", "fecha"] + list(filas[0])
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=columnas)
+        escritor.writeheader()
+        for fila in filas:
+            escritor.writerow({"commit": meta["commit"], "fecha": meta["fecha"], **fila})
+
+
+def _enteros(texto):
+    return [int(float(t)) for t in texto.split(",") if t]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark de grafos.py sobre grafos sinteticos")
+    parser.add_argument("--tamaños", type=_enteros, default=list(TAMAÑOS_POR_DEFECTO),
+                        help="cantidades de nodos separadas por coma (p. ej. 1000,1e6)")
+    parser.add_argument("--modelos", default=",".join(MODELOS),
+                        help="modelos separados por coma: " + ", ".join(MODELOS))
+    parser.add_argument("--funciones", default="",
+                        help="funciones a medir separadas por coma (vacio = todas)")
+    parser.add_argument("--representacion", choices=("csr", "dict"), default="csr")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--json", default="benchmark.json", help="reporte JSON")
+    parser.add_argument("--csv", default="benchmark.csv", help="reporte CSV")
+    args = parser.parse_args()
+
+    filas = ejecutar(tamaños=args.tamaños,
+                     modelos=[m for m in args.modelos.split(",") if m],
+                     semilla=args.semilla,
+                     repeticiones=args.repeticiones,
+                     funciones=set(f for f in args.funciones.split(",") if f),
+                     representacion=args.representacion)
+    meta = metadatos(args.semilla, args.repeticiones)
+    if args.json:
+        guardar_json(args.json, filas, meta)
+    if args.csv:
+        guardar_csv(args.csv, filas, meta)
+    print(f"{len(filas)} mediciones guardadas (commit {meta['commit']})")
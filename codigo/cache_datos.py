@@ -0,0 +1,196 @@
+import os
+import pickle
+import hashlib
+import time
+import functools
+
+
+# Version del formato de snapshot (cambiarla invalida todos los snapshots)
+VERSION_SNAPSHOT = 1
+NOMBRE_CARPETA_CACHE = ".cache"
+
+
+# Firma de un archivo Excel
+def firma_archivo(archivo):
+    #Devuelve (mtime_ns, tamaño) del archivo, barato de calcular
+    st = os.stat(archivo)
+    return st.st_mtime_ns, st.st_size
+
+
+def hash_archivo(archivo):
+    #Hash SHA-1 del contenido, se usa cuando cambia el mtime pero no el tamaño
+    h = hashlib.sha1()
+    with open(archivo, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 16), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def firma_contenido(archivo):
+    #(tamaño, sha1): no cambia si solo se toca el mtime del archivo
+    return os.path.getsize(archivo), hash_archivo(archivo)
+
+
+def _ruta_snapshot(archivo, nombre):
+    carpeta = os.path.join(os.path.dirname(archivo), NOMBRE_CARPETA_CACHE)
+    return os.path.join(carpeta, f"{nombre}.pkl")
+
+
+def _leer_cabecera(ruta):
+    """
+    Lee solo la cabecera del snapshot (sin deserializar los datos).
+    Retorna (cabecera, archivo_abierto) o (None, None) si no es válido.
+    """
+    try:
+        f = open(ruta, "rb")
+    except OSError:
+        return None, None
+    try:
+        cabecera = pickle.load(f)
+    except Exception:
+        f.close()
+        return None, None
+    if not isinstance(cabecera, dict) or cabecera.get("version") != VERSION_SNAPSHOT:
+        f.close()
+        return None, None
+    return cabecera, f
+
+
+def _escribir_snapshot(ruta, cabecera, datos):
+    #Escritura atomica: archivo temporal + os.replace
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tmp = ruta + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(cabecera, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, ruta)
+
+
+def cargar_con_snapshot(archivo, nombre, cargador):
+    """
+    Devuelve el resultado de cargador() reutilizando el snapshot binario
+    si el Excel no cambió desde la última carga.
+
+    Args:
+        archivo: ruta al .xlsx del que depende el cargador
+        nombre: nombre del snapshot (uno por cargador)
+        cargador: funcion sin argumentos que parsea el Excel con openpyxl
+
+    Returns:
+        los mismos datos que devolveria cargador()
+    """
+    if not os.path.exists(archivo):
+        # Sin Excel no hay nada que cachear (el cargador decide qué hacer)
+        return cargador()
+
+    ruta = _ruta_snapshot(archivo, nombre)
+    mtime, tam = firma_archivo(archivo)
+
+    cabecera, f = _leer_cabecera(ruta)
+    if cabecera is not None:
+        try:
+            valido = cabecera["mtime"] == mtime and cabecera["tam"] == tam
+            refrescar = False
+            if not valido and cabecera["tam"] == tam:
+                # Mismo tamaño con otro mtime (copia, checkout...): comparar hash
+                valido = cabecera["sha1"] == hash_archivo(archivo)
+                refrescar = valido
+            if valido:
+                datos = pickle.load(f)
+                f.close()
+                if refrescar:
+                    cabecera["mtime"] = mtime
+                    _escribir_snapshot(ruta, cabecera, datos)
+                return datos
+        except Exception:
+            # Snapshot corrupto: se trata como fallo de cache
+            pass
+        finally:
+            f.close()
+
+    datos = cargador()
+    cabecera = {
+        "version": VERSION_SNAPSHOT,
+        "mtime": mtime,
+        "tam": tam,
+        "sha1": hash_archivo(archivo),
+    }
+    try:
+        _escribir_snapshot(ruta, cabecera, datos)
+    except OSError:
+        # Carpeta de solo lectura: seguimos sin cache
+        pass
+    return datos
+
+
+def con_snapshot(archivo):
+    """
+    Decorador para los cargar_* de grafos.py.
+    El snapshot se guarda en <carpeta del Excel>/.cache/<funcion>.pkl
+    """
+    def decorador(cargador):
+        @functools.wraps(cargador)
+        def envoltura():
+            return cargar_con_snapshot(archivo, cargador.__name__, cargador)
+        # Acceso directo al cargador original (sin cache)
+        envoltura.sin_cache = cargador
+        return envoltura
+    return decorador
+
+
+def limpiar_snapshots(carpeta_dataset):
+    #Borra todos los snapshots de la carpeta del dataset
+    carpeta = os.path.join(carpeta_dataset, NOMBRE_CARPETA_CACHE)
+    if not os.path.isdir(carpeta):
+        return 0
+    borrados = 0
+    for nombre in os.listdir(carpeta):
+        if nombre.endswith(".pkl") or nombre.endswith(".tmp"):
+            os.remove(os.path.join(carpeta, nombre))
+            borrados += 1
+    return borrados
+
+
+# Medicion de arranque en frio vs en caliente
+def medir_arranque():
+    """
+    Carga los cinco Excel dos veces: primero sin snapshots (frio) y luego
+    reutilizandolos (caliente). Retorna {cargador: (t_frio, t_caliente)}.
+    """
+    import grafos
+
+    cargadores = [
+        grafos.cargar_usuarios,
+        grafos.cargar_grafo,
+        grafos.cargar_comunidades,
+        grafos._cargar_posts_xlsx,
+        grafos._cargar_likes_xlsx,
+    ]
+
+    limpiar_snapshots(grafos.DATASET_DIR)
+
+    tiempos = {}
+    for cargador in cargadores:
+        inicio = time.perf_counter()
+        cargador()
+        tiempos[cargador.__name__] = [time.perf_counter() - inicio, 0.0]
+
+    for cargador in cargadores:
+        inicio = time.perf_counter()
+        cargador()
+        tiempos[cargador.__name__][1] = time.perf_counter() - inicio
+
+    return {nombre: tuple(t) for nombre, t in tiempos.items()}
+
+
+if __name__ == "__main__":
+    resultados = medir_arranque()
+    total_frio = sum(t[0] for t in resultados.values())
+    total_caliente = sum(t[1] for t in resultados.values())
+
+    print(f"{'cargador':<22}{'frio (s)':>12}{'caliente (s)':>14}")
+    for nombre, (frio, caliente) in resultados.items():
+        print(f"{nombre:<22}{frio:>12.4f}{caliente:>14.4f}")
+    print(f"{'TOTAL':<22}{total_frio:>12.4f}{total_caliente:>14.4f}")
+    if total_caliente > 0:
+        print(f"Aceleracion: x{total_frio / total_caliente:.1f}")
@@ -0,0 +1,124 @@
+import heapq
+from collections import deque
+
+
+# Motor de caminos mas cortos (grafos no dirigidos, sin pesos)
+#
+# Las funciones reciben `vecinos`, una funcion nodo -> iterable de vecinos,
+# asi sirven tanto para el diccionario de cargar_grafo (ids str) como para
+# los indices enteros de GrafoCSR.
+
+
+def _reconstruir_camino(padres, nodo):
+    #Sigue los punteros a padre desde nodo hasta el origen (padre None)
+    camino = []
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = padres[nodo]
+    camino.reverse()
+    return camino
+
+
+def bfs_padres(vecinos, inicio, destino):
+    """
+    BFS con mapa de padres: cada nodo se encola una sola vez y el camino
+    se reconstruye al final, sin copiar listas en cada paso.
+    Retorna la lista de nodos inicio..destino o None si no hay camino.
+    """
+    if inicio == destino:
+        return [inicio]
+
+    padres = {inicio: None}
+    cola = deque([inicio])
+
+    while cola:
+        nodo = cola.popleft()
+        for vecino in vecinos(nodo):
+            if vecino not in padres:
+                padres[vecino] = nodo
+                if vecino == destino:
+                    return _reconstruir_camino(padres, vecino)
+                cola.append(vecino)
+    return None
+
+
+def bfs_bidireccional(vecinos, inicio, destino):
+    """
+    BFS bidireccional: avanza por niveles desde ambos extremos, expandiendo
+    siempre la frontera mas pequeña, y se detiene cuando las busquedas se
+    encuentran. Devuelve un camino con la misma cantidad de saltos que BFS.
+    """
+    if inicio == destino:
+        return [inicio]
+
+    padres_ini = {inicio: None}
+    padres_fin = {destino: None}
+    frontera_ini = [inicio]
+    frontera_fin = [destino]
+
+    while frontera_ini and frontera_fin:
+        desde_inicio = len(frontera_ini) <= len(frontera_fin)
+        if desde_inicio:
+            frontera, propios, otros = frontera_ini, padres_ini, padres_fin
+        else:
+            frontera, propios, otros = frontera_fin, padres_fin, padres_ini
+
+        siguiente = []
+        for nodo in frontera:
+            for vecino in vecinos(nodo):
+                if vecino in otros:
+                    # Primer encuentro: todos los encuentros de este nivel
+                    # tienen la misma longitud, asi que ya es minimo
+                    if desde_inicio:
+                        izquierda = _reconstruir_camino(padres_ini, nodo)
+                        derecha = _reconstruir_camino(padres_fin, vecino)
+                    else:
+                        izquierda = _reconstruir_camino(padres_ini, vecino)
+                        derecha = _reconstruir_camino(padres_fin, nodo)
+                    derecha.reverse()
+                    return izquierda + derecha
+                if vecino not in propios:
+                    propios[vecino] = nodo
+                    siguiente.append(vecino)
+
+        if desde_inicio:
+            frontera_ini = siguiente
+        else:
+            frontera_fin = siguiente
+
+    return None
+
+
+def a_estrella(vecinos, inicio, destino, heuristica):
+    """
+    A* sobre un grafo sin pesos. Con una heuristica admisible y consistente
+    (como las cotas de landmarks) el camino devuelto es minimo.
+    """
+    if inicio == destino:
+        return [inicio]
+
+    padres = {inicio: None}
+    distancias = {inicio: 0}
+    abiertos = [(heuristica(inicio), 0, inicio)]  # (f, -g, nodo)
+    cerrados = set()
+
+    while abiertos:
+        _, menos_g, nodo = heapq.heappop(abiertos)
+        g = -menos_g
+        if nodo == destino:
+            return _reconstruir_camino(padres, nodo)
+        if nodo in cerrados:
+            continue
+        cerrados.add(nodo)
+
+        g_vecino = g + 1
+        for vecino in vecinos(nodo):
+            if vecino in cerrados:
+                continue
+            if g_vecino < distancias.get(vecino, g_vecino + 1):
+                distancias[vecino] = g_vecino
+                padres[vecino] = nodo
+                # Desempate por mayor g: avanza hacia el destino primero
+                heapq.heappush(abiertos, (g_vecino + heuristica(vecino), -g_vecino, vecino))
+
+    return None
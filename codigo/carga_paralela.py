@@ -0,0 +1,167 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import grafos
+import xlsx_stream
+from grafo_csr import GrafoCSR
+
+
+# Carga de los cinco Excel en paralelo
+#
+# Cada Excel se parsea en su propio proceso (openpyxl usa un solo nucleo
+# y tiene el GIL tomado todo el tiempo, por eso procesos y no hilos).
+# amistades.xlsx, que es el mas grande, se puede repartir ademas por
+# rangos de filas (partes_amistades > 1); el GrafoCSR se arma en el
+# proceso principal con los trozos en orden, asi queda identico al de
+# cargar_grafo_csr. Por defecto NO se parte: cada trozo igual tiene que
+# recorrer el XML desde la fila 1 hasta su rango, asi que el trabajo total
+# crece con la cantidad de partes y el ultimo trozo cuesta tanto como leer
+# el archivo entero. Solo conviene si una medicion (--partes) lo confirma.
+
+TABLAS = ("usuarios", "comunidades", "posts", "likes")
+
+
+def _cargar_tabla(tabla, usar_snapshots=True):
+    #Corre en un proceso del pool: devuelve lo que leyo el cargador de la tabla
+    cargadores = {
+        "usuarios": grafos.cargar_usuarios,
+        "comunidades": grafos.cargar_comunidades,
+        "posts": grafos._cargar_posts_xlsx,
+        "likes": grafos._cargar_likes_xlsx,
+        "grafo": grafos.cargar_grafo_csr,
+    }
+    cargador = cargadores[tabla]
+    if not usar_snapshots:
+        cargador = cargador.sin_cache
+    return cargador()
+
+
+def _leer_filas_amistades(fila_inicio, fila_fin):
+    #Corre en un proceso del pool: aristas de un rango de filas
+    return list(grafos._leer_aristas(fila_inicio, fila_fin))
+
+
+def _filas_amistades():
+    #Ultima fila de amistades.xlsx segun la dimension de la hoja (None si no la informa)
+    try:
+        return xlsx_stream.ultima_fila(grafos._ruta_dataset("amistades.xlsx"))
+    except FileNotFoundError:
+        return None
+
+
+def rangos_de_filas(ultima_fila, partes, primera_fila=2):
+    #Reparte las filas primera_fila..ultima_fila en rangos (inicio, fin) contiguos
+    total = ultima_fila - primera_fila + 1
+    if total <= 0:
+        return []
+    tam = -(-total // partes)
+    return [(inicio, min(inicio + tam - 1, ultima_fila))
+            for inicio in range(primera_fila, ultima_fila + 1, tam)]
+
+
+def cargar_en_paralelo(procesos=None, partes_amistades=1, usar_snapshots=True):
+    """
+    Carga las cinco tablas a la vez en un pool de procesos.
+
+    Args:
+        procesos: tamaño del pool (None = todos los nucleos)
+        partes_amistades: en cuantos rangos de filas partir amistades.xlsx
+                          (1 = no partir; ver el comentario del modulo)
+        usar_snapshots: si es False se parsean siempre los Excel (para medir)
+
+    Returns:
+        {"usuarios": salida de cargar_usuarios,
+         "grafo": GrafoCSR (igual a cargar_grafo_csr),
+         "comunidades": salida de cargar_comunidades,
+         "posts": salida de cargar_posts,
+         "likes": salida de cargar_likes}
+
+    Con amistades.xlsx partido no se escribe su snapshot (los trozos no
+    pasan por cargar_grafo_csr).
+    """
+    procesos = procesos or os.cpu_count() or 1
+
+    rangos = []
+    if partes_amistades > 1:
+        ultima = _filas_amistades()
+        if ultima:
+            rangos = rangos_de_filas(ultima, partes_amistades)
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        # amistades primero: es la tarea mas larga
+        if len(rangos) > 1:
+            trozos = [pool.submit(_leer_filas_amistades, inicio, fin) for inicio, fin in rangos]
+        else:
+            trozos = None
+            futuro_grafo = pool.submit(_cargar_tabla, "grafo", usar_snapshots)
+        futuros = {tabla: pool.submit(_cargar_tabla, tabla, usar_snapshots) for tabla in TABLAS}
+
+        if trozos is not None:
+            grafo = GrafoCSR.desde_aristas(chain.from_iterable(t.result() for t in trozos))
+        else:
+            grafo = futuro_grafo.result()
+        leidos = {tabla: futuro.result() for tabla, futuro in futuros.items()}
+
+    # posts y likes: la base del Excel leida en el pool mas lo que este en el .log
+    grafos._registro_posts().usar_base(leidos["posts"])
+    grafos._registro_likes().usar_base(leidos["likes"])
+
+    return {
+        "usuarios": leidos["usuarios"],
+        "grafo": grafo,
+        "comunidades": leidos["comunidades"],
+        "posts": grafos.cargar_posts(),
+        "likes": grafos.cargar_likes(),
+    }
+
+
+def cargar_en_secuencia(usar_snapshots=True):
+    #Las mismas cinco cargas una detras de otra (referencia para medir)
+    grafos._registro_posts().usar_base(_cargar_tabla("posts", usar_snapshots))
+    grafos._registro_likes().usar_base(_cargar_tabla("likes", usar_snapshots))
+    return {
+        "usuarios": _cargar_tabla("usuarios", usar_snapshots),
+        "grafo": _cargar_tabla("grafo", usar_snapshots),
+        "comunidades": _cargar_tabla("comunidades", usar_snapshots),
+        "posts": grafos.cargar_posts(),
+        "likes": grafos.cargar_likes(),
+    }
+
+
+# Medicion
+def medir_aceleracion(procesos=None, partes_amistades=1):
+    """
+    Parsea los Excel (sin snapshots) en secuencia y en paralelo.
+    Retorna (t_secuencial, t_paralelo, iguales) donde iguales indica si
+    ambos caminos dieron los mismos datos.
+    """
+    inicio = time.perf_counter()
+    secuencial = cargar_en_secuencia(usar_snapshots=False)
+    t_secuencial = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = cargar_en_paralelo(procesos, partes_amistades, usar_snapshots=False)
+    t_paralelo = time.perf_counter() - inicio
+
+    g1, g2 = secuencial.pop("grafo"), paralelo.pop("grafo")
+    iguales = (g1.ids == g2.ids and g1.offsets == g2.offsets
+               and g1.vecinos == g2.vecinos and secuencial == paralelo)
+    return t_secuencial, t_paralelo, iguales
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga secuencial vs paralela de los Excel")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--partes", type=int, default=1,
+                        help="rangos de filas de amistades.xlsx (por defecto 1, sin partir)")
+    args = parser.parse_args()
+
+    t_sec, t_par, iguales = medir_aceleracion(args.procesos, args.partes)
+    print(f"{'secuencial':<14}{t_sec:>10.3f} s")
+    print(f"{'paralelo':<14}{t_par:>10.3f} s")
+    if t_par > 0:
+        print(f"Aceleracion: x{t_sec / t_par:.2f} ({os.cpu_count()} nucleos)")
+    print("Mismos datos:", "si" if iguales else "NO")
@@ -0,0 +1,388 @@
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict, Counter
+
+try:
+    import numpy as np
+except ImportError:  # sin NumPy las columnas se leen como array
+    np = None
+
+from grafo_csr import GrafoCSR
+
+
+# Formato columnar del dataset
+#
+# Cada tabla se guarda como un archivo por columna dentro de
+# Dataset/columnar/:
+#   - columnas enteras: <tabla>.<columna>.npy (int32 o int64)
+#   - columnas de texto: <tabla>.<columna>.utf8.npy con todos los textos
+#     en UTF-8 uno detras de otro y <tabla>.<columna>.offsets.npy (int64,
+#     n + 1 valores) con donde empieza cada uno
+# Los .npy se escriben a mano (cabecera version 1.0 + datos en little
+# endian), asi exportar no necesita NumPy, y numpy.load los abre (tambien
+# con mmap_mode="r"). amistades guarda los ids de los nodos una sola vez
+# y las aristas como dos columnas int32 de indices, en el mismo orden que
+# GrafoCSR.desde_aristas, asi el grafo sale identico al del Excel.
+#
+# manifiesto.json guarda, por tabla, la firma (mtime, tamaño) del Excel
+# del que se exporto: si el Excel cambia despues (p. ej. al compactar los
+# likes), los cargar_* de grafos.py vuelven a leer el Excel.
+
+NOMBRE_CARPETA = "columnar"
+VERSION_FORMATO = 1
+MAGIA_NPY = b"\x93NUMPY"
+
+# tabla -> (excel de origen, ((columna, tipo), ...)); tipo "texto", "i" (int32) o "q" (int64)
+TABLAS = {
+    "usuarios": ("usuarios.xlsx", (("id", "texto"), ("nombre", "texto"), ("post", "texto"))),
+    "amistades": ("amistades.xlsx", (("nodos", "texto"), ("origen", "i"), ("destino", "i"))),
+    "posts": ("posts.xlsx", (("id_post", "q"), ("id_usuario", "texto"), ("contenido", "texto"))),
+    "likes": ("likes.xlsx", (("id_like", "q"), ("id_usuario", "texto"), ("id_post", "q"))),
+    "comunidades": ("comunidades.xlsx",
+                    (("id_comunidad", "texto"), ("nombre", "texto"), ("id_usuario", "texto"))),
+}
+
+_DESCRIPTOR = {"i": "<i4", "q": "<i8", "B": "|u1"}
+_TIPO_DE_DESCRIPTOR = {v: k for k, v in _DESCRIPTOR.items()}
+
+
+def carpeta_columnar(carpeta_dataset):
+    return os.path.join(carpeta_dataset, NOMBRE_CARPETA)
+
+
+# Archivos .npy sin NumPy
+def guardar_npy(ruta, valores, tipo):
+    """
+    Escribe un arreglo 1-D en formato .npy 1.0.
+    tipo: "i" (int32), "q" (int64) o "B" (uint8)
+    """
+    datos = valores if isinstance(valores, array) and valores.typecode == tipo else array(tipo, valores)
+    if sys.byteorder == "big":
+        datos = array(tipo, datos)
+        datos.byteswap()
+    cabecera = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (
+        _DESCRIPTOR[tipo], len(datos))
+    # La cabecera se rellena para que los datos empiecen alineados a 64 bytes
+    relleno = 64 - (len(MAGIA_NPY) + 4 + len(cabecera) + 1) % 64
+    cabecera = (cabecera + " " * relleno + "\n").encode("latin1")
+    tmp = ruta + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIA_NPY + b"\x01\x00" + len(cabecera).to_bytes(2, "little"))
+        f.write(cabecera)
+        datos.tofile(f)
+    os.replace(tmp, ruta)
+
+
+def leer_npy(ruta):
+    """
+    Lee un .npy 1-D escrito por guardar_npy.
+    Con NumPy retorna un ndarray de solo lectura mapeado en memoria; sin
+    NumPy, un array del modulo array.
+    """
+    if np is not None:
+        return np.load(ruta, mmap_mode="r")
+    with open(ruta, "rb") as f:
+        if f.read(6) != MAGIA_NPY:
+            raise ValueError(f"{ruta} no es un archivo .npy")
+        version = f.read(2)
+        largo = int.from_bytes(f.read(2 if version[0] == 1 else 4), "little")
+        cabecera = ast.literal_eval(f.read(largo).decode("latin1"))
+        tipo = _TIPO_DE_DESCRIPTOR[cabecera["descr"]]
+        datos = array(tipo)
+        datos.frombytes(f.read())
+    if sys.byteorder == "big":
+        datos.byteswap()
+    return datos
+
+
+def guardar_textos(ruta_base, textos):
+    #Columna de textos: blob UTF-8 + offsets
+    blob = bytearray()
+    offsets = array("q", [0])
+    for texto in textos:
+        blob += texto.encode("utf-8")
+        offsets.append(len(blob))
+    guardar_npy(ruta_base + ".utf8.npy", blob, "B")
+    guardar_npy(ruta_base + ".offsets.npy", offsets, "q")
+
+
+def leer_textos(ruta_base):
+    blob = bytes(leer_npy(ruta_base + ".utf8.npy"))
+    offsets = leer_npy(ruta_base + ".offsets.npy").tolist()
+    return [blob[inicio:fin].decode("utf-8") for inicio, fin in zip(offsets, offsets[1:])]
+
+
+# Tablas
+def _ruta_columna(carpeta, tabla, columna):
+    return os.path.join(carpeta, f"{tabla}.{columna}")
+
+
+def guardar_tabla(carpeta, tabla, columnas):
+    #columnas: {nombre: valores} en el orden de TABLAS[tabla]
+    for columna, tipo in TABLAS[tabla][1]:
+        ruta = _ruta_columna(carpeta, tabla, columna)
+        if tipo == "texto":
+            guardar_textos(ruta, columnas[columna])
+        else:
+            guardar_npy(ruta + ".npy", columnas[columna], tipo)
+
+
+def leer_tabla(carpeta, tabla):
+    #{columna: valores}: listas de str para los textos, arreglos para los enteros
+    columnas = {}
+    for columna, tipo in TABLAS[tabla][1]:
+        ruta = _ruta_columna(carpeta, tabla, columna)
+        if tipo == "texto":
+            columnas[columna] = leer_textos(ruta)
+        else:
+            columnas[columna] = leer_npy(ruta + ".npy")
+    return columnas
+
+
+# Manifiesto: de que version de cada Excel salio cada tabla
+def _ruta_manifiesto(carpeta):
+    return os.path.join(carpeta, "manifiesto.json")
+
+
+def leer_manifiesto(carpeta):
+    try:
+        with open(_ruta_manifiesto(carpeta), "r", encoding="utf-8") as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifiesto.get("version") != VERSION_FORMATO:
+        return None
+    return manifiesto
+
+
+def vigente(carpeta_dataset, tabla):
+    """
+    True si la tabla esta exportada y su Excel no cambio desde entonces
+    (o ya no existe: el dataset puede distribuirse solo en columnas).
+    """
+    manifiesto = leer_manifiesto(carpeta_columnar(carpeta_dataset))
+    if manifiesto is None or tabla not in manifiesto["tablas"]:
+        return False
+    excel = os.path.join(carpeta_dataset, TABLAS[tabla][0])
+    if not os.path.exists(excel):
+        return True
+    st = os.stat(excel)
+    return manifiesto["tablas"][tabla]["firma"] == [st.st_mtime_ns, st.st_size]
+
+
+# Exportacion desde los Excel
+def _columnas_desde_excel(tabla):
+    #Lee la tabla con los cargadores de grafos.py (sin snapshots ni columnas)
+    import grafos
+    import xlsx_stream
+
+    if tabla == "usuarios":
+        usuarios, posts = grafos.cargar_usuarios.sin_cache()
+        return {"id": list(usuarios), "nombre": list(usuarios.values()),
+                "post": [posts[id_] for id_ in usuarios]}
+
+    if tabla == "amistades":
+        # Internado igual que GrafoCSR.desde_aristas
+        nodos, indice = [], {}
+        origen, destino = array("i"), array("i")
+        for a, b in grafos._leer_aristas():
+            for id_ in (a, b):
+                if id_ not in indice:
+                    indice[id_] = len(nodos)
+                    nodos.append(id_)
+            origen.append(indice[a])
+            destino.append(indice[b])
+        return {"nodos": nodos, "origen": origen, "destino": destino}
+
+    if tabla == "posts":
+        filas = grafos._cargar_posts_xlsx.sin_cache()
+        return {"id_post": [f[0] for f in filas], "id_usuario": [f[1] for f in filas],
+                "contenido": [f[2] for f in filas]}
+
+    if tabla == "likes":
+        filas = grafos._cargar_likes_xlsx.sin_cache()
+        return {"id_like": [f[0] for f in filas], "id_usuario": [f[1] for f in filas],
+                "id_post": [f[2] for f in filas]}
+
+    # comunidades: las filas tal cual (el orden decide usuario_comunidad)
+    columnas = {"id_comunidad": [], "nombre": [], "id_usuario": []}
+    archivo = grafos._ruta_dataset("comunidades.xlsx")
+    for id_com, nombre, id_user in xlsx_stream.filas(archivo, 3, 2):
+        if id_com is None or id_user is None:
+            continue
+        columnas["id_comunidad"].append(str(id_com).strip())
+        columnas["nombre"].append(str(nombre).strip() if nombre else "")
+        columnas["id_usuario"].append(str(id_user).strip())
+    return columnas
+
+
+def exportar(carpeta_dataset=None, tablas=None):
+    """
+    Convierte los Excel del dataset al formato columnar.
+    Las tablas cuyo Excel no existe se saltean.
+    Retorna {tabla: filas exportadas}
+    """
+    import grafos
+
+    carpeta_dataset = carpeta_dataset or grafos.DATASET_DIR
+    carpeta = carpeta_columnar(carpeta_dataset)
+    os.makedirs(carpeta, exist_ok=True)
+    manifiesto = leer_manifiesto(carpeta) or {"version": VERSION_FORMATO, "tablas": {}}
+
+    exportadas = {}
+    for tabla in tablas or TABLAS:
+        excel = os.path.join(carpeta_dataset, TABLAS[tabla][0])
+        if not os.path.exists(excel):
+            continue
+        st = os.stat(excel)   # antes de leer: si cambia mientras tanto queda vencida
+        columnas = _columnas_desde_excel(tabla)
+        guardar_tabla(carpeta, tabla, columnas)
+        filas = len(columnas[TABLAS[tabla][1][-1][0]])
+        manifiesto["tablas"][tabla] = {"firma": [st.st_mtime_ns, st.st_size], "filas": filas}
+        exportadas[tabla] = filas
+
+    tmp = _ruta_manifiesto(carpeta) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2)
+    os.replace(tmp, _ruta_manifiesto(carpeta))
+    return exportadas
+
+
+# Lectura con las mismas estructuras que los cargar_* de grafos.py
+def cargar_usuarios(carpeta_dataset):
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "usuarios")
+    return (dict(zip(columnas["id"], columnas["nombre"])),
+            dict(zip(columnas["id"], columnas["post"])))
+
+
+def cargar_grafo_csr(carpeta_dataset):
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "amistades")
+    return GrafoCSR.desde_indices(columnas["nodos"], columnas["origen"], columnas["destino"])
+
+
+def cargar_grafo(carpeta_dataset):
+    #Adyacencia {id: [vecinos]} como cargar_grafo
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "amistades")
+    nodos = columnas["nodos"]
+    grafo = defaultdict(list)
+    for i, j in zip(columnas["origen"].tolist(), columnas["destino"].tolist()):
+        a, b = nodos[i], nodos[j]
+        grafo[a].append(b)
+        grafo[b].append(a)
+    return grafo
+
+
+def filas_posts(carpeta_dataset):
+    #Filas (id_post, id_usuario, contenido) como _cargar_posts_xlsx
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "posts")
+    return list(zip(columnas["id_post"].tolist(), columnas["id_usuario"], columnas["contenido"]))
+
+
+def filas_likes(carpeta_dataset):
+    #Filas (id_like, id_usuario_like, id_post) como _cargar_likes_xlsx
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "likes")
+    return list(zip(columnas["id_like"].tolist(), columnas["id_usuario"],
+                    columnas["id_post"].tolist()))
+
+
+def cargar_comunidades(carpeta_dataset):
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "comunidades")
+    comunidades = defaultdict(list)
+    nombres_comunidades = {}
+    usuario_comunidad = {}
+    for id_com, nombre, id_user in zip(columnas["id_comunidad"], columnas["nombre"],
+                                       columnas["id_usuario"]):
+        if nombre:
+            nombres_comunidades[id_com] = nombre
+        comunidades[id_com].append(id_user)
+        usuario_comunidad[id_user] = id_com
+    return comunidades, nombres_comunidades, usuario_comunidad
+
+
+def resumen_likes(carpeta_dataset):
+    """
+    Datos para armar IndiceLikes desde la tabla exportada (sin el .log).
+    Retorna (conteo, pares, max_id_like):
+      - conteo: {id_post: cantidad de likes} en el orden del primer like
+        de cada post (el desempate de RankingPosts)
+      - pares: {(id_usuario, id_post)}
+      - max_id_like: id del ultimo like exportado (0 si no hay)
+    Con NumPy el conteo sale de np.unique sobre la columna id_post.
+    """
+    columnas = leer_tabla(carpeta_columnar(carpeta_dataset), "likes")
+    id_post = columnas["id_post"]
+    posts = id_post.tolist()
+    pares = set(zip(columnas["id_usuario"], posts))
+    max_id = max(columnas["id_like"].tolist(), default=0)
+
+    if len(pares) < len(posts):
+        # Likes repetidos en el Excel: se cuentan una vez, como IndiceLikes
+        vistos = set()
+        conteo = {}
+        for par in zip(columnas["id_usuario"], posts):
+            if par not in vistos:
+                vistos.add(par)
+                conteo[par[1]] = conteo.get(par[1], 0) + 1
+    elif np is not None:
+        valores, primeros, cantidades = np.unique(id_post, return_index=True,
+                                                  return_counts=True)
+        orden = np.argsort(primeros)
+        conteo = dict(zip(valores[orden].tolist(), cantidades[orden].tolist()))
+    else:
+        conteo = dict(Counter(posts))
+    return conteo, pares, max_id
+
+
+# Comparacion de tiempos Excel vs columnas
+def medir_carga(carpeta_dataset=None):
+    """
+    Carga cada tabla desde el Excel y desde las columnas.
+    Retorna {tabla: (t_excel, t_columnas)} (solo las tablas exportadas).
+    """
+    import grafos
+
+    carpeta_dataset = carpeta_dataset or grafos.DATASET_DIR
+    pares = {
+        "usuarios": (lambda: grafos.cargar_usuarios.sin_cache(),
+                     lambda: cargar_usuarios(carpeta_dataset)),
+        "amistades": (lambda: grafos.cargar_grafo_csr.sin_cache(),
+                      lambda: cargar_grafo_csr(carpeta_dataset)),
+        "posts": (lambda: grafos._cargar_posts_xlsx.sin_cache(),
+                  lambda: filas_posts(carpeta_dataset)),
+        "likes": (lambda: grafos._cargar_likes_xlsx.sin_cache(),
+                  lambda: filas_likes(carpeta_dataset)),
+        "comunidades": (lambda: grafos.cargar_comunidades.sin_cache(),
+                        lambda: cargar_comunidades(carpeta_dataset)),
+    }
+    manifiesto = leer_manifiesto(carpeta_columnar(carpeta_dataset)) or {"tablas": {}}
+    tiempos = {}
+    for tabla, (desde_excel, desde_columnas) in pares.items():
+        if tabla not in manifiesto["tablas"]:
+            continue
+        medidos = []
+        for cargador in (desde_excel, desde_columnas):
+            inicio = time.perf_counter()
+            cargador()
+            medidos.append(time.perf_counter() - inicio)
+        tiempos[tabla] = tuple(medidos)
+    return tiempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dataset en formato columnar")
+    parser.add_argument("accion", choices=("exportar", "medir"))
+    parser.add_argument("--dataset", default=None, help="carpeta con los .xlsx")
+    args = parser.parse_args()
+
+    if args.accion == "exportar":
+        for tabla, filas in exportar(args.dataset).items():
+            print(f"{tabla:<14}{filas:>10} filas")
+    else:
+        print(f"{'tabla':<14}{'excel (s)':>12}{'columnas (s)':>14}")
+        for tabla, (t_excel, t_columnas) in medir_carga(args.dataset).items():
+            print(f"{tabla:<14}{t_excel:>12.4f}{t_columnas:>14.4f}")
@@ -0,0 +1,101 @@
+import threading
+
+from grafos import cargar_usuarios, cargar_grafo_csr, cargar_posts, SistemaComunidades
+from directorio import DirectorioUsuarios
+from indice_likes import IndiceLikes
+from perfil_arranque import PERFIL
+
+
+# Datos de la app cargados a pedido
+#
+# Antes main.py leia los cinco Excel (y calculaba el ranking de likes) al
+# importarse, antes de que existiera la ventana. Ahora cada conjunto se
+# carga la primera vez que se usa; cargar_todo() los recorre en orden
+# desde un hilo para que la ventana aparezca enseguida.
+
+class DatosRedSocial:
+    """
+    - usuarios: {id: nombre}
+    - directorio: DirectorioUsuarios (nombre <-> id para los selectores)
+    - grafo: GrafoCSR de amistades
+    - grafo_compartido: el mismo grafo mapeado desde disco (grafo_mmap) para
+      los trabajos en lote con procesos; no forma parte de FASES
+    - sistema_comunidades: SistemaComunidades
+    - posts_por_id / posts_por_usuario: salida de cargar_posts
+    - indice_likes: IndiceLikes con los conteos en memoria
+    """
+
+    # Orden de carga de cargar_todo (nombres de las propiedades)
+    FASES = ("usuarios", "directorio", "grafo", "sistema_comunidades", "posts",
+             "indice_likes")
+
+    def __init__(self, perfil=PERFIL):
+        self.perfil = perfil
+        self._valores = {}
+        self._lock = threading.RLock()   # directorio carga usuarios dentro del lock
+
+    def _obtener(self, fase, cargador):
+        #Valor de la fase; la primera vez lo carga (un solo hilo a la vez)
+        if fase in self._valores:
+            return self._valores[fase]
+        with self._lock:
+            if fase not in self._valores:
+                with self.perfil.fase(f"carga {fase}"):
+                    self._valores[fase] = cargador()
+        return self._valores[fase]
+
+    def cargado(self, fase):
+        return fase in self._valores
+
+    def cargar_todo(self, al_progresar=None):
+        """
+        Carga todo lo que falte, en el orden de FASES.
+        al_progresar: funcion(hechas, total, fase) despues de cada fase
+        """
+        for i, fase in enumerate(self.FASES, 1):
+            getattr(self, fase)
+            if al_progresar:
+                al_progresar(i, len(self.FASES), fase)
+
+    # Propiedades perezosas
+    @property
+    def usuarios(self):
+        # ignoramos el "post" de usuarios.xlsx
+        return self._obtener("usuarios", lambda: cargar_usuarios()[0])
+
+    @property
+    def directorio(self):
+        return self._obtener("directorio", lambda: DirectorioUsuarios(self.usuarios))
+
+    @property
+    def grafo(self):
+        return self._obtener("grafo", cargar_grafo_csr)
+
+    @property
+    def grafo_compartido(self):
+        def cargar():
+            import grafo_mmap
+            return grafo_mmap.abrir_o_convertir(self.grafo)
+        return self._obtener("grafo_compartido", cargar)
+
+    @property
+    def sistema_comunidades(self):
+        return self._obtener("sistema_comunidades", SistemaComunidades)
+
+    @property
+    def posts(self):
+        #(posts_por_id, posts_por_usuario)
+        return self._obtener("posts", cargar_posts)
+
+    @property
+    def posts_por_id(self):
+        return self.posts[0]
+
+    @property
+    def posts_por_usuario(self):
+        return self.posts[1]
+
+    @property
+    def indice_likes(self):
+        # conteos en memoria, se actualiza con cada like
+        return self._obtener("indice_likes", IndiceLikes.cargar)
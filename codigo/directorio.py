@@ -0,0 +1,88 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+
+# Directorio de usuarios: nombre <-> id en tiempo constante
+class DirectorioUsuarios:
+    """
+    Se construye una sola vez a partir del diccionario {id: nombre} de
+    cargar_usuarios.
+
+    Cada usuario tiene una etiqueta unica para mostrar en la interfaz:
+    su nombre, o "Nombre (#id)" si hay varios usuarios con ese nombre
+    (si aun asi choca con otra etiqueta se le vuelve a agregar el id).
+    Las etiquetas se guardan ordenadas para buscar por prefijo con bisect.
+    """
+
+    def __init__(self, usuarios):
+        self.usuarios = usuarios
+        self.ids_por_nombre = defaultdict(list)
+        for id_, nombre in usuarios.items():
+            self.ids_por_nombre[nombre].append(id_)
+
+        self.etiqueta_por_id = {}
+        self.id_por_etiqueta = {}
+        for id_, nombre in usuarios.items():
+            if not nombre:
+                etiqueta = f"Usuario {id_}"
+            elif len(self.ids_por_nombre[nombre]) > 1:
+                etiqueta = f"{nombre} (#{id_})"
+            else:
+                etiqueta = nombre
+            # Una etiqueta generada puede coincidir con el nombre de otro
+            # usuario ("Usuario 7", "Ana (#3)"): se le agrega el id hasta que sea unica
+            while etiqueta in self.id_por_etiqueta:
+                etiqueta = f"{etiqueta} (#{id_})"
+            self.etiqueta_por_id[id_] = etiqueta
+            self.id_por_etiqueta[etiqueta] = id_
+
+        # Indice ordenado para busqueda por prefijo (sin distinguir mayusculas)
+        ordenadas = sorted(self.id_por_etiqueta, key=str.casefold)
+        self._claves = [e.casefold() for e in ordenadas]
+        self._etiquetas_ordenadas = ordenadas
+
+    def __len__(self):
+        return len(self.etiqueta_por_id)
+
+    def etiquetas(self):
+        #Etiquetas en el mismo orden que usuarios.xlsx
+        return list(self.etiqueta_por_id.values())
+
+    def etiqueta(self, id_usuario):
+        return self.etiqueta_por_id.get(id_usuario, f"Usuario {id_usuario}")
+
+    def id_de(self, texto):
+        """
+        Resuelve la etiqueta elegida en la interfaz a un id.
+        Tambien acepta el nombre solo si no es ambiguo. None si no existe.
+        """
+        id_ = self.id_por_etiqueta.get(texto)
+        if id_ is not None:
+            return id_
+        ids = self.ids_por_nombre.get(texto)
+        if ids and len(ids) == 1:
+            return ids[0]
+        return None
+
+    def ids_de_nombre(self, nombre):
+        #Todos los ids con ese nombre exacto
+        return list(self.ids_por_nombre.get(nombre, []))
+
+    # Busqueda por prefijo
+    def rango_prefijo(self, prefijo):
+        #(inicio, fin) de las etiquetas ordenadas que empiezan con prefijo
+        clave = prefijo.casefold()
+        inicio = bisect_left(self._claves, clave)
+        fin = bisect_left(self._claves, clave + "\U0010ffff", inicio)
+        return inicio, fin
+
+    def buscar_prefijo(self, prefijo, limite=None):
+        #Etiquetas que empiezan con prefijo, en orden alfabetico
+        inicio, fin = self.rango_prefijo(prefijo)
+        if limite is not None:
+            fin = min(fin, inicio + limite)
+        return self._etiquetas_ordenadas[inicio:fin]
+
+    def etiquetas_ordenadas(self, inicio, fin):
+        #Porcion [inicio, fin) del indice alfabetico (para listas virtuales)
+        return self._etiquetas_ordenadas[inicio:fin]
@@ -0,0 +1,227 @@
+from array import array
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # sin NumPy se usa el ordenamiento por conteo en Python
+    np = None
+
+
+# Grafo no dirigido en formato CSR (compressed sparse row)
+class GrafoCSR:
+    """
+    Grafo de amistades con los ids internados a enteros densos 0..n-1.
+
+    La adyacencia se guarda en dos arreglos:
+      - offsets: offsets[i]..offsets[i+1] delimita los vecinos del nodo i
+      - vecinos: indices de los vecinos, concatenados
+
+    Expone la misma interfaz de lectura que el defaultdict(list) que
+    devuelve cargar_grafo (grafo[id], grafo.get, in, items, values...),
+    asi que las funciones de grafos.py lo aceptan sin cambios.
+    """
+
+    def __init__(self, ids, offsets, vecinos):
+        self.ids = ids  # indice -> id de usuario (str)
+        self.offsets = offsets
+        self.vecinos = vecinos
+        self.indice = {id_: i for i, id_ in enumerate(ids)}  # id -> indice
+
+    # Construccion
+    @classmethod
+    def desde_aristas(cls, aristas):
+        """
+        Construye el grafo a partir de pares (id1, id2) no dirigidos.
+        Conserva el orden de los vecinos que tendria cargar_grafo.
+        """
+        ids = []
+        indice = {}
+        origen = array("i")
+        destino = array("i")
+
+        for a, b in aristas:
+            ia = indice.get(a)
+            if ia is None:
+                ia = indice[a] = len(ids)
+                ids.append(a)
+            ib = indice.get(b)
+            if ib is None:
+                ib = indice[b] = len(ids)
+                ids.append(b)
+            origen.append(ia)
+            destino.append(ib)
+
+        return cls._desde_arreglos(ids, origen, destino)
+
+    @classmethod
+    def desde_adyacencia(cls, grafo):
+        #Convierte un diccionario {id: [vecinos]} (salida de cargar_grafo)
+        ids = list(grafo.keys())
+        indice = {id_: i for i, id_ in enumerate(ids)}
+        for vecinos in grafo.values():
+            for v in vecinos:
+                if v not in indice:
+                    indice[v] = len(ids)
+                    ids.append(v)
+
+        offsets = array("i", [0])
+        vecinos_csr = array("i")
+        for id_ in ids:
+            for v in grafo.get(id_, ()):
+                vecinos_csr.append(indice[v])
+            offsets.append(len(vecinos_csr))
+
+        return cls(ids, offsets, vecinos_csr)
+
+    @classmethod
+    def desde_indices(cls, ids, origen, destino):
+        """
+        Construye el grafo a partir de las aristas ya internadas: origen[k]
+        y destino[k] son indices en ids (formato columnar del dataset).
+        Con NumPy el ordenamiento se hace vectorizado; el resultado es el
+        mismo que el de _desde_arreglos.
+        """
+        if np is None:
+            return cls._desde_arreglos(ids, array("i", origen), array("i", destino))
+
+        origen = np.asarray(origen, dtype=np.int32)
+        destino = np.asarray(destino, dtype=np.int32)
+        # Cada arista aporta a->b y b->a, en ese orden
+        desde = np.empty(2 * len(origen), dtype=np.int32)
+        hacia = np.empty_like(desde)
+        desde[0::2], desde[1::2] = origen, destino
+        hacia[0::2], hacia[1::2] = destino, origen
+
+        # Orden estable por nodo de salida = orden del ordenamiento por conteo
+        orden = np.argsort(desde, kind="stable")
+        grados = np.bincount(desde, minlength=len(ids))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int32)
+        np.cumsum(grados, out=offsets[1:])
+
+        return cls(ids, array("i", offsets.tobytes()),
+                   array("i", hacia[orden].tobytes()))
+
+    @classmethod
+    def _desde_arreglos(cls, ids, origen, destino):
+        #Ordenamiento por conteo de la lista de aristas (ambas direcciones)
+        n = len(ids)
+        grados = array("i", bytes(4 * n))
+        for i in origen:
+            grados[i] += 1
+        for i in destino:
+            grados[i] += 1
+
+        offsets = array("i", bytes(4 * (n + 1)))
+        for i in range(n):
+            offsets[i + 1] = offsets[i] + grados[i]
+
+        vecinos = array("i", bytes(4 * offsets[n]))
+        siguiente = array("i", offsets[:n])
+        for a, b in zip(origen, destino):
+            vecinos[siguiente[a]] = b
+            siguiente[a] += 1
+            vecinos[siguiente[b]] = a
+            siguiente[b] += 1
+
+        return cls(ids, offsets, vecinos)
+
+    # Pickle sin el diccionario inverso (se reconstruye al cargar)
+    def __getstate__(self):
+        return {"ids": self.ids, "offsets": self.offsets, "vecinos": self.vecinos}
+
+    def __setstate__(self, estado):
+        self.__init__(estado["ids"], estado["offsets"], estado["vecinos"])
+
+    # Consultas sobre indices enteros
+    def vecinos_idx(self, i):
+        #Vecinos del nodo i como arreglo de indices
+        return self.vecinos[self.offsets[i]:self.offsets[i + 1]]
+
+    def grado_idx(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def a_indices(self, nodos):
+        #Convierte ids a indices, descartando los que no estan en el grafo
+        indice = self.indice
+        return [indice[n] for n in nodos if n in indice]
+
+    # Interfaz tipo diccionario (compatible con cargar_grafo)
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_):
+        return id_ in self.indice
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __getitem__(self, id_):
+        # Igual que el defaultdict: un nodo desconocido no tiene vecinos
+        i = self.indice.get(id_)
+        if i is None:
+            return []
+        ids = self.ids
+        return [ids[j] for j in self.vecinos_idx(i)]
+
+    def get(self, id_, default=None):
+        if id_ not in self.indice:
+            return default
+        return self[id_]
+
+    def keys(self):
+        return list(self.ids)
+
+    def values(self):
+        for id_ in self.ids:
+            yield self[id_]
+
+    def items(self):
+        for id_ in self.ids:
+            yield id_, self[id_]
+
+    # Estadisticas
+    @property
+    def num_aristas(self):
+        return len(self.vecinos) // 2
+
+    def grado(self, id_):
+        i = self.indice.get(id_)
+        return 0 if i is None else self.grado_idx(i)
+
+    def grados(self):
+        #{id: grado} sin materializar listas de vecinos
+        offsets = self.offsets
+        return {id_: offsets[i + 1] - offsets[i] for i, id_ in enumerate(self.ids)}
+
+    def memoria_bytes(self):
+        #Bytes ocupados por los arreglos CSR (sin contar los ids)
+        return (self.offsets.itemsize * len(self.offsets)
+                + self.vecinos.itemsize * len(self.vecinos))
+
+    # Consultas usadas por grafos.py
+    def subgrafo(self, nodos_centrales, saltos=2):
+        """
+        Misma semantica que obtener_subgrafo, trabajando con indices.
+        Retorna (subgrafo {id: [vecinos]}, conjunto de ids incluidos).
+        """
+        incluidos = set(self.a_indices(nodos_centrales))
+        por_explorar = set(incluidos)
+
+        for _ in range(saltos):
+            nuevos = set()
+            for i in por_explorar:
+                nuevos.update(self.vecinos_idx(i))
+            incluidos.update(nuevos)
+            por_explorar = nuevos - incluidos
+
+        ids = self.ids
+        subgrafo = defaultdict(list)
+        for i in incluidos:
+            for j in self.vecinos_idx(i):
+                if j in incluidos:
+                    subgrafo[ids[i]].append(ids[j])
+
+        # Los centrales que no estan en el grafo se conservan (como en el original)
+        nodos_incluidos = {ids[i] for i in incluidos}
+        nodos_incluidos.update(nodos_centrales)
+        return subgrafo, nodos_incluidos
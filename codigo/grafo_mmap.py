@@ -0,0 +1,229 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # sin NumPy no hay vistas ndarray, el resto funciona igual
+    np = None
+
+from cache_datos import firma_archivo, NOMBRE_CARPETA_CACHE
+from grafo_csr import GrafoCSR
+
+
+# Grafo CSR en un archivo mapeado en memoria
+#
+# Archivo binario (little endian):
+#   cabecera (64 bytes): magia, version, n, largo de vecinos, bytes de los
+#                        ids y la firma (mtime_ns, tamaño) de amistades.xlsx
+#   offsets  int32 x (n + 1)
+#   vecinos  int32 x offsets[n]
+#   ids      UTF-8 separados por "\0"
+#
+# abrir() mapea el archivo con mmap y expone offsets/vecinos como
+# memoryview.cast("i") sobre el mapa: no se parsea ni se copia la
+# adyacencia, y todos los procesos que abren el mismo archivo comparten
+# las paginas del cache del sistema. Solo los ids se decodifican al abrir.
+# Un GrafoMapeado se pickea como la ruta, asi los pools de procesos
+# (indice_distancias, recomendaciones_lote) reabren el archivo en cada
+# trabajador en vez de recibir una copia de los arreglos.
+
+MAGIA = b"GRAFOCSR"
+VERSION_ARCHIVO = 1
+CABECERA = struct.Struct("<8sIIIQqq")
+TAM_CABECERA = 64
+NOMBRE_ARCHIVO = "amistades.grafo"
+
+
+def ruta_por_defecto(carpeta_dataset):
+    return os.path.join(carpeta_dataset, NOMBRE_CARPETA_CACHE, NOMBRE_ARCHIVO)
+
+
+# Escritura
+def guardar(grafo, ruta, firma=(0, 0)):
+    """
+    Escribe un GrafoCSR en el formato binario.
+    firma: (mtime_ns, tamaño) del Excel de origen
+    """
+    offsets = array("i", grafo.offsets)
+    vecinos = array("i", grafo.vecinos)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+        vecinos.byteswap()
+    ids = "\0".join(grafo.ids).encode("utf-8")
+
+    cabecera = CABECERA.pack(MAGIA, VERSION_ARCHIVO, len(grafo.ids), len(vecinos),
+                             len(ids), firma[0], firma[1])
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    tmp = ruta + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(cabecera.ljust(TAM_CABECERA, b"\0"))
+        offsets.tofile(f)
+        vecinos.tofile(f)
+        f.write(ids)
+    os.replace(tmp, ruta)
+
+
+def leer_cabecera(ruta):
+    #Cabecera como dict, o None si el archivo no existe o no es de este formato
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read(CABECERA.size)
+    except OSError:
+        return None
+    if len(datos) < CABECERA.size:
+        return None
+    magia, version, n, m, bytes_ids, mtime, tam = CABECERA.unpack(datos)
+    if magia != MAGIA or version != VERSION_ARCHIVO:
+        return None
+    return {"n": n, "m": m, "bytes_ids": bytes_ids, "firma": (mtime, tam)}
+
+
+# Lectura
+class GrafoMapeado(GrafoCSR):
+    """
+    GrafoCSR de solo lectura cuya adyacencia vive en un archivo mapeado.
+    Misma interfaz que GrafoCSR (vecinos_idx devuelve un memoryview).
+    """
+
+    def __init__(self, ruta, mapa, ids, offsets, vecinos):
+        super().__init__(ids, offsets, vecinos)
+        self.ruta = ruta
+        self._mapa = mapa
+
+    def __reduce__(self):
+        # A otro proceso solo viaja la ruta: el trabajador vuelve a mapear
+        return abrir, (self.ruta,)
+
+    def arreglos_numpy(self):
+        #(offsets, vecinos) como ndarray int32 sobre el mismo mapa, sin copia
+        if np is None:
+            raise RuntimeError("arreglos_numpy() necesita NumPy")
+        n, m = len(self.ids), len(self.vecinos)
+        offsets = np.frombuffer(self._mapa, dtype="<i4", count=n + 1, offset=TAM_CABECERA)
+        vecinos = np.frombuffer(self._mapa, dtype="<i4", count=m,
+                                offset=TAM_CABECERA + 4 * (n + 1))
+        return offsets, vecinos
+
+    def memoria_bytes(self):
+        # La adyacencia esta en el cache de paginas, no en el heap del proceso
+        return 0
+
+    def cerrar(self):
+        #Suelta las vistas y el mapa (el grafo no se puede usar despues).
+        #BufferError si todavia hay vistas en uso (p. ej. de arreglos_numpy)
+        for vista in (self.offsets, self.vecinos):
+            if isinstance(vista, memoryview):
+                vista.release()
+        self._mapa.close()
+
+
+def abrir(ruta):
+    """
+    Mapea un archivo escrito por guardar() y retorna un GrafoMapeado.
+    ValueError si el archivo no es de este formato.
+    """
+    cabecera = leer_cabecera(ruta)
+    if cabecera is None:
+        raise ValueError(f"{ruta} no es un archivo de grafo valido")
+    n, m = cabecera["n"], cabecera["m"]
+
+    with open(ruta, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    inicio_vecinos = TAM_CABECERA + 4 * (n + 1)
+    inicio_ids = inicio_vecinos + 4 * m
+    if len(mapa) < inicio_ids + cabecera["bytes_ids"]:
+        mapa.close()
+        raise ValueError(f"{ruta} esta truncado")
+
+    vista = memoryview(mapa)
+    if sys.byteorder == "little":
+        offsets = vista[TAM_CABECERA:inicio_vecinos].cast("i")
+        vecinos = vista[inicio_vecinos:inicio_ids].cast("i")
+    else:
+        # En big endian no se puede usar el mapa tal cual: se copia invertido
+        offsets = array("i", bytes(vista[TAM_CABECERA:inicio_vecinos]))
+        vecinos = array("i", bytes(vista[inicio_vecinos:inicio_ids]))
+        offsets.byteswap()
+        vecinos.byteswap()
+
+    ids_bytes = bytes(vista[inicio_ids:inicio_ids + cabecera["bytes_ids"]])
+    vista.release()
+    ids = ids_bytes.decode("utf-8").split("\0") if n else []
+    return GrafoMapeado(ruta, mapa, ids, offsets, vecinos)
+
+
+# Conversion desde amistades.xlsx
+def convertir(ruta=None, grafo=None):
+    """
+    Escribe el archivo de grafo a partir de amistades.xlsx.
+    grafo: GrafoCSR ya cargado (None = cargar_grafo_csr())
+    Retorna la ruta escrita.
+    """
+    import grafos
+
+    archivo = os.path.join(grafos.DATASET_DIR, "amistades.xlsx")
+    ruta = ruta or ruta_por_defecto(grafos.DATASET_DIR)
+    # La firma se toma antes de leer: si el Excel cambia mientras tanto queda vencido
+    firma = firma_archivo(archivo) if os.path.exists(archivo) else (0, 0)
+    if grafo is None:
+        grafo = grafos.cargar_grafo_csr()
+    guardar(grafo, ruta, firma)
+    return ruta
+
+
+def vigente(ruta, archivo_xlsx):
+    #True si el archivo existe y amistades.xlsx no cambio desde la conversion
+    cabecera = leer_cabecera(ruta)
+    if cabecera is None:
+        return False
+    if not os.path.exists(archivo_xlsx):
+        return True
+    return cabecera["firma"] == firma_archivo(archivo_xlsx)
+
+
+def abrir_o_convertir(grafo=None):
+    """
+    Abre el grafo mapeado del dataset, convirtiendolo antes si falta o si
+    amistades.xlsx cambio. Si no se puede escribir (carpeta de solo
+    lectura, archivo en uso) retorna el GrafoCSR en memoria.
+    """
+    import grafos
+
+    archivo = os.path.join(grafos.DATASET_DIR, "amistades.xlsx")
+    ruta = ruta_por_defecto(grafos.DATASET_DIR)
+    if not vigente(ruta, archivo):
+        if grafo is None:
+            grafo = grafos.cargar_grafo_csr()
+        try:
+            convertir(ruta, grafo)
+        except OSError:
+            return grafo
+    try:
+        return abrir(ruta)
+    except (OSError, ValueError):
+        return grafo if grafo is not None else grafos.cargar_grafo_csr()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grafo de amistades en archivo mapeado")
+    parser.add_argument("--salida", default=None, help="ruta del archivo (por defecto .cache/)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    ruta = convertir(args.salida)
+    t_convertir = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    grafo = abrir(ruta)
+    t_abrir = time.perf_counter() - inicio
+
+    print(f"Archivo: {ruta} ({os.path.getsize(ruta) / 1024:.0f} KB)")
+    print(f"Nodos: {len(grafo)}  aristas: {grafo.num_aristas}")
+    print(f"{'convertir':<12}{t_convertir:>10.4f} s")
+    print(f"{'abrir':<12}{t_abrir:>10.4f} s")
@@ -1,11 +1,23 @@
 import os
-import matplotlib.pyplot as plt
-from collections import defaultdict, deque
-from openpyxl import load_workbook, Workbook
+from collections import defaultdict, Counter
+import functools
+from contextlib import contextmanager
 import math
-import tkinter as tk
-from tkinter import Canvas
-import random
+import heapq
+import queue
+import threading
+from itertools import chain
+from operator import itemgetter
+from cache_datos import con_snapshot
+from grafo_csr import GrafoCSR
+from caminos import bfs_padres, bfs_bidireccional
+from registro_eventos import RegistroEventos
+import xlsx_stream
+import columnar
+from ranking import top_k_por_likes
+from layout import (calcular_layout, iterar_layout, iteraciones_para, layout_circular,
+                    posiciones_aleatorias, posiciones_tibias, THETA, CacheLayouts,
+                    ITERACIONES_TIBIO)
 
 
 # Configuracion de rutas
@@ -45,37 +57,90 @@ class UFDS:
 
 
 # Utilidades internas
-def _abrir_hoja(path_xlsx: str):
-    #ABRE ARCHIVO EXCEL
+def _ruta_dataset(path_xlsx):
+    #Ruta del Excel en la carpeta Dataset (FileNotFoundError si no esta)
     archivo = os.path.join(DATASET_DIR, path_xlsx)
     if not os.path.exists(archivo):
         raise FileNotFoundError(
             f"No se encontro '{path_xlsx}' en la carpeta Dataset.\n"
             f"Ruta esperada: {archivo}"
         )
-    wb = load_workbook(archivo, data_only=True)
-    return wb.active
+    return archivo
+
+
+def _con_columnas(tabla, lector):
+    """
+    Si la tabla esta exportada en Dataset/columnar (columnar.py) y su
+    Excel no cambio desde la exportacion, se lee de ahi con lector(DATASET_DIR);
+    si no, se usa el cargador (snapshot o Excel).
+    .sin_cache sigue siendo el parseo del Excel.
+    """
+    def decorador(cargador):
+        @functools.wraps(cargador)
+        def envoltura():
+            if columnar.vigente(DATASET_DIR, tabla):
+                return lector(DATASET_DIR)
+            return cargador()
+        envoltura.sin_cache = cargador.sin_cache
+        return envoltura
+    return decorador
+
+
+@contextmanager
+def _abrir_hoja(path_xlsx: str, read_only=True):
+    #ABRE ARCHIVO EXCEL (read_only: lee las filas a medida que se recorren,
+    #sin armar todas las celdas en memoria). Al salir del with se cierra el
+    #libro: en read_only openpyxl deja el zip abierto hasta close()
+    archivo = _ruta_dataset(path_xlsx)
+    from openpyxl import load_workbook  # se importa solo si no hay snapshot
+    wb = load_workbook(archivo, data_only=True, read_only=read_only)
+    try:
+        yield wb.active
+    finally:
+        wb.close()
 
 
 # Cargar usuarios y posts desde usuarios.xlsx
+@_con_columnas("usuarios", columnar.cargar_usuarios)
+@con_snapshot(os.path.join(DATASET_DIR, "usuarios.xlsx"))
 def cargar_usuarios():
     usuarios = {}
     posts = {}
 
-    ws = _abrir_hoja("usuarios.xlsx")
-
-    for id_, nombre, post in ws.iter_rows(min_row=2, max_col=3, values_only=True):
-        if id_ is None:
-            continue
-        sid = str(id_).strip()
-        usuarios[sid] = (nombre or "").strip()
-        posts[sid] = (post or "").strip()
+    with _abrir_hoja("usuarios.xlsx") as ws:
+        for id_, nombre, post in ws.iter_rows(min_row=2, max_col=3, values_only=True):
+            if id_ is None:
+                continue
+            sid = str(id_).strip()
+            usuarios[sid] = (nombre or "").strip()
+            posts[sid] = (post or "").strip()
 
     return usuarios, posts
 
+@_con_columnas("posts", columnar.filas_posts)
+@con_snapshot(os.path.join(DATASET_DIR, "posts.xlsx"))
+def _cargar_posts_xlsx():
+    #Filas (id_post, id_usuario, contenido) de posts.xlsx
+    filas = []
+
+    try:
+        with _abrir_hoja("posts.xlsx") as ws:
+            for id_post, id_usuario, contenido in ws.iter_rows(
+                    min_row=2, max_col=3, values_only=True):
+                if id_post is None or id_usuario is None:
+                    continue
+                filas.append((int(id_post), str(id_usuario).strip(), (contenido or "").strip()))
+    except FileNotFoundError:
+        # Si no existe el archivo, no hay posts aún
+        pass
+
+    return filas
+
+
 def cargar_posts():
     """
-    Carga todos los posts desde posts.xlsx.
+    Carga todos los posts desde posts.xlsx (y los publicados despues,
+    que aun estan en el registro posts.log).
     Retorna:
       - posts_por_id: {id_post(int): {"id_usuario": str, "contenido": str}}
       - posts_por_usuario: {id_usuario(str): [id_post1, id_post2, ...]}
@@ -83,20 +148,7 @@ def cargar_posts():
     posts_por_id = {}
     posts_por_usuario = defaultdict(list)
 
-    try:
-        ws = _abrir_hoja("posts.xlsx")
-    except FileNotFoundError:
-        # Si no existe el archivo, no hay posts aún
-        return posts_por_id, posts_por_usuario
-
-    for id_post, id_usuario, contenido in ws.iter_rows(min_row=2, max_col=3, values_only=True):
-        if id_post is None or id_usuario is None:
-            continue
-
-        pid = int(id_post)
-        uid = str(id_usuario).strip()
-        texto = (contenido or "").strip()
-
+    for pid, uid, texto in _registro_posts().registros():
         posts_por_id[pid] = {
             "id_usuario": uid,
             "contenido": texto
@@ -108,37 +160,11 @@ def cargar_posts():
 
 def crear_post(id_usuario, contenido):
     """
-    Crea un nuevo post para el usuario dado y lo guarda en posts.xlsx.
+    Crea un nuevo post para el usuario dado.
+    Se agrega al registro posts.log y se vuelca a posts.xlsx al compactar.
     Retorna el nuevo id_post (int).
     """
-    archivo = os.path.join(DATASET_DIR, "posts.xlsx")
-    id_usuario = str(id_usuario).strip()
-
-    if os.path.exists(archivo):
-        wb = load_workbook(archivo)
-        ws = wb.active
-
-        max_id = 0
-        for id_post, _, _ in ws.iter_rows(min_row=2, max_col=3, values_only=True):
-            if id_post is None:
-                continue
-            try:
-                max_id = max(max_id, int(id_post))
-            except ValueError:
-                continue
-
-        nuevo_id = max_id + 1
-    else:
-        # Crear archivo desde cero
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Posts"
-        ws.append(["id_post", "id_usuario", "contenido"])
-        nuevo_id = 1
-
-    ws.append([nuevo_id, id_usuario, contenido])
-    wb.save(archivo)
-    return nuevo_id
+    return _registro_posts().agregar(str(id_usuario).strip(), contenido)
 
 
 def actualizar_post_usuario(id_usuario, nuevo_post):
@@ -151,6 +177,7 @@ def actualizar_post_usuario(id_usuario, nuevo_post):
     if not os.path.exists(archivo):
         return False, "No se encontró el archivo usuarios.xlsx"
     
+    from openpyxl import load_workbook
     wb = load_workbook(archivo)
     ws = wb.active
     
@@ -177,24 +204,48 @@ def actualizar_post_usuario(id_usuario, nuevo_post):
 
 
 # Cargar amistades desde amistades.xlsx
+@_con_columnas("amistades", columnar.cargar_grafo)
+@con_snapshot(os.path.join(DATASET_DIR, "amistades.xlsx"))
 def cargar_grafo():
     grafo = defaultdict(list)
 
-    ws = _abrir_hoja("amistades.xlsx")
+    for a, b in _leer_aristas():
+        grafo[a].append(b)
+        grafo[b].append(a)  # no dirigido
+
+    return grafo
+
+
+# Cargar amistades directamente como grafo CSR
+@_con_columnas("amistades", columnar.cargar_grafo_csr)
+@con_snapshot(os.path.join(DATASET_DIR, "amistades.xlsx"))
+def cargar_grafo_csr():
+    #Mismo grafo que cargar_grafo, con ids internados y adyacencia en arreglos
+    return GrafoCSR.desde_aristas(_leer_aristas())
+
+
+def _leer_aristas(fila_inicio=2, fila_fin=None):
+    """
+    Genera los pares (id1, id2) validos de amistades.xlsx.
+    Lee el XML de la hoja en streaming (xlsx_stream), sin cargar el libro
+    en memoria, asi los pares van directo al constructor del grafo.
+    Con fila_fin solo lee las filas fila_inicio..fila_fin (carga_paralela
+    reparte el archivo asi entre procesos).
+    """
+    archivo = _ruta_dataset("amistades.xlsx")
 
-    for id1, id2 in ws.iter_rows(min_row=2, max_col=2, values_only=True):
+    for id1, id2 in xlsx_stream.filas(archivo, 2, fila_inicio, fila_fin):
         if id1 is None or id2 is None:
             continue
         a, b = str(id1).strip(), str(id2).strip()
         if a == "" or b == "":
             continue
-        grafo[a].append(b)
-        grafo[b].append(a)  # no dirigido
-
-    return grafo
+        yield a, b
 
 
 # Cargar comunidades desde comunidades.xlsx
+@_con_columnas("comunidades", columnar.cargar_comunidades)
+@con_snapshot(os.path.join(DATASET_DIR, "comunidades.xlsx"))
 def cargar_comunidades():
     #Cargar comunidades desde Excel.
     comunidades = defaultdict(list)  # id_comunidad -> [usuarios]
@@ -202,20 +253,19 @@ def cargar_comunidades():
     usuario_comunidad = {}  # id_usuario -> id_comunidad
     
     try:
-        ws = _abrir_hoja("comunidades.xlsx")
-        
-        for id_com, nombre_com, id_user in ws.iter_rows(min_row=2, max_col=3, values_only=True):
-            if id_com is None or id_user is None:
-                continue
-            
-            id_com_str = str(id_com).strip()
-            id_user_str = str(id_user).strip()
-            
-            if nombre_com:
-                nombres_comunidades[id_com_str] = str(nombre_com).strip()
-            
-            comunidades[id_com_str].append(id_user_str)
-            usuario_comunidad[id_user_str] = id_com_str
+        with _abrir_hoja("comunidades.xlsx") as ws:
+            for id_com, nombre_com, id_user in ws.iter_rows(min_row=2, max_col=3, values_only=True):
+                if id_com is None or id_user is None:
+                    continue
+                
+                id_com_str = str(id_com).strip()
+                id_user_str = str(id_user).strip()
+                
+                if nombre_com:
+                    nombres_comunidades[id_com_str] = str(nombre_com).strip()
+                
+                comunidades[id_com_str].append(id_user_str)
+                usuario_comunidad[id_user_str] = id_com_str
             
     except FileNotFoundError:
         # Si el archivo no existe se crea cuando se agregue una comunidad
@@ -224,91 +274,87 @@ def cargar_comunidades():
     return comunidades, nombres_comunidades, usuario_comunidad
 
 # Cargar likes desde likes.xlsx
-def cargar_likes():
-    """
-    Carga los likes desde el archivo likes.xlsx.
-    Retorna una lista de diccionarios:
-    [{'id_like': int, 'id_usuario_like': 'id', 'id_post': int}, ...]
-    """
-    likes = []
+@_con_columnas("likes", columnar.filas_likes)
+@con_snapshot(os.path.join(DATASET_DIR, "likes.xlsx"))
+def _cargar_likes_xlsx():
+    #Filas (id_like, id_usuario_like, id_post) de likes.xlsx
+    filas = []
 
     try:
-        ws = _abrir_hoja("likes.xlsx")
+        with _abrir_hoja("likes.xlsx") as ws:
+            for id_like, id_usuario_like, id_post in ws.iter_rows(
+                    min_row=2, max_col=3, values_only=True):
+
+                if id_like is None or id_usuario_like is None or id_post is None:
+                    continue
+
+                filas.append((int(id_like), str(id_usuario_like).strip(), int(id_post)))
     except FileNotFoundError:
         # Si no existe el archivo, no hay likes aún
-        return likes
-
-    for id_like, id_usuario_like, id_post in ws.iter_rows(
-            min_row=2, max_col=3, values_only=True):
+        pass
 
-        if id_like is None or id_usuario_like is None or id_post is None:
-            continue
+    return filas
 
-        likes.append({
-            "id_like": int(id_like),
-            "id_usuario_like": str(id_usuario_like).strip(),
-            "id_post": int(id_post)
-        })
 
-    return likes
+def cargar_likes():
+    """
+    Carga los likes desde el archivo likes.xlsx (más los del registro likes.log).
+    Retorna una lista de diccionarios:
+    [{'id_like': int, 'id_usuario_like': 'id', 'id_post': int}, ...]
+    """
+    return [
+        {"id_like": id_like, "id_usuario_like": id_usuario_like, "id_post": id_post}
+        for id_like, id_usuario_like, id_post in _registro_likes().registros()
+    ]
 
 
 # Registrar like
 def registrar_like(id_usuario_like, id_post):
     """
-    Registra un nuevo like en likes.xlsx.
+    Registra un nuevo like agregandolo al registro likes.log (O(1), sin
+    reescribir el Excel; se vuelca a likes.xlsx al compactar).
     - Evita likes duplicados del mismo usuario al mismo post.
-    - Crea el archivo si no existe.
 
     Retorna: (exito: bool, mensaje: str)
     """
-    archivo = os.path.join(DATASET_DIR, "likes.xlsx")
-
     id_usuario_like = str(id_usuario_like).strip()
     id_post = int(id_post)
 
-    if os.path.exists(archivo):
-        wb = load_workbook(archivo)
-        ws = wb.active
-
-        pares_existentes = set()
-        max_id = 0
-
-        for id_like, u_like, p_id in ws.iter_rows(
-                min_row=2, max_col=3, values_only=True):
+    if _registro_likes().agregar(id_usuario_like, id_post) is None:
+        return False, "El usuario ya dio like a este post."
 
-            if id_like is None or u_like is None or p_id is None:
-                continue
+    return True, "Like registrado correctamente."
 
-            u_like_str = str(u_like).strip()
-            try:
-                p_id_int = int(p_id)
-            except ValueError:
-                continue
 
-            pares_existentes.add((u_like_str, p_id_int))
+# Registros append-only de likes y posts (se crean en el primer uso)
+_registro_de_likes = None
+_registro_de_posts = None
 
-            try:
-                max_id = max(max_id, int(id_like))
-            except ValueError:
-                continue
 
-        if (id_usuario_like, id_post) in pares_existentes:
-            return False, "El usuario ya dio like a este post."
+def _registro_likes():
+    global _registro_de_likes
+    if _registro_de_likes is None:
+        _registro_de_likes = RegistroEventos(
+            os.path.join(DATASET_DIR, "likes.xlsx"), _cargar_likes_xlsx,
+            ["id_like", "id_usuario_like", "id_post"], "Likes",
+            clave=lambda registro: (registro[1], registro[2])
+        )
+    return _registro_de_likes
 
-        nuevo_id = max_id + 1
 
-    else:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Likes"
-        ws.append(["id_like", "id_usuario_like", "id_post"])
-        nuevo_id = 1
+def _registro_posts():
+    global _registro_de_posts
+    if _registro_de_posts is None:
+        _registro_de_posts = RegistroEventos(
+            os.path.join(DATASET_DIR, "posts.xlsx"), _cargar_posts_xlsx,
+            ["id_post", "id_usuario", "contenido"], "Posts"
+        )
+    return _registro_de_posts
 
-    ws.append([nuevo_id, id_usuario_like, id_post])
-    wb.save(archivo)
 
-    return True, "Like registrado correctamente."
+def compactar_registros():
+    #Vuelca likes.log y posts.log a sus Excel (se llama al cerrar la app)
+    return _registro_likes().compactar() + _registro_posts().compactar()
 
 
 # Contar likes por post
@@ -332,6 +378,7 @@ def max_post_por_likes_divide_venceras(items):
     items: lista de tuplas (id_post, likes)
     Retorna la tupla (id_post, likes) con mayor cantidad de likes,
     usando la estrategia Divide y Vencerás.
+    Implementación de referencia: la app usa RankingPosts (ranking.py).
     """
     if not items:
         return None
@@ -359,6 +406,8 @@ def merge_sort_posts_por_likes(items):
     """
     Ordena una lista de tuplas (id_post, likes) de MAYOR a MENOR likes
     usando MergeSort (Divide y Vencerás).
+    Implementación de referencia: para el top-k se usa top_k_por_likes y
+    para ordenar sin memoria extra heapsort_por_likes (ranking.py).
     """
     if len(items) <= 1:
         return items
@@ -401,15 +450,10 @@ def obtener_top_posts(likes, k=5):
     """
     Retorna una lista con los k posts más populares:
     [(id_post, likes), ...] ya ordenados de mayor a menor.
+    Usa un heap acotado de tamaño k en lugar de ordenar todos los posts.
     """
     conteo = contar_likes_por_post(likes)
-    items = list(conteo.items())
-    
-    if not items:
-        return []
-    
-    ordenados = merge_sort_posts_por_likes(items)
-    return ordenados[:k]
+    return top_k_por_likes(conteo.items(), k)
 
 
 # Guardar comunidades en Excel
@@ -417,6 +461,7 @@ def guardar_comunidades(comunidades, nombres_comunidades):
     #Guarda comunidades en Excel
     archivo = os.path.join(DATASET_DIR, "comunidades.xlsx")
     
+    from openpyxl import Workbook
     wb = Workbook()
     ws = wb.active
     ws.title = "Comunidades"
@@ -507,37 +552,108 @@ class SistemaComunidades:
 
 
 # BFS para el camino mas corto
-def camino_mas_corto(grafo, inicio, destino):
-    #Encuentra el camino mas corto usando BFS
-    cola = deque([(inicio, [inicio])])
-    visitados = set([inicio])
-
-    while cola:
-        nodo, camino = cola.popleft()
-        if nodo == destino:
-            return camino
-        for vecino in grafo[nodo]:
-            if vecino not in visitados:
-                visitados.add(vecino)
-                cola.append((vecino, camino + [vecino]))
-    return None
+def camino_mas_corto(grafo, inicio, destino, bidireccional=True, indice=None):
+    """
+    Encuentra el camino mas corto usando BFS con mapa de padres.
+
+    Args:
+        grafo: diccionario {id: [vecinos]} o GrafoCSR
+        inicio, destino: ids de usuario
+        bidireccional: si es True busca desde ambos extremos a la vez
+        indice: IndiceDistancias u OraculoLandmarks opcional construido
+                sobre este grafo
+
+    Returns:
+        lista de ids desde inicio hasta destino, o None si no hay camino
+        (o si alguno de los dos no esta en el grafo)
+    """
+    if inicio not in grafo or destino not in grafo:
+        return None
+    if inicio == destino:
+        return [inicio]
+
+    if indice is not None and indice.grafo is grafo:
+        return indice.camino(inicio, destino)
+
+    buscar = bfs_bidireccional if bidireccional else bfs_padres
+
+    if isinstance(grafo, GrafoCSR):
+        i = grafo.indice.get(inicio)
+        j = grafo.indice.get(destino)
+        if i is None or j is None:
+            return None
+        camino = buscar(grafo.vecinos_idx, i, j)
+        return None if camino is None else [grafo.ids[n] for n in camino]
+
+    return buscar(lambda nodo: grafo.get(nodo, ()), inicio, destino)
 
 
 # Recomendacion de amigos
-def recomendar_amigos(grafo, usuario):
-    #Devuelve amigos de amigos que no sean ya amigos directos
-    directos = set(grafo[usuario])
-    sugerencias = set()
+CRITERIOS_RECOMENDACION = ("comunes", "adamic_adar", "jaccard")
+
+
+def recomendar_amigos(grafo, usuario, k=None, criterio="comunes"):
+    """
+    Devuelve amigos de amigos que no sean ya amigos directos, ordenados
+    por puntaje de mayor a menor.
+
+    Args:
+        grafo: diccionario {id: [vecinos]} o GrafoCSR
+        usuario: id del usuario
+        k: cantidad maxima de sugerencias (None = todas)
+        criterio: "comunes" (amigos en comun), "adamic_adar" o "jaccard"
+
+    Returns:
+        lista [(id_sugerido, puntaje), ...]
+    """
+    if criterio not in CRITERIOS_RECOMENDACION:
+        raise ValueError(f"Criterio de recomendacion desconocido: {criterio}")
+
+    if isinstance(grafo, GrafoCSR):
+        i = grafo.indice.get(usuario)
+        if i is None:
+            return []
+        ranking = _puntuar_candidatos(grafo.vecinos_idx, grafo.grado_idx,
+                                      i, k, criterio)
+        return [(grafo.ids[j], puntaje) for j, puntaje in ranking]
+
+    return _puntuar_candidatos(lambda nodo: grafo.get(nodo, ()),
+                               lambda nodo: len(grafo.get(nodo, ())),
+                               usuario, k, criterio)
+
+
+def _puntuar_candidatos(vecinos, grado, usuario, k, criterio):
+    #Una sola pasada por el vecindario de 2 saltos + heap acotado a k
+    directos = set(vecinos(usuario))
+    puntajes = defaultdict(int)
+
     for amigo in directos:
-        for amigo_de_amigo in grafo[amigo]:
+        if criterio == "adamic_adar":
+            g = grado(amigo)
+            if g < 2:
+                continue  # solo conoce al usuario
+            peso = 1 / math.log(g)
+        else:
+            peso = 1
+        for amigo_de_amigo in vecinos(amigo):
             if amigo_de_amigo != usuario and amigo_de_amigo not in directos:
-                sugerencias.add(amigo_de_amigo)
-    return list(sugerencias)
+                puntajes[amigo_de_amigo] += peso
+
+    if criterio == "jaccard":
+        n_directos = len(directos)
+        for candidato, comunes in puntajes.items():
+            puntajes[candidato] = comunes / (n_directos + grado(candidato) - comunes)
+
+    if k is None:
+        return sorted(puntajes.items(), key=itemgetter(1), reverse=True)
+    return heapq.nlargest(k, puntajes.items(), key=itemgetter(1))
 
 
 # Calcular grado de cada nodo
 def calcular_grados(grafo):
     #Calcula el grado de cada nodo en el grafo
+    if isinstance(grafo, GrafoCSR):
+        return grafo.grados()
     grados = {}
     for nodo, vecinos in grafo.items():
         grados[nodo] = len(vecinos)
@@ -562,6 +678,9 @@ def obtener_subgrafo(grafo, nodos_centrales, saltos=2):
     #    subgrafo: diccionario con solo los nodos relevantes
     #    nodos_incluidos: conjunto de nodos en el subgrafo
     
+    if isinstance(grafo, GrafoCSR):
+        return grafo.subgrafo(nodos_centrales, saltos)
+    
     nodos_incluidos = set(nodos_centrales)
     nodos_por_explorar = set(nodos_centrales)
     
@@ -585,153 +704,316 @@ def obtener_subgrafo(grafo, nodos_centrales, saltos=2):
     return subgrafo, nodos_incluidos
 
 
+# Estilos de resaltado para VisualizadorGrafo
+ESTILO_NODO = ("#64b5f6", 25, "black")     # color, radio, color del texto
+ESTILO_ARISTA = ("#cccccc", 1)             # color, ancho
+
+
+def _arista(a, b):
+    #Clave de una arista no dirigida
+    return (a, b) if a <= b else (b, a)
+
+
+def capas_de_resaltado(camino=None, nodos_destacados=None):
+    """
+    Capas de estilo para un camino y un conjunto de nodos destacados
+    (los colores de siempre: morado, amarillo, verde origen, rojo destino).
+    """
+    capas = []
+    if nodos_destacados:
+        capas.append({"nodos": set(nodos_destacados), "color": "#9c27b0",
+                      "radio": 30, "color_texto": "white"})
+    if camino:
+        capas.append({
+            "nodos": set(camino[1:-1]), "color": "#ffd54f", "radio": 27,
+            "color_texto": "black",
+            "aristas": {_arista(camino[i], camino[i + 1]) for i in range(len(camino) - 1)},
+            "color_arista": "#ff4444", "ancho_arista": 3,
+        })
+        capas.append({"nodos": {camino[-1]}, "color": "#f44336", "radio": 30,
+                      "color_texto": "white"})
+        capas.append({"nodos": {camino[0]}, "color": "#4caf50", "radio": 30,
+                      "color_texto": "white"})
+    return capas
+
+
+def resolver_capas(capas):
+    """
+    Combina capas de resaltado en una pasada por sus elementos.
+
+    Cada capa es un diccionario con:
+        nodos: conjunto de nodos (opcional)
+        aristas: conjunto de pares (a, b) (opcional, sin importar el orden)
+        color, radio, color_texto: estilo de sus nodos
+        color_arista, ancho_arista: estilo de sus aristas
+    Las capas posteriores pisan el color de las anteriores; el radio se
+    queda con el mayor.
+
+    Returns:
+        ({nodo: (color, radio, color_texto)}, {(a, b): (color, ancho)})
+    """
+    estilo_nodo = {}
+    estilo_arista = {}
+    for capa in capas:
+        for nodo in capa.get("nodos", ()):
+            color, radio, color_texto = estilo_nodo.get(nodo, ESTILO_NODO)
+            estilo_nodo[nodo] = (capa.get("color", color),
+                                 max(radio, capa.get("radio", radio)),
+                                 capa.get("color_texto", color_texto))
+        for a, b in capa.get("aristas", ()):
+            arista = _arista(a, b)
+            color, ancho = estilo_arista.get(arista, ESTILO_ARISTA)
+            estilo_arista[arista] = (capa.get("color_arista", color),
+                                     capa.get("ancho_arista", ancho))
+    return estilo_nodo, estilo_arista
+
+
 # Clase para visualizacion interactiva del grafo
 class VisualizadorGrafo:
+    # Con mas nodos que esto el layout se calcula en un hilo aparte
+    NODOS_LAYOUT_SINCRONO = 150
+    INTERVALO_REFRESCO_MS = 40
+    CELDA_GRILLA = 60    # lado de la grilla de nodos (en coordenadas del layout)
+    # Nivel de detalle segun el radio en pantalla de un nodo comun (en px)
+    RADIO_NOMBRES = 12.5   # por debajo no se dibujan los nombres
+    RADIO_ARISTAS = 2.5    # por debajo no se dibujan las aristas finas
+    RADIO_GRUPOS = 2       # por debajo los nodos cercanos se dibujan agrupados
+    CELDA_GRUPO = 24       # lado en px de la celda que forma un grupo
+    ZOOM_MIN = 0.05
+    ZOOM_MAX = 20
+    
     def __init__(self, canvas, grafo, usuarios, ancho=800, alto=600):
         self.canvas = canvas
         self.grafo = grafo
         self.usuarios = usuarios
         self.ancho = ancho
         self.alto = alto
-        self.posiciones = {}
-        self.nodos_dibujados = {}
-        self.aristas_dibujadas = []
-        self.zoom = 1.0
+        self.posiciones = {}          # coordenadas del layout (no cambian con el zoom)
+        self.nodos_dibujados = {}     # nodo -> (circulo, texto o None)
+        self.aristas_dibujadas = {}   # (nodo, vecino) -> linea
+        self.grupos_dibujados = {}    # celda -> (circulo, texto o None)
+        self.radios = {}              # radio en pantalla de cada nodo dibujado
+        self._estilos_nodos = {}      # ultimo estilo aplicado a cada elemento
+        self._estilos_aristas = {}
+        self._estilos_grupos = {}
+        # Lo pedido en dibujar_grafo (en coordenadas del layout); _renderizar
+        # dibuja solo la parte visible
+        self._nodos_pedidos = {}      # nodo -> (color, radio, color_texto, nombre, borde)
+        self._aristas_pedidas = {}    # (nodo, vecino) -> (color, ancho)
+        self._aristas_de = {}         # nodo -> [aristas]
+        self._destacados = set()      # nodos que nunca se agrupan
+        self._estilo_comun = ESTILO_NODO
+        self._radio_comun = ESTILO_NODO[1]
+        self._radio_maximo = ESTILO_NODO[1]
+        self._grilla = {}
+        self._render_pendiente = None
+        self._tooltip = None          # (rectangulo, texto)
+        self._nodo_tooltip = None
+        self.zoom = 1.0               # pantalla = layout * zoom + offset
         self.offset_x = 0
         self.offset_y = 0
+        self.modo_layout = None   # "exacto", "barnes_hut" o None (automatico)
+        self.theta = THETA
+        self.cache_layouts = CacheLayouts()   # None = recalcular siempre
+        self.version_grafo = 0    # incrementar si cambian las aristas
+        self.al_progresar = None  # funcion(iteracion, total) durante el layout en segundo plano
+        self._trabajo = None      # cola, evento de cancelacion, etc. del layout en curso
+        
+        if canvas is not None:
+            canvas.bind("<Motion>", self._on_movimiento, add="+")
+            canvas.bind("<Leave>", self._ocultar_tooltip, add="+")
         
     def limpiar(self):
         #Limpia el canvas
+        self.cancelar_layout()
+        self._cancelar_render()
         self.canvas.delete("all")
+        self._olvidar_items()
+        self._nodos_pedidos = {}
+        self._aristas_pedidas = {}
+        self._aristas_de = {}
+        self._destacados = set()
+        self._grilla = {}
+        self._tooltip = None
+        self._nodo_tooltip = None
+    
+    def _olvidar_items(self):
+        #Descarta las referencias a elementos del canvas (ya borrados)
         self.nodos_dibujados = {}
-        self.aristas_dibujadas = []
+        self.aristas_dibujadas = {}
+        self.grupos_dibujados = {}
+        self.radios = {}
+        self._estilos_nodos = {}
+        self._estilos_aristas = {}
+        self._estilos_grupos = {}
+    
+    def _preparar_layout(self, nodos, iteraciones=50):
+        """
+        Busca el layout en la cache.
+        Retorna (posiciones guardadas o None, posiciones iniciales o None,
+        iteraciones, version).
+        """
+        if self.cache_layouts is None:
+            return None, None, iteraciones, None
+        
+        version = (id(self.grafo), self.version_grafo, self.ancho, self.alto)
+        posiciones = self.cache_layouts.obtener(nodos, version)
+        if posiciones is not None:
+            return posiciones, None, iteraciones, version
+        
+        iniciales = None
+        previas, _ = self.cache_layouts.mas_parecido(nodos, version)
+        if previas is not None:
+            iniciales = posiciones_tibias(nodos, self.grafo, previas, self.ancho, self.alto)
+            iteraciones = min(iteraciones, ITERACIONES_TIBIO)
+        return None, iniciales, iteraciones, version
         
     def calcular_layout_fuerza(self, nodos, iteraciones=50):
         """
         Calcula las posiciones usando un algoritmo de fuerza simplificado.
+        El calculo esta en layout.py (vectorizado con NumPy si esta instalado).
+        
+        Si ya se calculo el layout de estos mismos nodos se reutiliza; si hay
+        uno parecido (p. ej. al cambiar el alcance) se parte de esas
+        posiciones con menos iteraciones, asi el dibujo no salta.
         """
-        # Limitar número de nodos para mejor rendimiento
-        num_nodos = len(nodos)
+        nodos = set(nodos)
+        guardadas, iniciales, iteraciones, version = self._preparar_layout(nodos, iteraciones)
+        if guardadas is not None:
+            return guardadas
+        return self._calcular_layout(nodos, iniciales, iteraciones, version)
     
-        # Ajustar iteraciones según el tamaño
-        if num_nodos > 20:
-            iteraciones = min(30, iteraciones)
-        elif num_nodos > 10:
-            iteraciones = min(40, iteraciones)
-    
-        # Inicializar posiciones aleatoriamente
-        posiciones = {}
-        for nodo in nodos:
-            posiciones[nodo] = [
-            random.uniform(100, self.ancho - 100),
-            random.uniform(100, self.alto - 100)
-        ]
+    def _calcular_layout(self, nodos, iniciales, iteraciones, version):
+        #Layout sincrono con lo que ya preparo _preparar_layout; lo guarda en la cache
+        posiciones = calcular_layout(nodos, self.grafo, self.ancho, self.alto, iteraciones,
+                                     modo=self.modo_layout, theta=self.theta,
+                                     posiciones=iniciales)
+        if self.cache_layouts is not None:
+            self.cache_layouts.guardar(nodos, version, posiciones)
+        return posiciones
     
-        # Si hay pocos nodos, usar layout circular simple
-        if num_nodos <= 5:  # Cambiado de 3 a 5
-            return self._layout_circular(list(nodos))
+    # Layout en segundo plano
+    def _iniciar_layout(self, nodos, iteraciones, version, al_terminar):
+        """
+        Corre el layout en un hilo que manda las posiciones de cada
+        iteracion por una cola; el hilo de Tk las lee con after() y
+        vuelve a renderizar la vista.
+        """
+        nodos_lista = list(nodos)
+        iniciales = {nodo: list(self.posiciones[nodo]) for nodo in nodos_lista}
+        trabajo = {
+            "cola": queue.Queue(),
+            "cancelar": threading.Event(),
+            "total": iteraciones_para(len(nodos_lista), iteraciones),
+            "al_terminar": al_terminar,
+        }
+        self._trabajo = trabajo
+        cola, cancelar = trabajo["cola"], trabajo["cancelar"]
         
-        # Parametros del algoritmo
-        k = math.sqrt((self.ancho * self.alto) / num_nodos) if num_nodos > 0 else 100
-        c_rep = k * k  # Constante de repulsion
-        c_spring = 1.0  # Constante del resorte
-        damping = 0.9  # Factor de amortiguacion
+        def trabajar():
+            try:
+                for iteracion, posiciones in iterar_layout(
+                        nodos_lista, self.grafo, self.ancho, self.alto, iteraciones,
+                        posiciones=iniciales, modo=self.modo_layout, theta=self.theta):
+                    if cancelar.is_set():
+                        return
+                    cola.put(("progreso", iteracion, posiciones))
+                cola.put(("listo", trabajo["total"], posiciones))
+            except Exception as e:
+                cola.put(("error", 0, e))
         
-        nodos_lista = list(nodos)
+        threading.Thread(target=trabajar, daemon=True).start()
+        self.canvas.after(self.INTERVALO_REFRESCO_MS, self._revisar_layout,
+                          trabajo, nodos, version)
+    
+    def _revisar_layout(self, trabajo, nodos, version):
+        #Aplica en el canvas las ultimas posiciones recibidas del hilo
+        if trabajo is not self._trabajo:
+            return  # se cancelo o se empezo otro dibujo
         
-        for iteracion in range(iteraciones):
-            # Reducir fuerzas en cada iteración para convergencia más rápida
-            factor = 1.0 - (iteracion / iteraciones) * 0.5
-            
-            fuerzas = {nodo: [0, 0] for nodo in nodos}
+        ultimo = None
+        while True:
+            try:
+                ultimo = trabajo["cola"].get_nowait()
+            except queue.Empty:
+                break
+        
+        if ultimo is not None:
+            estado, iteracion, dato = ultimo
+            terminado = estado != "progreso"
+            if terminado:
+                self._trabajo = None
             
-            # Fuerzas de repulsion (optimizado)
-            for i, nodo1 in enumerate(nodos_lista):
-                for nodo2 in nodos_lista[i+1:]:
-                    dx = posiciones[nodo2][0] - posiciones[nodo1][0]
-                    dy = posiciones[nodo2][1] - posiciones[nodo1][1]
-                    dist = math.sqrt(dx*dx + dy*dy)
-                    
-                    if dist > 0 and dist < k * 3:  # Solo calcular si están cerca
-                        # Fuerza de repulsion
-                        f_rep = (c_rep / (dist * dist)) * factor
-                        fx = (dx / dist) * f_rep
-                        fy = (dy / dist) * f_rep
-                        
-                        fuerzas[nodo1][0] -= fx
-                        fuerzas[nodo1][1] -= fy
-                        fuerzas[nodo2][0] += fx
-                        fuerzas[nodo2][1] += fy
+            if estado == "error":
+                # Se avisa aca: una excepcion dentro de after() solo llega a stderr.
+                # Los nodos quedan en circulo en vez de en posiciones a medio calcular
+                self.posiciones = self._layout_circular(list(nodos))
+                self._indexar_posiciones()
+                self._renderizar()
+                self._avisar_progreso(0, trabajo["total"])
+                from tkinter import messagebox
+                messagebox.showwarning(
+                    "Layout", f"No se pudo calcular la distribucion del grafo:\n{dato}",
+                    parent=self.canvas)
+                if trabajo["al_terminar"]:
+                    trabajo["al_terminar"](False)
+                return
             
-            # Fuerzas de atraccion para nodos conectados
-            for nodo in nodos:
-                if nodo in self.grafo:
-                    for vecino in self.grafo[nodo]:
-                        if vecino in nodos:
-                            dx = posiciones[vecino][0] - posiciones[nodo][0]
-                            dy = posiciones[vecino][1] - posiciones[nodo][1]
-                            dist = math.sqrt(dx*dx + dy*dy)
-                            
-                            if dist > 0:
-                                # Fuerza del resorte
-                                f_spring = c_spring * math.log(dist / k) * factor
-                                fx = (dx / dist) * f_spring
-                                fy = (dy / dist) * f_spring
-                                
-                                fuerzas[nodo][0] += fx * 0.5
-                                fuerzas[nodo][1] += fy * 0.5
+            self.posiciones = dato
+            self._indexar_posiciones()
+            self._renderizar()
+            self._avisar_progreso(iteracion, trabajo["total"])
             
-            # Actualizar posiciones
-            for nodo in nodos:
-                posiciones[nodo][0] += fuerzas[nodo][0] * damping
-                posiciones[nodo][1] += fuerzas[nodo][1] * damping
-                
-                # Mantener dentro de los limites
-                posiciones[nodo][0] = max(50, min(self.ancho - 50, posiciones[nodo][0]))
-                posiciones[nodo][1] = max(50, min(self.alto - 50, posiciones[nodo][1]))
+            if terminado:
+                if self.cache_layouts is not None:
+                    self.cache_layouts.guardar(nodos, version, dato)
+                if trabajo["al_terminar"]:
+                    trabajo["al_terminar"](True)
+                return
         
-        return posiciones
-    
-    
-    def _layout_circular(self, nodos):
-        """Layout circular para pocos nodos"""
-        posiciones = {}
-        n = len(nodos)
+        self.canvas.after(self.INTERVALO_REFRESCO_MS, self._revisar_layout,
+                          trabajo, nodos, version)
     
-        if n == 0:
-            return posiciones
+    def _avisar_progreso(self, iteracion, total):
+        if self.al_progresar:
+            self.al_progresar(iteracion, total)
     
-        # Centro del canvas
-        cx = self.ancho / 2
-        cy = self.alto / 2
+    def cancelar_layout(self):
+        #Detiene el layout en segundo plano (los nodos quedan donde estan)
+        trabajo = self._trabajo
+        if trabajo is None:
+            return
+        self._trabajo = None
+        trabajo["cancelar"].set()
+        self._avisar_progreso(0, trabajo["total"])
+        if trabajo["al_terminar"]:
+            trabajo["al_terminar"](False)
     
-        # Radio del círculo - más grande para mejor visualización
-        radio = min(self.ancho, self.alto) * 0.25
+    def calculando_layout(self):
+        return self._trabajo is not None
     
-        if n == 1:
-            posiciones[nodos[0]] = [cx, cy]
-        elif n == 2:
-            # Para 2 nodos, ponerlos horizontalmente
-            posiciones[nodos[0]] = [cx - radio, cy]
-            posiciones[nodos[1]] = [cx + radio, cy]
-        else:
-            for i, nodo in enumerate(nodos):
-                angulo = 2 * math.pi * i / n - math.pi / 2  # Empezar desde arriba
-                x = cx + radio * math.cos(angulo)
-                y = cy + radio * math.sin(angulo)
-                posiciones[nodo] = [x, y]
-        return posiciones
+    def _layout_circular(self, nodos):
+        """Layout circular para pocos nodos"""
+        return layout_circular(nodos, self.ancho, self.alto)
     
-    def dibujar_grafo(self, subgrafo=None, camino=None, nodos_destacados=None):
+    def dibujar_grafo(self, subgrafo=None, camino=None, nodos_destacados=None,
+                      al_terminar=None, capas=None):
         """
         Dibuja el grafo en el canvas.
         
+        Los grafos grandes se dibujan enseguida en sus posiciones iniciales
+        y se van acomodando a medida que el layout avanza en segundo plano.
+        
         Args:
             subgrafo: si se proporciona, solo dibuja este subgrafo
             camino: lista de nodos que forman un camino para destacar
             nodos_destacados: conjunto de nodos para destacar
+            al_terminar: funcion(completo: bool) que se llama cuando el
+                         layout termina (False si se cancelo)
+            capas: capas de resaltado extra (ver resolver_capas), se aplican
+                   despues de las del camino y los nodos destacados
         """
-        self.limpiar()
+        self.cancelar_layout()
         
         grafo_a_dibujar = subgrafo if subgrafo else self.grafo
         
@@ -746,135 +1028,448 @@ class VisualizadorGrafo:
             nodos = set(nodos_destacados)
         
         if not nodos:
+            self.limpiar()
             return
         
-        # Calcular posiciones
-        self.posiciones = self.calcular_layout_fuerza(nodos)
+        # Calcular posiciones (o tomarlas de la cache)
+        guardadas, iniciales, iteraciones, version = self._preparar_layout(nodos)
+        en_segundo_plano = guardadas is None and len(nodos) > self.NODOS_LAYOUT_SINCRONO
+        if guardadas is not None:
+            self.posiciones = guardadas
+        elif en_segundo_plano:
+            self.posiciones = iniciales or posiciones_aleatorias(nodos, self.ancho, self.alto)
+        else:
+            self.posiciones = self._calcular_layout(nodos, iniciales, iteraciones, version)
+        
+        # Con muchos nodos se achican los circulos
+        escala = min(1.0, math.sqrt(self.ancho * self.alto / len(nodos)) / 100)
+        
+        # Estilos de resaltado resueltos una sola vez: {nodo: estilo}, {arista: estilo}
+        if capas is None:
+            capas = []
+        capas = capas_de_resaltado(camino, nodos_destacados) + list(capas)
+        estilo_nodo, estilo_arista = resolver_capas(capas)
         
-        # Dibujar aristas primero para que queden debajo de los nodos
-        aristas_dibujadas = set()
+        # Estilo de cada arista
+        aristas = {}
         for nodo in grafo_a_dibujar:
             if nodo not in nodos:  # Solo dibujar si el nodo está en el conjunto
                 continue
             for vecino in grafo_a_dibujar[nodo]:
                 if vecino not in nodos:  # Solo dibujar si el vecino está en el conjunto
                     continue
-                arista = tuple(sorted([nodo, vecino]))
-                if arista not in aristas_dibujadas and vecino in self.posiciones:
-                    aristas_dibujadas.add(arista)
-                    
-                    x1, y1 = self.posiciones[nodo]
-                    x2, y2 = self.posiciones[vecino]
-                    
-                    # Determinar color de la arista
-                    color = "#cccccc"
-                    ancho = 1
-                    
-                    if camino:
-                        # Verificar si la arista esta en el camino
-                        for i in range(len(camino) - 1):
-                            if (camino[i] == nodo and camino[i+1] == vecino) or \
-                               (camino[i] == vecino and camino[i+1] == nodo):
-                                color = "#ff4444"
-                                ancho = 3
-                                break
-                    
-                    linea = self.canvas.create_line(
-                        x1, y1, x2, y2,
-                        fill=color, width=ancho, tags="arista"
-                    )
-                    self.aristas_dibujadas.append(linea)
-        
-        # Dibujar nodos
+                arista = _arista(nodo, vecino)
+                if arista not in aristas:
+                    aristas[arista] = estilo_arista.get(arista, ESTILO_ARISTA)
+        
+        # Estilo de cada nodo (radio en coordenadas del layout)
+        estilos = {}
         for nodo in nodos:
-            if nodo in self.posiciones:
-                x, y = self.posiciones[nodo]
-                
-                # Determinar color y tamaño del nodo
-                color = "#64b5f6"
-                radio = 25  # Aumentado de 20 a 25
-                color_texto = "black"
-                
-                if camino:
-                    if nodo == camino[0]:  # Origen
-                        color = "#4caf50"
-                        radio = 30  # Aumentado de 25 a 30
-                        color_texto = "white"
-                    elif nodo == camino[-1]:  # Destino
-                        color = "#f44336"
-                        radio = 30
-                        color_texto = "white"
-                    elif nodo in camino:  # En el camino
-                        color = "#ffd54f"
-                        radio = 27
-                
-                if nodos_destacados and nodo in nodos_destacados:
-                    radio = 30  # Aumentado de 25 a 30
-                    if not camino or nodo not in camino:
-                        color = "#9c27b0"
-                        color_texto = "white"
-                
-                # Dibujar circulo del nodo
-                circulo = self.canvas.create_oval(
+            color, radio, color_texto = estilo_nodo.get(nodo, ESTILO_NODO)
+            
+            # Nombre del nodo (se muestra solo si entra en el circulo, ver _renderizar)
+            nombre = self.usuarios.get(nodo, f"ID: {nodo}")
+            # Truncar nombre si es muy largo
+            if len(nombre) > 10:
+                nombre = nombre[:8] + "..."
+            
+            estilos[nodo] = (color, radio * escala, color_texto, nombre,
+                             max(1, round(3 * escala)))  # Borde más grueso
+        
+        self._pedir(aristas, estilos, escala)
+        self.restablecer_vista()
+        self._renderizar()
+        
+        if en_segundo_plano:
+            self._iniciar_layout(nodos, iteraciones, version, al_terminar)
+        elif al_terminar:
+            al_terminar(True)
+    
+    def _pedir(self, aristas, estilos, escala):
+        #Guarda lo que hay que dibujar y arma los indices para _renderizar
+        self._aristas_pedidas = aristas
+        self._nodos_pedidos = estilos
+        aristas_de = defaultdict(list)
+        for arista in aristas:
+            aristas_de[arista[0]].append(arista)
+            aristas_de[arista[1]].append(arista)
+        self._aristas_de = aristas_de
+        
+        # El estilo mas repetido se puede agrupar; los demas (camino, origen,
+        # sugerencias...) se dibujan siempre uno por uno
+        conteo = Counter(estilo[:3] for estilo in estilos.values())
+        comun = conteo.most_common(1)[0][0]
+        self._estilo_comun = comun
+        self._destacados = {nodo for nodo, estilo in estilos.items() if estilo[:3] != comun}
+        self._radio_comun = ESTILO_NODO[1] * escala
+        self._radio_maximo = max(estilo[1] for estilo in estilos.values())
+        self._indexar_posiciones()
+    
+    # Vista: el zoom y el desplazamiento son una transformacion, no se
+    # escalan ni mueven los elementos del canvas uno por uno
+    def a_pantalla(self, x, y):
+        return x * self.zoom + self.offset_x, y * self.zoom + self.offset_y
+    
+    def a_mundo(self, x, y):
+        #Punto del canvas -> punto del layout
+        return (x - self.offset_x) / self.zoom, (y - self.offset_y) / self.zoom
+    
+    def hacer_zoom(self, factor, x=None, y=None):
+        """
+        Multiplica el zoom por factor dejando quieto el punto (x, y) del
+        canvas (por defecto el centro de la vista).
+        """
+        if x is None or y is None:
+            ancho, alto = self._tamaño_vista()
+            x, y = ancho / 2, alto / 2
+        zoom = min(self.ZOOM_MAX, max(self.ZOOM_MIN, self.zoom * factor))
+        factor = zoom / self.zoom
+        self.offset_x = x - (x - self.offset_x) * factor
+        self.offset_y = y - (y - self.offset_y) * factor
+        self.zoom = zoom
+        self._programar_render()
+    
+    def desplazar(self, dx, dy):
+        self.offset_x += dx
+        self.offset_y += dy
+        self._programar_render()
+    
+    def restablecer_vista(self):
+        self.zoom = 1.0
+        self.offset_x = 0
+        self.offset_y = 0
+        self._programar_render()
+    
+    def _tamaño_vista(self):
+        ancho = self.canvas.winfo_width()
+        alto = self.canvas.winfo_height()
+        if ancho <= 1 or alto <= 1:
+            return self.ancho, self.alto  # el canvas todavia no se mostro
+        return ancho, alto
+    
+    def _programar_render(self):
+        #Junta varios eventos seguidos (rueda, arrastre) en un solo render
+        if self._render_pendiente is None and self._nodos_pedidos:
+            self._render_pendiente = self.canvas.after_idle(self._renderizar)
+    
+    def _cancelar_render(self):
+        if self._render_pendiente is not None:
+            self.canvas.after_cancel(self._render_pendiente)
+            self._render_pendiente = None
+    
+    # Nivel de detalle
+    def _renderizar(self):
+        """
+        Dibuja solo lo que cae dentro de la vista, con el detalle que
+        permite el zoom (segun el radio en pantalla de un nodo comun):
+        - menos de RADIO_NOMBRES px: sin nombres
+        - menos de RADIO_ARISTAS px: sin las aristas finas
+        - menos de RADIO_GRUPOS px: los nodos comunes de cada celda de
+          CELDA_GRUPO px se dibujan como un solo circulo con la cantidad
+        Los nodos destacados y las aristas resaltadas se dibujan siempre.
+        """
+        self._cancelar_render()
+        self._verificar_items()
+        zoom, ox, oy = self.zoom, self.offset_x, self.offset_y
+        
+        # Nodos dentro de la vista (con margen para los circulos del borde)
+        ancho, alto = self._tamaño_vista()
+        margen = self._radio_maximo * zoom
+        x0, y0 = self.a_mundo(-margen, -margen)
+        x1, y1 = self.a_mundo(ancho + margen, alto + margen)
+        visibles = self._nodos_en(x0, y0, x1, y1)
+        
+        radio_comun = self._radio_comun * zoom
+        con_nombres = radio_comun >= self.RADIO_NOMBRES
+        con_finas = radio_comun >= self.RADIO_ARISTAS
+        agrupar = radio_comun < self.RADIO_GRUPOS
+        
+        pantalla = {}
+        estilos = {}
+        celdas = defaultdict(list)
+        celda = self.CELDA_GRUPO
+        for nodo in visibles:
+            x, y = self.posiciones[nodo]
+            if not (x0 <= x <= x1 and y0 <= y <= y1):
+                continue  # en una celda del borde pero fuera de la vista
+            x, y = x * zoom, y * zoom
+            if agrupar and nodo not in self._destacados:
+                # Celdas fijas respecto del layout: al arrastrar no cambian los grupos
+                celdas[(int(x // celda), int(y // celda))].append((nodo, x + ox, y + oy))
+                continue
+            pantalla[nodo] = (x + ox, y + oy)
+            color, radio, color_texto, nombre, borde = self._nodos_pedidos[nodo]
+            estilos[nodo] = (color, radio * zoom, color_texto,
+                             nombre if con_nombres else None, borde)
+        
+        grupos = {}
+        for clave, miembros in celdas.items():
+            if len(miembros) == 1:
+                nodo, x, y = miembros[0]
+                color, radio, color_texto, _, borde = self._nodos_pedidos[nodo]
+                pantalla[nodo] = (x, y)
+                estilos[nodo] = (color, radio * zoom, color_texto, None, borde)
+                continue
+            cantidad = len(miembros)
+            grupos[clave] = (sum(m[1] for m in miembros) / cantidad,
+                             sum(m[2] for m in miembros) / cantidad,
+                             min(celda / 2, 2 + math.sqrt(cantidad)),
+                             cantidad)
+        
+        # Aristas con al menos un extremo dibujado
+        aristas = {}
+        for nodo in list(pantalla):
+            for arista in self._aristas_de.get(nodo, ()):
+                if arista in aristas:
+                    continue
+                estilo = self._aristas_pedidas[arista]
+                if estilo[1] <= 1 and not con_finas:
+                    continue
+                otro = arista[1] if arista[0] == nodo else arista[0]
+                if otro not in pantalla:
+                    x, y = self.posiciones[otro]
+                    pantalla[otro] = (x * zoom + ox, y * zoom + oy)
+                aristas[arista] = estilo
+        
+        self._sincronizar_items(aristas, estilos, pantalla)
+        self._sincronizar_grupos(grupos)
+    
+    def _verificar_items(self):
+        #Si el canvas se borro desde afuera, los elementos guardados ya no existen.
+        #Alcanza con mirar uno: canvas.delete("all") se los lleva a todos
+        muestra = next(chain(self.nodos_dibujados.values(),
+                             self.grupos_dibujados.values()), None)
+        if muestra is not None and not self.canvas.type(muestra[0]):
+            self._olvidar_items()
+    
+    # Dibujo retenido: se reutilizan los elementos del dibujo anterior
+    def _sincronizar_items(self, aristas, estilos, pantalla):
+        """
+        Compara las aristas/nodos pedidos con los que ya estan en el canvas:
+        borra los que sobran, mueve y reconfigura los que siguen (solo si
+        cambio su estilo) y crea los nuevos.
+        
+        Args:
+            aristas: {(nodo, vecino): (color, ancho)}
+            estilos: {nodo: (color, radio, color_texto, nombre o None, borde)}
+            pantalla: {nodo: (x, y)} posicion en el canvas
+        """
+        canvas = self.canvas
+        creados = False
+        
+        # Aristas
+        for arista in [a for a in self.aristas_dibujadas if a not in aristas]:
+            canvas.delete(self.aristas_dibujadas.pop(arista))
+            del self._estilos_aristas[arista]
+        for arista, estilo in aristas.items():
+            x1, y1 = pantalla[arista[0]]
+            x2, y2 = pantalla[arista[1]]
+            linea = self.aristas_dibujadas.get(arista)
+            if linea is None:
+                color, ancho = estilo
+                self.aristas_dibujadas[arista] = canvas.create_line(
+                    x1, y1, x2, y2,
+                    fill=color, width=ancho, tags="arista"
+                )
+                creados = True
+            else:
+                canvas.coords(linea, x1, y1, x2, y2)
+                if self._estilos_aristas[arista] != estilo:
+                    canvas.itemconfig(linea, fill=estilo[0], width=estilo[1])
+            self._estilos_aristas[arista] = estilo
+        
+        # Nodos
+        for nodo in [n for n in self.nodos_dibujados if n not in estilos]:
+            circulo, texto = self.nodos_dibujados.pop(nodo)
+            canvas.delete(circulo)
+            if texto is not None:
+                canvas.delete(texto)
+            del self.radios[nodo]
+            del self._estilos_nodos[nodo]
+        
+        for nodo, estilo in estilos.items():
+            color, radio, color_texto, nombre, borde = estilo
+            x, y = pantalla[nodo]
+            circulo, texto = self.nodos_dibujados.get(nodo, (None, None))
+            anterior = self._estilos_nodos.get(nodo)
+        
+            if circulo is None:
+                circulo = canvas.create_oval(
                     x - radio, y - radio,
                     x + radio, y + radio,
-                    fill=color, outline="white", width=3,  # Borde más grueso
+                    fill=color, outline="white", width=borde,
                     tags=("nodo", f"nodo_{nodo}")
                 )
-                
-                # Dibujar nombre del nodo
-                nombre = self.usuarios.get(nodo, f"ID: {nodo}")
-                # Truncar nombre si es muy largo
-                if len(nombre) > 10:
-                    nombre = nombre[:8] + "..."
-                
-                texto = self.canvas.create_text(
+                creados = True
+            else:
+                canvas.coords(circulo, x - radio, y - radio, x + radio, y + radio)
+                if anterior[0] != color or anterior[4] != borde:
+                    canvas.itemconfig(circulo, fill=color, width=borde)
+        
+            if nombre is None:
+                if texto is not None:
+                    canvas.delete(texto)
+                    texto = None
+            elif texto is None:
+                texto = canvas.create_text(
                     x, y,
                     text=nombre,
                     font=("Arial", 10, "bold"),  # Aumentado de 9 a 10
                     fill=color_texto,
                     tags=("texto", f"texto_{nodo}")
                 )
-                
-                self.nodos_dibujados[nodo] = (circulo, texto)
-                
-                # Agregar tooltip con nombre completo
-                self.agregar_tooltip(nodo, circulo)
-                
+                creados = True
+            else:
+                canvas.coords(texto, x, y)
+                if anterior[2] != color_texto or anterior[3] != nombre:
+                    canvas.itemconfig(texto, text=nombre, fill=color_texto)
+        
+            self.nodos_dibujados[nodo] = (circulo, texto)
+            self.radios[nodo] = radio
+            self._estilos_nodos[nodo] = estilo
+        
+        # Orden de apilado: aristas abajo, nombres arriba de los circulos
+        if creados:
+            canvas.tag_lower("arista")
+            canvas.tag_raise("texto")
+    
+    def _sincronizar_grupos(self, grupos):
+        """
+        Igual que _sincronizar_items para los circulos que reemplazan a
+        varios nodos. grupos: {celda: (x, y, radio, cantidad)}
+        """
+        canvas = self.canvas
+        color = self._estilo_comun[0]
+        creados = False
+        for clave in [c for c in self.grupos_dibujados if c not in grupos]:
+            circulo, texto = self.grupos_dibujados.pop(clave)
+            canvas.delete(circulo)
+            if texto is not None:
+                canvas.delete(texto)
+            del self._estilos_grupos[clave]
+        
+        for clave, (x, y, radio, cantidad) in grupos.items():
+            circulo, texto = self.grupos_dibujados.get(clave, (None, None))
+            if circulo is None:
+                circulo = canvas.create_oval(x - radio, y - radio, x + radio, y + radio,
+                                             fill=color, outline="white", tags="grupo")
+                creados = True
+            else:
+                canvas.coords(circulo, x - radio, y - radio, x + radio, y + radio)
+                if self._estilos_grupos[clave][0] != color:
+                    canvas.itemconfig(circulo, fill=color)
+        
+            # La cantidad solo si el circulo es lo bastante grande
+            etiqueta = str(cantidad) if cantidad >= 10 else None
+            if etiqueta is None:
+                if texto is not None:
+                    canvas.delete(texto)
+                    texto = None
+            elif texto is None:
+                texto = canvas.create_text(x, y, text=etiqueta, font=("Arial", 7),
+                                           fill="white", tags=("texto", "grupo"))
+                creados = True
+            else:
+                canvas.coords(texto, x, y)
+                if self._estilos_grupos[clave][1] != etiqueta:
+                    canvas.itemconfig(texto, text=etiqueta)
+        
+            self.grupos_dibujados[clave] = (circulo, texto)
+            self._estilos_grupos[clave] = (color, etiqueta)
+        
+        if creados:
+            canvas.tag_lower("arista")
+            canvas.tag_raise("texto")
+    
+    # Grilla de posiciones (vista visible y tooltip)
+    def _indexar_posiciones(self):
+        #Grilla {(columna, fila): [nodos]} en coordenadas del layout
+        celda = self.CELDA_GRILLA
+        grilla = defaultdict(list)
+        for nodo in self._nodos_pedidos:
+            x, y = self.posiciones[nodo]
+            grilla[(int(x // celda), int(y // celda))].append(nodo)
+        self._grilla = grilla
     
-    def agregar_tooltip(self, nodo_id, elemento):
-        #Agrega un tooltip al pasar el mouse sobre un nodo
+    def _nodos_en(self, x0, y0, x1, y1):
+        #Nodos de las celdas que tocan el rectangulo (x0, y0)-(x1, y1) del layout
+        celda = self.CELDA_GRILLA
+        c0, c1 = int(x0 // celda), int(x1 // celda)
+        f0, f1 = int(y0 // celda), int(y1 // celda)
+        if (c1 - c0 + 1) * (f1 - f0 + 1) > len(self._grilla):
+            # Vista mas grande que el grafo: recorrer solo las celdas ocupadas
+            return [nodo for (i, j), nodos in self._grilla.items()
+                    if c0 <= i <= c1 and f0 <= j <= f1 for nodo in nodos]
+        visibles = []
+        for i in range(c0, c1 + 1):
+            for j in range(f0, f1 + 1):
+                visibles.extend(self._grilla.get((i, j), ()))
+        return visibles
+    
+    def nodo_en(self, x, y):
+        #Nodo dibujado que contiene el punto (x, y) del layout, o None
+        celda = self.CELDA_GRILLA
+        cx, cy = int(x // celda), int(y // celda)
+        mejor, mejor_dist = None, None
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                for nodo in self._grilla.get((i, j), ()):
+                    if nodo not in self.nodos_dibujados:
+                        continue  # fuera de la vista o dentro de un grupo
+                    nx, ny = self.posiciones[nodo]
+                    dist = (nx - x) ** 2 + (ny - y) ** 2
+                    radio = self._nodos_pedidos[nodo][1]
+                    if dist <= radio ** 2 and (mejor is None or dist < mejor_dist):
+                        mejor, mejor_dist = nodo, dist
+        return mejor
+    
+    # Tooltip con un unico manejador de <Motion>
+    def _on_movimiento(self, event):
+        if not self.nodos_dibujados:
+            return
+        x = self.canvas.canvasx(event.x)
+        y = self.canvas.canvasy(event.y)
+        nodo = self.nodo_en(*self.a_mundo(x, y))
+        if nodo == self._nodo_tooltip:
+            return
+        self._nodo_tooltip = nodo
+        if nodo is None:
+            self._ocultar_tooltip()
+        else:
+            self._mostrar_tooltip(nodo, x + 10, y - 30)
+    
+    def _mostrar_tooltip(self, nodo_id, x, y):
+        #Muestra el nombre completo y el grado del nodo (reutiliza los mismos elementos)
         nombre_completo = self.usuarios.get(nodo_id, f"Usuario {nodo_id}")
         grado = len(self.grafo.get(nodo_id, []))
+        texto = f"{nombre_completo}\nConexiones: {grado}"
         
-        def mostrar_tooltip(event):
-            x = self.canvas.winfo_pointerx() - self.canvas.winfo_rootx() + 10
-            y = self.canvas.winfo_pointery() - self.canvas.winfo_rooty() - 30
-            
-            self.canvas.delete("tooltip")
-            
-            # Crear tooltip
+        if self._tooltip is None or not self.canvas.type(self._tooltip[0]):
             rect = self.canvas.create_rectangle(
                 x, y, x + 150, y + 40,
                 fill="#333333", outline="#555555",
                 tags="tooltip"
             )
-            
-            texto = f"{nombre_completo}\nConexiones: {grado}"
-            self.canvas.create_text(
+            etiqueta = self.canvas.create_text(
                 x + 75, y + 20,
                 text=texto,
                 fill="white",
                 font=("Arial", 9),
                 tags="tooltip"
             )
-        
-        def ocultar_tooltip(event):
-            self.canvas.delete("tooltip")
-        
-        self.canvas.tag_bind(elemento, "<Enter>", mostrar_tooltip)
-        self.canvas.tag_bind(elemento, "<Leave>", ocultar_tooltip)
-
+            self._tooltip = (rect, etiqueta)
+        else:
+            rect, etiqueta = self._tooltip
+            self.canvas.coords(rect, x, y, x + 150, y + 40)
+            self.canvas.coords(etiqueta, x + 75, y + 20)
+            self.canvas.itemconfig(etiqueta, text=texto)
+            self.canvas.itemconfig("tooltip", state="normal")
+        self.canvas.tag_raise("tooltip")
+    
+    def _ocultar_tooltip(self, event=None):
+        self._nodo_tooltip = None
+        if self._tooltip is not None:
+            self.canvas.itemconfig("tooltip", state="hidden")
 
 # Analisis del grafo
 def analizar_grafo(grafo, usuarios):
@@ -886,7 +1481,10 @@ def analizar_grafo(grafo, usuarios):
     
     # Estadisticas basicas
     num_nodos = len(usuarios)
-    num_aristas = sum(len(vecinos) for vecinos in grafo.values()) // 2
+    if isinstance(grafo, GrafoCSR):
+        num_aristas = grafo.num_aristas
+    else:
+        num_aristas = sum(len(vecinos) for vecinos in grafo.values()) // 2
     
     if grados:
         grado_promedio = sum(grados.values()) / len(grados)
@@ -0,0 +1,194 @@
+import os
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_datos import firma_contenido, NOMBRE_CARPETA_CACHE
+from grafo_csr import GrafoCSR
+
+
+# Indice de distancias entre todos los pares (grafos pequeños y medianos)
+#
+# La matriz n x n se guarda en un bytearray (uint8): matriz[i*n + j] es la
+# cantidad de saltos entre los nodos i y j del GrafoCSR, o INALCANZABLE.
+# Con 5000 usuarios ocupa 25 MB.
+
+INALCANZABLE = 255
+LIMITE_NODOS_INDICE = 5000
+VERSION_INDICE = 1
+
+
+# Trabajadores del pool de procesos
+# Se crean con "spawn": el pool se arranca desde un hilo de la app, y hacer
+# fork de un proceso con Tk y otros hilos vivos puede trabarse
+_CONTEXTO = multiprocessing.get_context("spawn")
+_offsets = None
+_vecinos = None
+
+
+def _inicializar_trabajador(grafo):
+    #Cada proceso recibe el grafo una sola vez (un GrafoMapeado llega como
+    #la ruta de su archivo y se vuelve a mapear, sin copiar la adyacencia)
+    global _offsets, _vecinos
+    _offsets = grafo.offsets
+    _vecinos = grafo.vecinos
+
+
+def _bfs_fila(origen, offsets, vecinos):
+    #Distancias desde origen a todos los nodos como fila uint8
+    n = len(offsets) - 1
+    fila = bytearray(b"\xff") * n
+    fila[origen] = 0
+    frontera = [origen]
+    distancia = 0
+
+    while frontera:
+        distancia += 1
+        siguiente = []
+        for u in frontera:
+            for v in vecinos[offsets[u]:offsets[u + 1]]:
+                if fila[v] == INALCANZABLE:
+                    if distancia >= INALCANZABLE:
+                        raise ValueError("El diametro del grafo no cabe en uint8")
+                    fila[v] = distancia
+                    siguiente.append(v)
+        frontera = siguiente
+
+    return fila
+
+
+def _bfs_bloque(origenes):
+    #Tarea del pool: filas concatenadas para un rango de origenes
+    bloque = bytearray()
+    for origen in origenes:
+        bloque += _bfs_fila(origen, _offsets, _vecinos)
+    return bytes(bloque)
+
+
+class IndiceDistancias:
+    """
+    Distancias en saltos precalculadas para todos los pares de usuarios.
+    distancia() es O(1) y camino() solo recorre el camino resultante.
+    """
+
+    def __init__(self, grafo, matriz):
+        self.grafo = grafo
+        self.n = len(grafo)
+        self.matriz = matriz
+
+    @classmethod
+    def construir(cls, grafo, procesos=None, tam_bloque=64):
+        """
+        Ejecuta un BFS por cada nodo, repartidos en un pool de procesos.
+
+        Args:
+            grafo: GrafoCSR o GrafoMapeado (grafo_mmap)
+            procesos: numero de procesos (None = todos los nucleos, 1 = sin pool)
+            tam_bloque: origenes por tarea
+        """
+        n = len(grafo)
+        bloques = [range(i, min(i + tam_bloque, n)) for i in range(0, n, tam_bloque)]
+
+        if procesos == 1:
+            _inicializar_trabajador(grafo)
+            filas = map(_bfs_bloque, bloques)
+            return cls(grafo, bytearray().join(filas))
+
+        with ProcessPoolExecutor(max_workers=procesos,
+                                 mp_context=_CONTEXTO,
+                                 initializer=_inicializar_trabajador,
+                                 initargs=(grafo,)) as pool:
+            filas = pool.map(_bfs_bloque, bloques)
+            return cls(grafo, bytearray().join(filas))
+
+    # Consultas
+    def distancia(self, id1, id2):
+        #Saltos entre dos usuarios, None si no estan conectados
+        i = self.grafo.indice.get(id1)
+        j = self.grafo.indice.get(id2)
+        if i is None or j is None:
+            return None
+        d = self.matriz[i * self.n + j]
+        return None if d == INALCANZABLE else d
+
+    def camino(self, id1, id2):
+        """
+        Reconstruye un camino mas corto usando solo el indice: desde cada
+        nodo se avanza a un vecino que este un salto mas cerca del destino.
+        """
+        grafo = self.grafo
+        i = grafo.indice.get(id1)
+        j = grafo.indice.get(id2)
+        if i is None or j is None:
+            return [id1] if id1 == id2 else None
+
+        matriz, n = self.matriz, self.n
+        if matriz[i * n + j] == INALCANZABLE:
+            return None
+
+        camino = [i]
+        actual = i
+        while actual != j:
+            restante = matriz[actual * n + j] - 1
+            for v in grafo.vecinos_idx(actual):
+                if matriz[v * n + j] == restante:
+                    actual = v
+                    break
+            camino.append(actual)
+
+        return [grafo.ids[k] for k in camino]
+
+    # Persistencia
+    def guardar(self, ruta, firma):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        tmp = ruta + ".tmp"
+        cabecera = {"version": VERSION_INDICE, "firma": firma, "ids": self.grafo.ids}
+        with open(tmp, "wb") as f:
+            pickle.dump(cabecera, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(self.matriz)
+        os.replace(tmp, ruta)
+
+    @classmethod
+    def cargar(cls, ruta, grafo, firma):
+        #Retorna el indice guardado o None si no corresponde a este grafo
+        try:
+            with open(ruta, "rb") as f:
+                cabecera = pickle.load(f)
+                if (cabecera.get("version") != VERSION_INDICE
+                        or cabecera.get("firma") != firma
+                        or cabecera.get("ids") != grafo.ids):
+                    return None
+                matriz = bytearray(f.read())
+        except Exception:
+            return None
+        if len(matriz) != len(grafo) ** 2:
+            return None
+        return cls(grafo, matriz)
+
+    @classmethod
+    def cargar_o_construir(cls, grafo, archivo_xlsx, procesos=None):
+        """
+        Reutiliza el indice en disco si amistades.xlsx no cambió; si cambió
+        (o el grafo no coincide) el indice se invalida y se reconstruye.
+        Retorna None si el grafo es demasiado grande para la matriz.
+        """
+        if not isinstance(grafo, GrafoCSR) or len(grafo) > LIMITE_NODOS_INDICE:
+            return None
+
+        ruta = os.path.join(os.path.dirname(archivo_xlsx), NOMBRE_CARPETA_CACHE,
+                            "indice_distancias.bin")
+        firma = firma_contenido(archivo_xlsx)
+
+        indice = cls.cargar(ruta, grafo, firma)
+        if indice is not None:
+            return indice
+
+        try:
+            indice = cls.construir(grafo, procesos=procesos)
+        except ValueError:
+            return None
+        try:
+            indice.guardar(ruta, firma)
+        except OSError:
+            pass
+        return indice
@@ -0,0 +1,79 @@
+import columnar
+from grafos import registrar_like, cargar_likes, _registro_likes, DATASET_DIR
+from ranking import RankingPosts
+
+
+# Indice de likes en memoria
+class IndiceLikes:
+    """
+    Se carga una sola vez (con la salida de cargar_likes) y luego se
+    actualiza en O(1) con cada like registrado, asi las vistas de la app
+    no vuelven a leer likes.xlsx.
+
+    - ranking: RankingPosts con los likes por post (top-k en vivo)
+    - pares: {(id_usuario, id_post)} likes ya dados
+    """
+
+    def __init__(self, likes=()):
+        self.ranking = RankingPosts()
+        self.pares = set()
+        for like in likes:
+            self._agregar(like["id_usuario_like"], like["id_post"])
+
+    @classmethod
+    def cargar(cls):
+        """
+        Indice de todos los likes (Excel + likes.log).
+        Si likes.xlsx esta exportado en formato columnar (y vigente), los
+        conteos salen vectorizados de las columnas y solo los likes del
+        .log se agregan uno por uno.
+        """
+        if not columnar.vigente(DATASET_DIR, "likes"):
+            return cls(cargar_likes())
+
+        conteo, pares, max_id = columnar.resumen_likes(DATASET_DIR)
+        indice = cls()
+        indice.ranking = RankingPosts(conteo)
+        indice.pares = pares
+        for _, id_usuario, id_post in _registro_likes().eventos_posteriores(max_id):
+            indice._agregar(id_usuario, id_post)
+        return indice
+
+    def _agregar(self, id_usuario, id_post):
+        par = (str(id_usuario).strip(), int(id_post))
+        if par in self.pares:
+            return False
+        self.pares.add(par)
+        self.ranking.incrementar(par[1])
+        return True
+
+    def registrar(self, id_usuario, id_post):
+        """
+        Registra el like en disco (registrar_like) y, si tuvo exito,
+        actualiza el indice. Retorna (exito: bool, mensaje: str)
+        """
+        exito, mensaje = registrar_like(id_usuario, id_post)
+        if exito:
+            self._agregar(id_usuario, id_post)
+        return exito, mensaje
+
+    # Consultas
+    def likes_de(self, id_post):
+        #Cantidad de likes del post
+        return self.ranking.likes_de(int(id_post))
+
+    def dio_like(self, id_usuario, id_post):
+        #True si el usuario ya le dio like al post
+        return (str(id_usuario).strip(), int(id_post)) in self.pares
+
+    def top(self, k=5):
+        #[(id_post, likes), ...] de mayor a menor; en empates, el primero que recibio likes
+        return self.ranking.top(k)
+
+    def maximo(self):
+        #(id_post, likes) del post con mas likes, o None si no hay likes
+        return self.ranking.maximo()
+
+    def __len__(self):
+        #Total de likes
+        return len(self.pares)
@@ -0,0 +1,497 @@
+import math
+import random
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # sin NumPy se usa la version en Python puro
+    np = None
+
+
+# Layout de fuerzas (Fruchterman-Reingold simplificado)
+#
+# Mismo modelo de fuerzas que tenia VisualizadorGrafo.calcular_layout_fuerza:
+#   - repulsion k^2 / d^2 entre pares a menos de 3k
+#   - atraccion log(d / k) * 0.5 por cada vecino dentro del layout
+#   - factor que baja de 1.0 a 0.5, amortiguacion 0.9 y bordes de 50 px
+# Con NumPy las posiciones son un arreglo (n, 2) y cada iteracion se
+# calcula con operaciones sobre arreglos; sin NumPy se usan listas de
+# floats con indices (sin copiar sublistas en el doble ciclo).
+#
+# Modo "barnes_hut": la repulsion se aproxima con un quadtree que se arma
+# en cada iteracion. Un grupo de nodos lejano (lado / distancia < theta)
+# empuja como un solo nodo con toda su masa en el centro de masa, y las
+# celdas enteras fuera del radio 3k se descartan. O(n log n) por iteracion
+# en lugar de O(n^2).
+
+C_SPRING = 1.0
+DAMPING = 0.9
+MARGEN = 50
+BLOQUE_REPULSION = 1 << 22   # pares por bloque de la matriz de distancias
+
+# Cantidad de nodos que se puede dibujar sin que la interfaz se trabe
+NODOS_INTERACTIVOS = 1000 if np is not None else 60
+
+# Barnes-Hut
+THETA = 0.8
+UMBRAL_BARNES_HUT = 2000 if np is not None else 500   # modo automatico
+NODOS_VISTA_COMPLETA = 3000 if np is not None else 1000
+LADO_MINIMO = 1e-6             # nodos superpuestos comparten hoja
+
+# Cache de layouts
+CAPACIDAD_CACHE_LAYOUTS = 32
+SOLAPAMIENTO_MINIMO = 0.5      # Jaccard minimo para arrancar desde otro layout
+ITERACIONES_TIBIO = 10         # iteraciones al partir de posiciones guardadas
+
+
+def iteraciones_para(num_nodos, iteraciones=50):
+    #Menos iteraciones en grafos grandes (mismo criterio que antes)
+    if num_nodos > 20:
+        return min(30, iteraciones)
+    if num_nodos > 10:
+        return min(40, iteraciones)
+    return iteraciones
+
+
+def posiciones_aleatorias(nodos, ancho, alto):
+    #Posiciones iniciales: {nodo: [x, y]} al azar dejando 100 px de borde
+    return {nodo: [random.uniform(100, ancho - 100), random.uniform(100, alto - 100)]
+            for nodo in nodos}
+
+
+def layout_circular(nodos, ancho, alto):
+    #Layout circular para pocos nodos
+    posiciones = {}
+    n = len(nodos)
+    if n == 0:
+        return posiciones
+
+    cx = ancho / 2
+    cy = alto / 2
+    radio = min(ancho, alto) * 0.25
+
+    if n == 1:
+        posiciones[nodos[0]] = [cx, cy]
+    elif n == 2:
+        posiciones[nodos[0]] = [cx - radio, cy]
+        posiciones[nodos[1]] = [cx + radio, cy]
+    else:
+        for i, nodo in enumerate(nodos):
+            angulo = 2 * math.pi * i / n - math.pi / 2  # Empezar desde arriba
+            posiciones[nodo] = [cx + radio * math.cos(angulo),
+                                cy + radio * math.sin(angulo)]
+    return posiciones
+
+
+def _aristas_internas(nodos_lista, grafo):
+    """
+    Pares (i, j) de indices en nodos_lista con j vecino de i.
+    Cada arista aparece en ambos sentidos, como en el ciclo original
+    (cada nodo es atraido por cada uno de sus vecinos).
+    """
+    posicion = {nodo: i for i, nodo in enumerate(nodos_lista)}
+    origenes, destinos = [], []
+    for i, nodo in enumerate(nodos_lista):
+        if nodo in grafo:
+            for vecino in grafo[nodo]:
+                j = posicion.get(vecino)
+                if j is not None:
+                    origenes.append(i)
+                    destinos.append(j)
+    return origenes, destinos
+
+
+# Quadtree para Barnes-Hut
+class _Quadtree:
+    """
+    Quadtree en listas planas: la celda c tiene esquina (x0[c], y0[c]),
+    lado[c], masa (cantidad de nodos), suma de coordenadas para el centro
+    de masa, primer hijo (los 4 hijos son consecutivos, -1 = hoja) y el
+    nodo que guarda si es hoja (-1 = vacia).
+    """
+
+    def __init__(self, xs, ys):
+        x0, y0 = min(xs), min(ys)
+        lado = max(max(xs) - x0, max(ys) - y0, 1.0) * 1.0001
+        self.x0, self.y0, self.lado = [x0], [y0], [lado]
+        self.masa, self.sx, self.sy = [0], [0.0], [0.0]
+        self.hijo, self.cuerpo = [-1], [-1]
+        for i in range(len(xs)):
+            self._insertar(i, xs, ys)
+
+    def _nueva_celda(self, x0, y0, lado):
+        self.x0.append(x0)
+        self.y0.append(y0)
+        self.lado.append(lado)
+        self.masa.append(0)
+        self.sx.append(0.0)
+        self.sy.append(0.0)
+        self.hijo.append(-1)
+        self.cuerpo.append(-1)
+
+    def _cuadrante(self, c, x, y):
+        mitad = self.lado[c] / 2
+        return (x >= self.x0[c] + mitad) + 2 * (y >= self.y0[c] + mitad)
+
+    def _insertar(self, i, xs, ys):
+        x, y = xs[i], ys[i]
+        c = 0
+        while True:
+            self.masa[c] += 1
+            self.sx[c] += x
+            self.sy[c] += y
+            if self.hijo[c] == -1:
+                if self.masa[c] == 1:
+                    self.cuerpo[c] = i          # hoja vacia
+                    return
+                if self.lado[c] < LADO_MINIMO:
+                    return                      # nodos superpuestos
+                # Dividir la hoja y bajar el nodo que tenia
+                mitad = self.lado[c] / 2
+                self.hijo[c] = len(self.masa)
+                for q in range(4):
+                    self._nueva_celda(self.x0[c] + mitad * (q & 1),
+                                      self.y0[c] + mitad * (q >> 1), mitad)
+                j = self.cuerpo[c]
+                self.cuerpo[c] = -1
+                h = self.hijo[c] + self._cuadrante(c, xs[j], ys[j])
+                self.masa[h] = 1
+                self.sx[h] = xs[j]
+                self.sy[h] = ys[j]
+                self.cuerpo[h] = j
+            c = self.hijo[c] + self._cuadrante(c, x, y)
+
+    def repulsion(self, i, x, y, intensidad, radio, theta):
+        """
+        Fuerza de repulsion (fx, fy) sobre el nodo i en (x, y):
+        suma de -intensidad * masa / d^2 en la direccion de cada grupo.
+        """
+        x0, y0, lado = self.x0, self.y0, self.lado
+        masa, sx, sy, hijo, cuerpo = self.masa, self.sx, self.sy, self.hijo, self.cuerpo
+        radio2 = radio * radio
+        sqrt = math.sqrt
+        fx = fy = 0.0
+        pila = [0]
+        while pila:
+            c = pila.pop()
+            m = masa[c]
+            if m == 0:
+                continue
+            # Descartar la celda si todo su cuadrado esta fuera del radio
+            ex = x0[c] - x
+            if ex < 0.0:
+                ex = -ex - lado[c]
+                if ex < 0.0:
+                    ex = 0.0
+            ey = y0[c] - y
+            if ey < 0.0:
+                ey = -ey - lado[c]
+                if ey < 0.0:
+                    ey = 0.0
+            if ex * ex + ey * ey >= radio2:
+                continue
+
+            cx, cy = sx[c], sy[c]
+            if hijo[c] == -1:
+                if cuerpo[c] == i:
+                    # Hoja propia: solo cuentan los nodos superpuestos con i
+                    m -= 1
+                    cx -= x
+                    cy -= y
+                    if m == 0:
+                        continue
+            elif ex == 0.0 and ey == 0.0:
+                h = hijo[c]
+                pila += (h, h + 1, h + 2, h + 3)  # i esta dentro
+                continue
+
+            dx = cx / m - x
+            dy = cy / m - y
+            dist = sqrt(dx * dx + dy * dy)
+            if hijo[c] != -1 and (dist == 0.0 or lado[c] / dist >= theta):
+                h = hijo[c]
+                pila += (h, h + 1, h + 2, h + 3)  # demasiado cerca
+                continue
+            if 0 < dist < radio:
+                escala = intensidad * m / (dist * dist * dist)
+                fx -= dx * escala
+                fy -= dy * escala
+        return fx, fy
+
+
+def _repulsion_barnes_hut(xs, ys, intensidad, radio, theta):
+    #Fuerzas de repulsion aproximadas de todos los nodos: (fx, fy)
+    arbol = _Quadtree(xs, ys)
+    fx, fy = [], []
+    for i in range(len(xs)):
+        rx, ry = arbol.repulsion(i, xs[i], ys[i], intensidad, radio, theta)
+        fx.append(rx)
+        fy.append(ry)
+    return fx, fy
+
+
+def elegir_modo(num_nodos, modo=None):
+    #"exacto" o "barnes_hut"; None elige segun la cantidad de nodos
+    if modo is None:
+        return "barnes_hut" if num_nodos > UMBRAL_BARNES_HUT else "exacto"
+    if modo not in ("exacto", "barnes_hut"):
+        raise ValueError(f"Modo de layout desconocido: {modo}")
+    return modo
+
+
+# Motor con NumPy
+def _repulsion_numpy(x, y, fuerzas, intensidad, radio, filas_bloque):
+    #Repulsion exacta entre todos los pares; dx[i, j] = x[j] - x[i], por bloques de filas
+    n = len(x)
+    radio2 = radio * radio
+    for inicio in range(0, n, filas_bloque):
+        fin = min(n, inicio + filas_bloque)
+        dx = x[None, :] - x[inicio:fin, None]
+        dy = y[None, :] - y[inicio:fin, None]
+        dist2 = dx * dx + dy * dy
+        # f / dist = intensidad / dist^3, solo si 0 < dist < radio
+        escala = np.zeros_like(dist2)
+        cerca = (dist2 > 0) & (dist2 < radio2)
+        np.divide(intensidad, dist2 * np.sqrt(dist2), out=escala, where=cerca)
+        fuerzas[inicio:fin, 0] -= np.einsum("ij,ij->i", escala, dx)
+        fuerzas[inicio:fin, 1] -= np.einsum("ij,ij->i", escala, dy)
+
+
+def _iterar_numpy(xy, origenes, destinos, k, ancho, alto, iteraciones, theta=None):
+    n = len(xy)
+    c_rep = k * k
+    origenes = np.asarray(origenes, dtype=np.intp)
+    destinos = np.asarray(destinos, dtype=np.intp)
+    filas_bloque = max(1, BLOQUE_REPULSION // max(n, 1))
+    fuerzas = np.empty_like(xy)
+
+    for iteracion in range(iteraciones):
+        factor = 1.0 - (iteracion / iteraciones) * 0.5
+        fuerzas.fill(0.0)
+
+        x, y = xy[:, 0], xy[:, 1]
+        if theta is None:
+            _repulsion_numpy(x, y, fuerzas, c_rep * factor, k * 3, filas_bloque)
+        else:
+            fx, fy = _repulsion_barnes_hut(x.tolist(), y.tolist(), c_rep * factor,
+                                           k * 3, theta)
+            fuerzas[:, 0] += fx
+            fuerzas[:, 1] += fy
+
+        # Atraccion por aristas
+        if len(origenes):
+            d = xy[destinos] - xy[origenes]
+            dist = np.hypot(d[:, 0], d[:, 1])
+            validas = dist > 0
+            escala = np.zeros_like(dist)
+            np.divide(C_SPRING * np.log(np.where(validas, dist, k) / k) * factor * 0.5,
+                      dist, out=escala, where=validas)
+            np.add.at(fuerzas, origenes, d * escala[:, None])
+
+        xy += fuerzas * DAMPING
+        np.clip(xy[:, 0], MARGEN, ancho - MARGEN, out=xy[:, 0])
+        np.clip(xy[:, 1], MARGEN, alto - MARGEN, out=xy[:, 1])
+        yield xy
+
+
+# Motor en Python puro
+def _repulsion_python(xs, ys, intensidad, radio):
+    #Repulsion exacta entre todos los pares: (fx, fy)
+    n = len(xs)
+    sqrt = math.sqrt
+    fx = [0.0] * n
+    fy = [0.0] * n
+    for i in range(n):
+        xi, yi = xs[i], ys[i]
+        for j in range(i + 1, n):
+            dx = xs[j] - xi
+            dy = ys[j] - yi
+            dist = sqrt(dx * dx + dy * dy)
+            if 0 < dist < radio:
+                escala = intensidad / (dist * dist * dist)
+                fx[i] -= dx * escala
+                fy[i] -= dy * escala
+                fx[j] += dx * escala
+                fy[j] += dy * escala
+    return fx, fy
+
+
+def _iterar_python(xs, ys, origenes, destinos, k, ancho, alto, iteraciones, theta=None):
+    n = len(xs)
+    c_rep = k * k
+    sqrt = math.sqrt
+    log = math.log
+    aristas = list(zip(origenes, destinos))
+
+    for iteracion in range(iteraciones):
+        factor = 1.0 - (iteracion / iteraciones) * 0.5
+        if theta is None:
+            fx, fy = _repulsion_python(xs, ys, c_rep * factor, k * 3)
+        else:
+            fx, fy = _repulsion_barnes_hut(xs, ys, c_rep * factor, k * 3, theta)
+
+        for i, j in aristas:
+            dx = xs[j] - xs[i]
+            dy = ys[j] - ys[i]
+            dist = sqrt(dx * dx + dy * dy)
+            if dist > 0:
+                escala = C_SPRING * log(dist / k) * factor * 0.5 / dist
+                fx[i] += dx * escala
+                fy[i] += dy * escala
+
+        for i in range(n):
+            xs[i] = max(MARGEN, min(ancho - MARGEN, xs[i] + fx[i] * DAMPING))
+            ys[i] = max(MARGEN, min(alto - MARGEN, ys[i] + fy[i] * DAMPING))
+        yield xs, ys
+
+
+def _motor(nodos_lista, grafo, posiciones, ancho, alto, iteraciones, modo, theta,
+           usar_numpy):
+    """
+    Prepara el layout y retorna (generador de iteraciones, convertir), donde
+    convertir(estado) arma el diccionario {nodo: [x, y]}.
+    """
+    n = len(nodos_lista)
+    k = math.sqrt((ancho * alto) / n)
+    iteraciones = iteraciones_para(n, iteraciones)
+    origenes, destinos = _aristas_internas(nodos_lista, grafo)
+    theta = theta if elegir_modo(n, modo) == "barnes_hut" else None
+
+    if np is not None and usar_numpy:
+        xy = np.array([posiciones[nodo] for nodo in nodos_lista], dtype=float)
+        pasos = _iterar_numpy(xy, origenes, destinos, k, ancho, alto, iteraciones, theta)
+        return pasos, lambda xy: dict(zip(nodos_lista, xy.tolist()))
+
+    xs = [float(posiciones[nodo][0]) for nodo in nodos_lista]
+    ys = [float(posiciones[nodo][1]) for nodo in nodos_lista]
+    pasos = _iterar_python(xs, ys, origenes, destinos, k, ancho, alto, iteraciones, theta)
+    return pasos, lambda estado: {nodo: [x, y] for nodo, x, y in zip(nodos_lista, *estado)}
+
+
+def iterar_layout(nodos, grafo, ancho=800, alto=600, iteraciones=50,
+                  posiciones=None, modo=None, theta=THETA, usar_numpy=True):
+    """
+    Generador del layout de fuerzas: produce (iteracion, {nodo: [x, y]})
+    despues de cada iteracion, para poder animar o cortar antes.
+
+    Args:
+        nodos: nodos a ubicar (el orden de iteracion fija las posiciones iniciales)
+        grafo: adyacencia {id: [vecinos]} o GrafoCSR
+        posiciones: posiciones iniciales {nodo: [x, y]} (None = al azar)
+        modo: "exacto", "barnes_hut" o None (segun la cantidad de nodos)
+        theta: precision de Barnes-Hut (menor = mas exacto y mas lento)
+        usar_numpy: False fuerza la version en Python puro
+    """
+    nodos_lista = list(nodos)
+    if posiciones is None:
+        posiciones = posiciones_aleatorias(nodos_lista, ancho, alto)
+    if not nodos_lista:
+        return
+
+    pasos, convertir = _motor(nodos_lista, grafo, posiciones, ancho, alto,
+                              iteraciones, modo, theta, usar_numpy)
+    for iteracion, estado in enumerate(pasos, 1):
+        yield iteracion, convertir(estado)
+
+
+def calcular_layout(nodos, grafo, ancho=800, alto=600, iteraciones=50,
+                    modo=None, theta=THETA, usar_numpy=True, posiciones=None):
+    """
+    Posiciones finales {nodo: [x, y]} del layout de fuerzas.
+    Con 5 nodos o menos se usa el layout circular.
+    posiciones: posiciones iniciales (None = al azar)
+    """
+    nodos_lista = list(nodos)
+    if posiciones is None:
+        posiciones = posiciones_aleatorias(nodos_lista, ancho, alto)
+    if len(nodos_lista) <= 5:
+        return layout_circular(nodos_lista, ancho, alto)
+
+    # Solo interesa el resultado final: no armar el diccionario en cada iteracion
+    pasos, convertir = _motor(nodos_lista, grafo, posiciones, ancho, alto,
+                              iteraciones, modo, theta, usar_numpy)
+    estado = None
+    for estado in pasos:
+        pass
+    return convertir(estado)
+
+
+# Cache de layouts ya calculados
+class CacheLayouts:
+    """
+    LRU de posiciones por conjunto de nodos: {(version, frozenset(nodos)): posiciones}.
+    La version identifica al grafo (si cambian las aristas, cambia la clave).
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_CACHE_LAYOUTS):
+        self.capacidad = capacidad
+        self.layouts = OrderedDict()
+
+    def __len__(self):
+        return len(self.layouts)
+
+    def obtener(self, nodos, version):
+        #Copia de las posiciones guardadas para exactamente estos nodos, o None
+        clave = (version, frozenset(nodos))
+        posiciones = self.layouts.get(clave)
+        if posiciones is None:
+            return None
+        self.layouts.move_to_end(clave)
+        return {nodo: list(p) for nodo, p in posiciones.items()}
+
+    def guardar(self, nodos, version, posiciones):
+        clave = (version, frozenset(nodos))
+        self.layouts[clave] = {nodo: list(p) for nodo, p in posiciones.items()}
+        self.layouts.move_to_end(clave)
+        while len(self.layouts) > self.capacidad:
+            self.layouts.popitem(last=False)
+
+    def mas_parecido(self, nodos, version, minimo=SOLAPAMIENTO_MINIMO):
+        """
+        Layout guardado cuyo conjunto de nodos mas se parece (Jaccard) a nodos.
+        Retorna (posiciones, solapamiento) o (None, 0.0) si ninguno llega a minimo.
+        """
+        nodos = frozenset(nodos)
+        mejor, mejor_solapamiento = None, 0.0
+        for (v, guardados), posiciones in self.layouts.items():
+            if v != version:
+                continue
+            comunes = len(nodos & guardados)
+            if not comunes:
+                continue
+            solapamiento = comunes / (len(nodos) + len(guardados) - comunes)
+            if solapamiento > mejor_solapamiento:
+                mejor, mejor_solapamiento = posiciones, solapamiento
+        if mejor_solapamiento < minimo:
+            return None, 0.0
+        return mejor, mejor_solapamiento
+
+    def limpiar(self):
+        self.layouts.clear()
+
+
+def posiciones_tibias(nodos, grafo, previas, ancho, alto):
+    """
+    Posiciones iniciales a partir de un layout anterior: los nodos que ya
+    estaban conservan su lugar y los nuevos arrancan junto a sus vecinos
+    ya ubicados (o al azar si no tienen ninguno).
+    """
+    posiciones = {}
+    nuevos = []
+    for nodo in nodos:
+        if nodo in previas:
+            posiciones[nodo] = list(previas[nodo])
+        else:
+            nuevos.append(nodo)
+
+    for nodo in nuevos:
+        ubicados = [posiciones[v] for v in grafo[nodo] if v in posiciones] if nodo in grafo else []
+        if ubicados:
+            x = sum(p[0] for p in ubicados) / len(ubicados) + random.uniform(-20, 20)
+            y = sum(p[1] for p in ubicados) / len(ubicados) + random.uniform(-20, 20)
+            posiciones[nodo] = [min(max(x, MARGEN), ancho - MARGEN),
+                                min(max(y, MARGEN), alto - MARGEN)]
+        else:
+            posiciones[nodo] = [random.uniform(100, ancho - 100),
+                                random.uniform(100, alto - 100)]
+    return posiciones
@@ -1,35 +1,34 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, Canvas, Frame
-import os
-from grafos import (cargar_grafo, cargar_usuarios, camino_mas_corto, 
-                   recomendar_amigos, obtener_subgrafo,
-                   SistemaComunidades, analizar_grafo, 
-                   VisualizadorGrafo, calcular_grados,
-                   cargar_likes, registrar_like,
-                   contar_likes_por_post,
-                   max_post_por_likes_divide_venceras,
-                   merge_sort_posts_por_likes, obtener_top_posts,
-                   cargar_posts, crear_post)
-
-
-
-# Cargar los datos
-# Cargar los datos
-usuarios, _ = cargar_usuarios()   # ignoramos el "post" de usuarios.xlsx
-grafo = cargar_grafo()
-sistema_comunidades = SistemaComunidades()
-
-# Nuevo: posts en archivo separado
-posts_por_id, posts_por_usuario = cargar_posts()
+import sys
+from perfil_arranque import PERFIL
 
-# Likes
-likes = cargar_likes()
-top_global = max_post_por_likes_divide_venceras(list(contar_likes_por_post(likes).items())) if likes else None
-ranking = obtener_top_posts(likes, k=5) if likes else []
+with PERFIL.fase("import tkinter"):
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog, Canvas, Frame
+import os
+import queue
+import threading
+import heapq
+with PERFIL.fase("import grafos"):
+    from grafos import (camino_mas_corto, recomendar_amigos, obtener_subgrafo,
+                        analizar_grafo, VisualizadorGrafo, calcular_grados,
+                        crear_post, compactar_registros, DATASET_DIR)
+    from layout import NODOS_INTERACTIVOS, NODOS_VISTA_COMPLETA
+with PERFIL.fase("import modulos de la app"):
+    from datos_red import DatosRedSocial
+    from selector_usuario import SelectorUsuario
+# indice_distancias, oraculo_landmarks y recomendaciones_lote se importan
+# en los hilos que los usan
+
+
+# Datos: se cargan en segundo plano con la ventana ya visible (o al
+# primer uso si algun boton los pide antes)
+datos = DatosRedSocial()
+
+INTERVALO_CARGA_MS = 50
 
 # Clase principal de la aplicación
 class RedSocialApp:
-    def __init__(self, root):
+    def __init__(self, root, al_terminar_carga=None, al_fallar_carga=None):
         self.root = root
         self.root.title(" Mini Red Social")
         self.root.geometry("1200x700")
@@ -38,12 +37,105 @@ class RedSocialApp:
         # Variables
         self.visualizador = None
         self.canvas_grafo = None
+        self.indice_distancias = None
+        self.recomendaciones = None
+        self.al_terminar_carga = al_terminar_carga   # funcion() cuando todo quedo listo
+        self.al_fallar_carga = al_fallar_carga       # funcion(error) en vez del messagebox
         
         # Crear interfaz
-        self.crear_interfaz()
+        with PERFIL.fase("crear interfaz"):
+            self.crear_interfaz()
+        
+        # Cargar los datos sin bloquear la ventana; al terminar se inicializa
+        # la visualización y los índices
+        self.cargar_datos()
+    
+    def cargar_datos(self):
+        """Carga los Excel en un hilo y muestra el avance en la barra del grafo"""
+        cola = queue.Queue()
+        
+        def trabajo():
+            try:
+                datos.cargar_todo(lambda hechas, total, fase:
+                                  cola.put(("progreso", hechas, total, fase)))
+                cola.put(("listo", 0, 0, None))
+            except Exception as e:
+                cola.put(("error", 0, 0, e))
+        
+        self.progreso_label.config(text="Cargando datos...")
+        threading.Thread(target=trabajo, daemon=True).start()
+        self.root.after(INTERVALO_CARGA_MS, self._revisar_carga, cola)
+    
+    def _revisar_carga(self, cola):
+        """Lee el avance de la carga (corre en el hilo de Tk)"""
+        while True:
+            try:
+                estado, hechas, total, dato = cola.get_nowait()
+            except queue.Empty:
+                break
+            if estado == "progreso":
+                self.progreso_label.config(text=f"Cargando {dato}... {hechas}/{total}")
+            elif estado == "error":
+                self.progreso_label.config(text="")
+                if self.al_fallar_carga:
+                    self.al_fallar_carga(dato)
+                else:
+                    messagebox.showerror("Error", f"No se pudieron cargar los datos:\n{dato}")
+                return
+            else:
+                self.datos_cargados()
+                return
+        self.root.after(INTERVALO_CARGA_MS, self._revisar_carga, cola)
+    
+    def datos_cargados(self):
+        """Conecta los datos ya cargados con la interfaz"""
+        self.progreso_label.config(text="")
+        self.selector_user1.directorio = datos.directorio
+        self.selector_user2.directorio = datos.directorio
         
         # Inicializar visualización
-        self.inicializar_visualizacion()
+        with PERFIL.fase("visualizacion inicial"):
+            self.inicializar_visualizacion()
+        
+        # Índice de distancias y recomendaciones en segundo plano
+        # (mientras tanto se calculan en cada clic)
+        self.preparar_indice_distancias()
+        self.preparar_recomendaciones()
+        
+        if self.al_terminar_carga:
+            self.al_terminar_carga()
+    
+    def preparar_indice_distancias(self):
+        """Carga o construye el índice de distancias sin bloquear la interfaz"""
+        def trabajo():
+            try:
+                from indice_distancias import IndiceDistancias
+                from oraculo_landmarks import OraculoLandmarks
+                # Los procesos del pool mapean el grafo en vez de recibir una copia
+                indice = IndiceDistancias.cargar_o_construir(
+                    datos.grafo_compartido, os.path.join(DATASET_DIR, "amistades.xlsx"))
+                if indice is None:
+                    # Grafo demasiado grande para la matriz: usar landmarks
+                    indice = OraculoLandmarks(datos.grafo)
+                self.indice_distancias = indice
+            except Exception:
+                # Sin índice las búsquedas siguen funcionando con BFS
+                self.indice_distancias = None
+        
+        threading.Thread(target=trabajo, daemon=True).start()
+    
+    def preparar_recomendaciones(self):
+        """Carga o calcula en lote el top de sugerencias de todos los usuarios"""
+        def trabajo():
+            try:
+                from recomendaciones_lote import RecomendacionesPrecalculadas
+                self.recomendaciones = RecomendacionesPrecalculadas.cargar_o_calcular(
+                    datos.grafo_compartido, datos.usuarios.keys(),
+                    os.path.join(DATASET_DIR, "amistades.xlsx"))
+            except Exception:
+                self.recomendaciones = None
+        
+        threading.Thread(target=trabajo, daemon=True).start()
     
     def crear_interfaz(self):
             """Crea la interfaz principal con dos paneles"""
@@ -104,14 +196,15 @@ class RedSocialApp:
         frame_usuarios.pack(pady=10, fill="x", padx=20)
         
         tk.Label(frame_usuarios, text="Usuario 1:", bg="white", 
-                font=("Arial", 10)).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.combo_user1 = ttk.Combobox(frame_usuarios, values=list(usuarios.values()), width=25)
-        self.combo_user1.grid(row=0, column=1, padx=5)
+                font=("Arial", 10)).grid(row=0, column=0, padx=5, pady=5, sticky="nw")
+        # El directorio se asigna cuando terminan de cargar los datos
+        self.selector_user1 = SelectorUsuario(frame_usuarios, None, width=25)
+        self.selector_user1.grid(row=0, column=1, padx=5, sticky="n")
         
         tk.Label(frame_usuarios, text="Usuario 2:", bg="white", 
-                font=("Arial", 10)).grid(row=1, column=0, padx=5, pady=5, sticky="w")
-        self.combo_user2 = ttk.Combobox(frame_usuarios, values=list(usuarios.values()), width=25)
-        self.combo_user2.grid(row=1, column=1, padx=5)
+                font=("Arial", 10)).grid(row=1, column=0, padx=5, pady=5, sticky="nw")
+        self.selector_user2 = SelectorUsuario(frame_usuarios, None, width=25)
+        self.selector_user2.grid(row=1, column=1, padx=5, sticky="n")
         
         # Separador
         tk.Frame(self.panel_izquierdo, height=2, bg="#e0e0e0").pack(fill="x", pady=10)
@@ -226,6 +319,13 @@ class RedSocialApp:
                  font=("Arial", 10), width=3).pack(side="left", padx=2)
         tk.Button(control_frame, text="🔎", command=self.reset_view,
                  font=("Arial", 10), width=3).pack(side="left", padx=2)
+        self.boton_cancelar = tk.Button(control_frame, text="✕", command=self.cancelar_layout,
+                                        font=("Arial", 10), width=3, state=tk.DISABLED)
+        self.boton_cancelar.pack(side="left", padx=2)
+        
+        self.progreso_label = tk.Label(control_frame, text="", bg="#f0f0f0",
+                                       fg="#666666", font=("Arial", 9))
+        self.progreso_label.pack(side="left", padx=10)
         
         self.info_label = tk.Label(control_frame, text="", bg="#f0f0f0", font=("Arial", 9))
         self.info_label.pack(side="right", padx=10)
@@ -251,23 +351,44 @@ class RedSocialApp:
             
             # Crear visualizador
             self.visualizador = VisualizadorGrafo(
-                self.canvas_grafo, grafo, usuarios, 
+                self.canvas_grafo, datos.grafo, datos.usuarios, 
                 ancho if ancho > 100 else 600, 
                 alto if alto > 100 else 400
             )
+            self.visualizador.al_progresar = self.mostrar_progreso_layout
             
             # Mostrar vista inicial limitada
             self.visualizar_vecindario()
     
     def actualizar_visualizacion(self, *args):
         """Actualiza la visualización cuando cambia el slider de alcance"""
-        if self.combo_user1.get():
+        if self.selector_user1.get():
             self.visualizar_vecindario()
     
+    def _id_seleccionado(self, etiqueta):
+        """
+        Id del usuario elegido en un selector. Si el texto no corresponde a
+        un unico usuario avisa y retorna None.
+        """
+        id_usuario = datos.directorio.id_de(etiqueta)
+        if id_usuario is not None:
+            return id_usuario
+        
+        repetidos = len(datos.directorio.ids_de_nombre(etiqueta))
+        if repetidos > 1:
+            messagebox.showwarning(
+                "Nombre ambiguo",
+                f"Hay {repetidos} usuarios llamados \"{etiqueta}\".\n"
+                f"Elige de la lista la entrada \"{etiqueta} (#id)\" del usuario que buscas."
+            )
+        else:
+            messagebox.showwarning("Error", f"No se encontró el usuario \"{etiqueta}\".")
+        return None
+    
     def buscar_camino(self):
         """Busca y visualiza el camino más corto entre dos usuarios"""
-        u1 = self.combo_user1.get()
-        u2 = self.combo_user2.get()
+        u1 = self.selector_user1.get()
+        u2 = self.selector_user2.get()
         
         if not u1 or not u2:
             messagebox.showwarning("Error", "Debes seleccionar dos usuarios.")
@@ -277,15 +398,19 @@ class RedSocialApp:
             messagebox.showwarning("Error", "Selecciona dos usuarios diferentes.")
             return
         
-        id1 = next((k for k,v in usuarios.items() if v == u1), None)
-        id2 = next((k for k,v in usuarios.items() if v == u2), None)
+        id1 = self._id_seleccionado(u1)
+        if id1 is None:
+            return
+        id2 = self._id_seleccionado(u2)
+        if id2 is None:
+            return
         
-        camino = camino_mas_corto(grafo, id1, id2)
+        camino = camino_mas_corto(datos.grafo, id1, id2, indice=self.indice_distancias)
         
         if camino:
             # Obtener subgrafo del camino y sus vecinos
             alcance = self.alcance_var.get()
-            subgrafo, nodos = obtener_subgrafo(grafo, camino, saltos=alcance)
+            subgrafo, nodos = obtener_subgrafo(datos.grafo, camino, saltos=alcance)
             
             # Visualizar
             if self.visualizador:
@@ -317,7 +442,7 @@ class RedSocialApp:
         texto.pack(fill="both", expand=True)
         
         for i, nodo_id in enumerate(camino):
-            nombre = usuarios.get(nodo_id, f"Usuario {nodo_id}")
+            nombre = datos.usuarios.get(nodo_id, f"Usuario {nodo_id}")
             if i == 0:
                 texto.insert(tk.END, f" {i+1}. {nombre} (Origen)\n")
             elif i == len(camino) - 1:
@@ -330,32 +455,47 @@ class RedSocialApp:
     
     def mostrar_recomendaciones(self):
         """Muestra recomendaciones de amigos y las visualiza"""
-        u = self.combo_user1.get()
+        u = self.selector_user1.get()
         if not u:
             messagebox.showwarning("Error", "Selecciona un usuario primero.")
             return
         
-        idu = next((k for k,v in usuarios.items() if v == u), None)
-        sugerencias = recomendar_amigos(grafo, idu)
-        
-        if sugerencias:
+        idu = self._id_seleccionado(u)
+        if idu is None:
+            return
+        ranking = None
+        if self.recomendaciones is not None:
+            ranking = self.recomendaciones.obtener(idu, k=10)
+        if ranking is None:
+            ranking = recomendar_amigos(datos.grafo, idu, k=10)
+        
+        if ranking:
+            sugerencias = [s for s, _ in ranking]
+            
             # Visualizar el usuario, sus amigos y las sugerencias
-            nodos_centrales = [idu] + list(grafo[idu]) + sugerencias[:10]
-            subgrafo, nodos = obtener_subgrafo(grafo, nodos_centrales, saltos=1)
+            nodos_centrales = [idu] + list(datos.grafo[idu]) + sugerencias
+            subgrafo, nodos = obtener_subgrafo(datos.grafo, nodos_centrales, saltos=0)
             
             if self.visualizador:
-                self.visualizador.dibujar_grafo(subgrafo, nodos_destacados=set(sugerencias))
+                # Una capa por grupo: sugerencias en morado y el usuario en verde
+                capas = [
+                    {"nodos": set(sugerencias), "color": "#9c27b0", "radio": 30,
+                     "color_texto": "white"},
+                    {"nodos": {idu}, "color": "#4caf50", "radio": 30,
+                     "color_texto": "white"},
+                ]
+                self.visualizador.dibujar_grafo(subgrafo, capas=capas)
             
-            self.info_label.config(text=f"Recomendaciones para {u}: {len(sugerencias)} sugerencias")
+            self.info_label.config(text=f"Recomendaciones para {u}: top {len(ranking)} sugerencias")
             
             # Mostrar lista de recomendaciones
-            self.mostrar_lista_recomendaciones(u, sugerencias)
+            self.mostrar_lista_recomendaciones(u, ranking)
         else:
             messagebox.showinfo("Recomendaciones", 
                               f"No hay sugerencias de amigos para {u}.")
     
-    def mostrar_lista_recomendaciones(self, usuario, sugerencias):
-        """Muestra la lista de recomendaciones en una ventana"""
+    def mostrar_lista_recomendaciones(self, usuario, ranking):
+        """Muestra la lista de recomendaciones [(id, amigos en común)] en una ventana"""
         ventana = tk.Toplevel(self.root)
         ventana.title(f"Recomendaciones para {usuario}")
         ventana.geometry("300x400")
@@ -370,8 +510,9 @@ class RedSocialApp:
         listbox = tk.Listbox(frame, font=("Arial", 10))
         scrollbar = tk.Scrollbar(frame, orient=tk.VERTICAL)
         
-        for i, s in enumerate(sugerencias, 1):
-            listbox.insert(tk.END, f"{i}. {usuarios[s]}")
+        for i, (s, comunes) in enumerate(ranking, 1):
+            texto_comunes = "1 amigo en común" if comunes == 1 else f"{comunes} amigos en común"
+            listbox.insert(tk.END, f"{i}. {datos.usuarios.get(s, f'Usuario {s}')} ({texto_comunes})")
         
         listbox.config(yscrollcommand=scrollbar.set)
         scrollbar.config(command=listbox.yview)
@@ -379,26 +520,28 @@ class RedSocialApp:
         listbox.pack(side=tk.LEFT, fill="both", expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        tk.Label(ventana, text=f"Total: {len(sugerencias)} sugerencias", 
+        tk.Label(ventana, text=f"Top {len(ranking)} por amigos en común", 
                 bg="white", font=("Arial", 9)).pack(pady=10)
     
     def mostrar_feed(self):
         """Muestra el feed del usuario seleccionado (todos sus posts)"""
-        u = self.combo_user1.get()
+        u = self.selector_user1.get()
         if not u:
             messagebox.showwarning("Error", "Selecciona un usuario primero.")
             return
 
-        idu = next((k for k, v in usuarios.items() if v == u), None)
+        idu = self._id_seleccionado(u)
+        if idu is None:
+            return
 
         # Visualizar el usuario y sus conexiones directas
         nodos_centrales = [idu]
-        subgrafo, nodos = obtener_subgrafo(grafo, nodos_centrales, saltos=1)
+        subgrafo, nodos = obtener_subgrafo(datos.grafo, nodos_centrales, saltos=1)
 
         if self.visualizador:
             self.visualizador.dibujar_grafo(subgrafo, nodos_destacados={idu})
 
-        self.info_label.config(text=f"Feed de {u} - {len(grafo.get(idu, []))} amigos")
+        self.info_label.config(text=f"Feed de {u} - {len(datos.grafo.get(idu, []))} amigos")
 
         # Mostrar ventana del feed
         ventana = tk.Toplevel(self.root)
@@ -417,14 +560,14 @@ class RedSocialApp:
         texto.pack(padx=10, pady=10, fill="both", expand=True)
 
         # Obtener TODOS los posts del usuario
-        post_ids = posts_por_usuario.get(idu, [])
+        post_ids = datos.posts_por_usuario.get(idu, [])
 
         if not post_ids:
             texto.insert(tk.END, "Este usuario aún no tiene publicaciones...")
         else:
             # Mostrar del más reciente al más antiguo
             for pid in sorted(post_ids, reverse=True):
-                info_post = posts_por_id.get(pid)
+                info_post = datos.posts_por_id.get(pid)
                 if not info_post:
                     continue
                 contenido = info_post["contenido"]
@@ -437,17 +580,14 @@ class RedSocialApp:
         Ahora: CREA un nuevo post para el Usuario 1.
         (Deja de editar el post único de usuarios.xlsx)
         """
-        global posts_por_id, posts_por_usuario
-
-        u = self.combo_user1.get()
+        u = self.selector_user1.get()
         if not u:
             messagebox.showwarning("Error", "Selecciona primero el Usuario 1.")
             return
 
         # ID del usuario
-        idu = next((k for k, v in usuarios.items() if v == u), None)
+        idu = self._id_seleccionado(u)
         if idu is None:
-            messagebox.showerror("Error", "No se encontró el ID del usuario seleccionado.")
             return
 
         # Crear ventana
@@ -489,11 +629,11 @@ class RedSocialApp:
                 return
 
             # Actualizar estructuras en memoria
-            posts_por_id[nuevo_id] = {
+            datos.posts_por_id[nuevo_id] = {
                 "id_usuario": idu,
                 "contenido": nuevo_post
             }
-            posts_por_usuario.setdefault(idu, []).append(nuevo_id)
+            datos.posts_por_usuario.setdefault(idu, []).append(nuevo_id)
 
             messagebox.showinfo("Post guardado", f"Post creado con ID #{nuevo_id}.")
             ventana.destroy()
@@ -514,7 +654,7 @@ class RedSocialApp:
         Abre una ventana para que el Usuario 1 seleccione
         a qué post (específico) quiere darle like.
         """
-        u_like = self.combo_user1.get()
+        u_like = self.selector_user1.get()
         if not u_like:
             messagebox.showwarning(
                 "Error",
@@ -523,12 +663,11 @@ class RedSocialApp:
             return
 
         # ID del que da like
-        id_like_user = next((k for k, v in usuarios.items() if v == u_like), None)
+        id_like_user = self._id_seleccionado(u_like)
         if id_like_user is None:
-            messagebox.showerror("Error", "No se pudo encontrar el ID del usuario que da like.")
             return
 
-        if not posts_por_id:
+        if not datos.posts_por_id:
             messagebox.showinfo("Info", "Aún no hay posts publicados.")
             return
 
@@ -560,10 +699,10 @@ class RedSocialApp:
         self._mapa_posts_listbox = []  # [id_post, ...]
 
         # Mostrar posts ordenados del más reciente al más antiguo
-        for post_id in sorted(posts_por_id.keys(), reverse=True):
-            info = posts_por_id[post_id]
+        for post_id in sorted(datos.posts_por_id.keys(), reverse=True):
+            info = datos.posts_por_id[post_id]
             autor_id = info["id_usuario"]
-            autor_nombre = usuarios.get(autor_id, f"Usuario {autor_id}")
+            autor_nombre = datos.usuarios.get(autor_id, f"Usuario {autor_id}")
             post_text = info["contenido"]
             snippet = post_text if len(post_text) <= 60 else post_text[:57] + "..."
             display = f"#{post_id} | {autor_nombre}  |  {snippet}"
@@ -581,21 +720,17 @@ class RedSocialApp:
 
             idx = seleccion[0]
             id_post = self._mapa_posts_listbox[idx]
-            info = posts_por_id.get(id_post)
+            info = datos.posts_por_id.get(id_post)
             if not info:
                 messagebox.showerror("Error", "No se encontró la información del post.")
                 return
 
             autor_id = info["id_usuario"]
-            nombre_autor = usuarios.get(autor_id, f"Usuario {autor_id}")
+            nombre_autor = datos.usuarios.get(autor_id, f"Usuario {autor_id}")
 
-            # Registrar like
-            exito, mensaje = registrar_like(id_like_user, id_post)
-
-            # Recontar likes para ese post
-            likes_actuales = cargar_likes()
-            conteo = contar_likes_por_post(likes_actuales)
-            total_likes = conteo.get(id_post, 0)
+            # Registrar like (actualiza también el índice en memoria)
+            exito, mensaje = datos.indice_likes.registrar(id_like_user, id_post)
+            total_likes = datos.indice_likes.likes_de(id_post)
 
             if exito:
                 messagebox.showinfo(
@@ -624,12 +759,7 @@ class RedSocialApp:
         Muestra una ventana con el Top 5 posts con más likes
         y visualiza sus nodos en el grafo.
         """
-        likes = cargar_likes()
-        if not likes:
-            messagebox.showinfo("Top posts", "Aún no hay likes registrados.")
-            return
-
-        top = obtener_top_posts(likes, k=5)
+        top = datos.indice_likes.top(5)
         if not top:
             messagebox.showinfo("Top posts", "Aún no hay likes registrados.")
             return
@@ -637,7 +767,7 @@ class RedSocialApp:
         # Visualizar los nodos de los autores en el grafo
         ids_autores = []
         for post_id, _ in top:
-            info = posts_por_id.get(post_id)
+            info = datos.posts_por_id.get(post_id)
             if info:
                 ids_autores.append(info["id_usuario"])
 
@@ -645,7 +775,7 @@ class RedSocialApp:
             messagebox.showinfo("Top posts", "No se encontraron autores para los posts.")
             return
 
-        subgrafo, nodos = obtener_subgrafo(grafo, ids_autores, saltos=1)
+        subgrafo, nodos = obtener_subgrafo(datos.grafo, ids_autores, saltos=1)
 
         if self.visualizador:
             self.visualizador.dibujar_grafo(subgrafo, nodos_destacados=set(ids_autores))
@@ -672,11 +802,11 @@ class RedSocialApp:
         texto.pack(fill="both", expand=True)
 
         for i, (post_id, n_likes) in enumerate(top, 1):
-            info = posts_por_id.get(post_id)
+            info = datos.posts_por_id.get(post_id)
             if not info:
                 continue
             autor_id = info["id_usuario"]
-            nombre = usuarios.get(autor_id, f"Usuario {autor_id}")
+            nombre = datos.usuarios.get(autor_id, f"Usuario {autor_id}")
             post_text = info["contenido"] or "(sin contenido)"
             texto.insert(
                 tk.END,
@@ -688,34 +818,26 @@ class RedSocialApp:
 
     def mostrar_post_mas_popular(self):
         """
-        Muestra el post con más likes usando Divide y Vencerás.
+        Muestra el post con más likes (consultando el índice de likes en memoria).
         """
-        likes = cargar_likes()
-        if not likes:
-            messagebox.showinfo("Post más popular", "Aún no hay likes registrados.")
-            return
-
-        conteo = contar_likes_por_post(likes)
-        items = list(conteo.items())   # [(id_post, likes), ...]
-
-        if not items:
+        top = datos.indice_likes.top(1)
+        if not top:
             messagebox.showinfo("Post más popular", "Aún no hay likes registrados.")
             return
 
-        post_top = max_post_por_likes_divide_venceras(items)
-        post_id, n_likes = post_top
+        post_id, n_likes = top[0]
 
-        info = posts_por_id.get(post_id)
+        info = datos.posts_por_id.get(post_id)
         if not info:
             messagebox.showerror("Error", f"No se encontró el post #{post_id}.")
             return
 
         autor_id = info["id_usuario"]
-        nombre = usuarios.get(autor_id, f"Usuario {autor_id}")
+        nombre = datos.usuarios.get(autor_id, f"Usuario {autor_id}")
         post_text = info["contenido"] or "(sin contenido)"
 
         # Visualizar al autor en el grafo
-        subgrafo, nodos = obtener_subgrafo(grafo, [autor_id], saltos=1)
+        subgrafo, nodos = obtener_subgrafo(datos.grafo, [autor_id], saltos=1)
         if self.visualizador:
             self.visualizador.dibujar_grafo(subgrafo, nodos_destacados={autor_id})
             self.info_label.config(
@@ -747,37 +869,38 @@ class RedSocialApp:
     def visualizar_grafo_completo(self):
         """Visualiza el grafo completo (limitado a los nodos más conectados)"""
         # Para grafos grandes, mostrar solo los nodos más conectados
-        grados = calcular_grados(grafo)
-        nodos_importantes = sorted(grados.items(), key=lambda x: x[1], reverse=True)
+        grados = calcular_grados(datos.grafo)
         
-        # Tomar los 30 nodos más conectados
-        max_nodos = min(30, len(nodos_importantes))
-        nodos_centrales = [nodo for nodo, _ in nodos_importantes[:max_nodos//3]]
+        # Tomar los NODOS_VISTA_COMPLETA nodos más conectados y sus amistades entre ellos;
+        # con tantos nodos el layout usa Barnes-Hut
+        nodos_centrales = heapq.nlargest(NODOS_VISTA_COMPLETA, grados, key=grados.get)
         
-        subgrafo, nodos = obtener_subgrafo(grafo, nodos_centrales, saltos=2)
+        subgrafo, nodos = obtener_subgrafo(datos.grafo, nodos_centrales, saltos=0)
         
         if self.visualizador:
             self.visualizador.dibujar_grafo(subgrafo)
         
-        self.info_label.config(text=f"Vista general - {len(nodos)} nodos más relevantes")
+        self.info_label.config(text=f"Vista general - {len(subgrafo)} nodos más conectados")
     
     def visualizar_vecindario(self):
         """Visualiza el vecindario del usuario seleccionado"""
-        u = self.combo_user1.get()
+        u = self.selector_user1.get()
         if not u:
             # Si no hay usuario seleccionado, mostrar nodos aleatorios
             import random
-            if usuarios:
-                nodos_centrales = random.sample(list(usuarios.keys()), 
-                                              min(5, len(usuarios)))
+            if datos.usuarios:
+                nodos_centrales = random.sample(list(datos.usuarios.keys()), 
+                                              min(5, len(datos.usuarios)))
             else:
                 return
         else:
-            idu = next((k for k,v in usuarios.items() if v == u), None)
+            idu = self._id_seleccionado(u)
+            if idu is None:
+                return
             nodos_centrales = [idu]
         
         alcance = self.alcance_var.get()
-        subgrafo, nodos = obtener_subgrafo(grafo, nodos_centrales, saltos=alcance)
+        subgrafo, nodos = obtener_subgrafo(datos.grafo, nodos_centrales, saltos=alcance)
         
         if self.visualizador:
             self.visualizador.dibujar_grafo(subgrafo)
@@ -787,7 +910,7 @@ class RedSocialApp:
     
     def visualizar_comunidades(self):
         """Visualiza las comunidades en el grafo"""
-        comunidades_data = sistema_comunidades.obtener_todas_comunidades(usuarios)
+        comunidades_data = datos.sistema_comunidades.obtener_todas_comunidades(datos.usuarios)
         
         if not comunidades_data:
             messagebox.showinfo("Info", "No hay comunidades creadas aún.")
@@ -798,7 +921,7 @@ class RedSocialApp:
         for com in comunidades_data:
             nodos_comunidades.update(com['usuarios'])
         
-        subgrafo, nodos = obtener_subgrafo(grafo, list(nodos_comunidades), saltos=1)
+        subgrafo, nodos = obtener_subgrafo(datos.grafo, list(nodos_comunidades), saltos=1)
         
         # Crear un conjunto de nodos por comunidad para destacarlos con colores
         if self.visualizador:
@@ -830,8 +953,8 @@ class RedSocialApp:
         listbox = tk.Listbox(frame_usuarios, selectmode=tk.MULTIPLE, height=10)
         scrollbar = tk.Scrollbar(frame_usuarios, orient=tk.VERTICAL)
         
-        for nombre in usuarios.values():
-            listbox.insert(tk.END, nombre)
+        for etiqueta in datos.directorio.etiquetas():
+            listbox.insert(tk.END, etiqueta)
         
         listbox.config(yscrollcommand=scrollbar.set)
         scrollbar.config(command=listbox.yview)
@@ -854,11 +977,11 @@ class RedSocialApp:
             usuarios_sel = []
             for idx in selecciones:
                 nombre_usuario = listbox.get(idx)
-                id_usuario = next((k for k,v in usuarios.items() if v == nombre_usuario), None)
+                id_usuario = datos.directorio.id_de(nombre_usuario)
                 if id_usuario:
                     usuarios_sel.append(id_usuario)
             
-            exito, mensaje = sistema_comunidades.crear_comunidad(nombre_com, usuarios_sel)
+            exito, mensaje = datos.sistema_comunidades.crear_comunidad(nombre_com, usuarios_sel)
             
             if exito:
                 messagebox.showinfo("Éxito", mensaje)
@@ -873,7 +996,7 @@ class RedSocialApp:
     
     def ver_comunidades(self):
         """Muestra todas las comunidades creadas con opción de visualizar cada una"""
-        comunidades = sistema_comunidades.obtener_todas_comunidades(usuarios)
+        comunidades = datos.sistema_comunidades.obtener_todas_comunidades(datos.usuarios)
         
         ventana = tk.Toplevel(self.root)
         ventana.title("Comunidades Existentes")
@@ -949,16 +1072,11 @@ class RedSocialApp:
             )
             return
         
-        # Mostrar mensaje de carga para comunidades grandes
-        if len(usuarios_com) > 15:
-            self.info_label.config(text=f"Cargando visualización de {nombre_com}...")
-            self.root.update()
-        
         # Obtener subgrafo de la comunidad
         subgrafo, nodos = obtener_subgrafo_comunidad(
-            grafo, 
+            datos.grafo, 
             id_com, 
-            sistema_comunidades.comunidades
+            datos.sistema_comunidades.comunidades
         )
         
         if not nodos:
@@ -969,7 +1087,7 @@ class RedSocialApp:
             return
         
         # Verificar si hay demasiados nodos
-        if len(nodos) > 50:
+        if len(nodos) > NODOS_INTERACTIVOS:
             respuesta = messagebox.askyesno(
                 "Comunidad grande",
                 f"La comunidad '{nombre_com}' tiene {len(nodos)} miembros.\n"
@@ -1037,7 +1155,7 @@ class RedSocialApp:
     
     def mostrar_estadisticas(self):
         """Muestra estadísticas del grafo"""
-        stats = analizar_grafo(grafo, usuarios)
+        stats = analizar_grafo(datos.grafo, datos.usuarios)
         
         ventana = tk.Toplevel(self.root)
         ventana.title("Estadísticas de la Red")
@@ -1064,7 +1182,7 @@ class RedSocialApp:
     """
         
         for i, (nodo_id, grado) in enumerate(stats['nodos_mas_conectados'][:5], 1):
-            nombre = usuarios.get(nodo_id, f"Usuario {nodo_id}")
+            nombre = datos.usuarios.get(nodo_id, f"Usuario {nodo_id}")
             texto_stats += f"\n    {i}. {nombre}: {grado} conexiones"
         
         texto = tk.Text(frame, wrap=tk.WORD, font=("Arial", 10), 
@@ -1080,42 +1198,82 @@ class RedSocialApp:
         self.drag_data["y"] = event.y
     
     def on_mouse_drag(self, event):
-        """Arrastra el canvas"""
+        """Arrastra la vista del grafo"""
         delta_x = event.x - self.drag_data["x"]
         delta_y = event.y - self.drag_data["y"]
-        self.canvas_grafo.move("all", delta_x, delta_y)
+        if self.visualizador:
+            self.visualizador.desplazar(delta_x, delta_y)
         self.drag_data["x"] = event.x
         self.drag_data["y"] = event.y
     
     def on_mouse_wheel(self, event):
-        """Zoom con la rueda del mouse"""
-        if event.delta > 0:
-            self.zoom_in()
-        else:
-            self.zoom_out()
+        """Zoom con la rueda del mouse, centrado en el puntero"""
+        if not self.visualizador:
+            return
+        factor = 1.2 if event.delta > 0 else 0.8
+        self.visualizador.hacer_zoom(factor,
+                                     self.canvas_grafo.canvasx(event.x),
+                                     self.canvas_grafo.canvasy(event.y))
     
     def zoom_in(self):
         """Aumenta el zoom"""
-        self.canvas_grafo.scale("all", 
-                                self.canvas_grafo.winfo_width()/2, 
-                                self.canvas_grafo.winfo_height()/2, 
-                                1.2, 1.2)
+        if self.visualizador:
+            self.visualizador.hacer_zoom(1.2)
     
     def zoom_out(self):
         """Disminuye el zoom"""
-        self.canvas_grafo.scale("all", 
-                                self.canvas_grafo.winfo_width()/2, 
-                                self.canvas_grafo.winfo_height()/2, 
-                                0.8, 0.8)
+        if self.visualizador:
+            self.visualizador.hacer_zoom(0.8)
+    
+    def mostrar_progreso_layout(self, iteracion, total):
+        """Muestra el avance del layout que corre en segundo plano"""
+        if self.visualizador.calculando_layout():
+            self.progreso_label.config(text=f"Acomodando nodos... {iteracion}/{total}")
+            self.boton_cancelar.config(state=tk.NORMAL)
+        else:
+            self.progreso_label.config(text="")
+            self.boton_cancelar.config(state=tk.DISABLED)
+    
+    def cancelar_layout(self):
+        """Detiene el layout en curso; los nodos quedan donde estan"""
+        if self.visualizador:
+            self.visualizador.cancelar_layout()
     
     def reset_view(self):
         """Resetea la vista"""
-        self.canvas_grafo.delete("all")
+        if self.visualizador:
+            self.visualizador.limpiar()
         self.visualizar_vecindario()
 
 
 # Función principal
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = RedSocialApp(root)
-    root.mainloop()
\ No newline at end of file
+    # --profile-startup: arranca, espera a que todo cargue, imprime los
+    # tiempos de cada fase y cierra
+    perfilar = "--profile-startup" in sys.argv[1:]
+    
+    with PERFIL.fase("crear ventana"):
+        root = tk.Tk()
+    
+    errores = []
+    
+    def terminar_perfil(error=None):
+        # Tambien si la carga fallo: el reporte muestra hasta donde llego
+        PERFIL.registrar("error" if error is not None else "listo", 0.0)
+        print(PERFIL.reporte())
+        if error is not None:
+            errores.append(error)
+            print(f"No se pudieron cargar los datos: {error}", file=sys.stderr)
+        root.destroy()
+    
+    al_terminar_carga = (lambda: root.after_idle(terminar_perfil)) if perfilar else None
+    al_fallar_carga = (lambda e: root.after_idle(terminar_perfil, e)) if perfilar else None
+    app = RedSocialApp(root, al_terminar_carga=al_terminar_carga,
+                       al_fallar_carga=al_fallar_carga)
+    root.after(0, PERFIL.registrar, "ventana visible", 0.0)
+    root.mainloop()
+    if errores:
+        sys.exit(1)
+    
+    # Volcar los likes/posts del registro append-only a los Excel
+    compactar_registros()
\ No newline at end of file
@@ -0,0 +1,170 @@
+from array import array
+
+from caminos import a_estrella, bfs_bidireccional
+
+
+# Oraculo de distancias con landmarks (ALT: A*, Landmarks, Triangle inequality)
+#
+# Para grafos donde la matriz de IndiceDistancias no cabe en memoria se
+# guardan solo k filas: las distancias desde k usuarios "landmark". Por la
+# desigualdad triangular, para todo landmark L:
+#     |d(L,u) - d(L,v)| <= d(u,v) <= d(L,u) + d(L,v)
+
+SIN_CAMINO = 0xFFFF
+LANDMARKS_POR_DEFECTO = 16
+LANDMARKS_ACTIVOS = 4  # landmarks usados por consulta en A*
+# Por debajo de esta cota el BFS bidireccional ya visita pocos nodos y es
+# mas rapido que A* en Python (tipico en redes de mundo pequeño)
+DISTANCIA_MINIMA_A_ESTRELLA = 16
+
+
+def _bfs_distancias(grafo, origen):
+    #Distancias desde origen a todos los nodos del GrafoCSR (uint16)
+    offsets, vecinos = grafo.offsets, grafo.vecinos
+    distancias = array("H", [SIN_CAMINO]) * len(grafo)
+    distancias[origen] = 0
+    frontera = [origen]
+    d = 0
+
+    while frontera:
+        d += 1
+        siguiente = []
+        for u in frontera:
+            for v in vecinos[offsets[u]:offsets[u + 1]]:
+                if distancias[v] == SIN_CAMINO:
+                    distancias[v] = d
+                    siguiente.append(v)
+        frontera = siguiente
+
+    return distancias
+
+
+def elegir_landmarks(grafo, k=LANDMARKS_POR_DEFECTO):
+    """
+    Elige k landmarks y calcula sus distancias. El primero es el usuario de
+    mayor grado (mismo ranking que calcular_grados); cada siguiente es el
+    mas alejado de los ya elegidos, desempatando por grado, para que las
+    cotas sirvan en todas las direcciones del grafo.
+
+    Returns:
+        (landmarks, distancias): indices elegidos y una fila por landmark
+    """
+    n = len(grafo)
+    ranking = sorted(range(n), key=grafo.grado_idx, reverse=True)
+    landmarks, distancias = [], []
+    if not ranking:
+        return landmarks, distancias
+
+    cercania = array("H", [SIN_CAMINO]) * n  # distancia al landmark mas cercano
+    siguiente = ranking[0]
+    while len(landmarks) < min(k, n):
+        fila = _bfs_distancias(grafo, siguiente)
+        landmarks.append(siguiente)
+        distancias.append(fila)
+        for i in range(n):
+            if fila[i] < cercania[i]:
+                cercania[i] = fila[i]
+
+        # Los nodos de otra componente (SIN_CAMINO) se eligen primero
+        siguiente = max(ranking, key=cercania.__getitem__)
+        if cercania[siguiente] == 0:
+            break
+
+    return landmarks, distancias
+
+
+class OraculoLandmarks:
+    """
+    Distancias aproximadas en O(k) y caminos exactos con A* guiado por
+    las cotas de los landmarks. Ocupa k * n * 2 bytes.
+    """
+
+    def __init__(self, grafo, k=LANDMARKS_POR_DEFECTO):
+        self.grafo = grafo
+        self.landmarks, self.distancias = elegir_landmarks(grafo, k)
+
+    def _columna(self, i):
+        return [fila[i] for fila in self.distancias]
+
+    @staticmethod
+    def _cota_inferior(columna_u, columna_v):
+        #None si algun landmark alcanza a uno y no al otro (otra componente)
+        cota = 0
+        for du, dv in zip(columna_u, columna_v):
+            if (du == SIN_CAMINO) != (dv == SIN_CAMINO):
+                return None
+            if du != SIN_CAMINO:
+                diferencia = du - dv if du > dv else dv - du
+                if diferencia > cota:
+                    cota = diferencia
+        return cota
+
+    # Consultas
+    def cotas(self, id1, id2):
+        """
+        Retorna (inferior, superior) para la distancia entre dos usuarios.
+        superior es None si ningun landmark alcanza a ambos; la tupla entera
+        es None si estan en componentes distintas.
+        """
+        i = self.grafo.indice.get(id1)
+        j = self.grafo.indice.get(id2)
+        if i is None or j is None:
+            return None
+        if i == j:
+            return 0, 0
+
+        columna_u, columna_v = self._columna(i), self._columna(j)
+        inferior = self._cota_inferior(columna_u, columna_v)
+        if inferior is None:
+            return None
+
+        sumas = [du + dv for du, dv in zip(columna_u, columna_v) if du != SIN_CAMINO]
+        superior = min(sumas) if sumas else None
+        return max(inferior, 1), superior
+
+    def distancia_aproximada(self, id1, id2):
+        #Punto medio entre las cotas (exacto cuando coinciden)
+        cotas = self.cotas(id1, id2)
+        if cotas is None:
+            return None
+        inferior, superior = cotas
+        if superior is None:
+            return inferior
+        return (inferior + superior) / 2
+
+    def camino(self, id1, id2):
+        #Camino mas corto exacto con A* y heuristica de landmarks
+        #(BFS bidireccional cuando la cota dice que el camino es corto)
+        grafo = self.grafo
+        i = grafo.indice.get(id1)
+        j = grafo.indice.get(id2)
+        if i is None or j is None:
+            return [id1] if id1 == id2 else None
+
+        columna_origen = self._columna(i)
+        columna_destino = self._columna(j)
+        inferior = self._cota_inferior(columna_origen, columna_destino)
+        if inferior is None:
+            return None
+
+        if inferior < DISTANCIA_MINIMA_A_ESTRELLA:
+            camino = bfs_bidireccional(grafo.vecinos_idx, i, j)
+            return None if camino is None else [grafo.ids[n] for n in camino]
+
+        # Landmarks activos: los que dan la mejor cota para este par
+        filas = sorted(zip(self.distancias, columna_destino, columna_origen),
+                       key=lambda t: abs(t[1] - t[2]) if t[1] != SIN_CAMINO else -1,
+                       reverse=True)
+        filas = [(fila, dt) for fila, dt, _ in filas[:LANDMARKS_ACTIVOS]]
+
+        def heuristica(n):
+            cota = 0
+            for fila, dt in filas:
+                dn = fila[n]
+                diferencia = dn - dt if dn > dt else dt - dn
+                if diferencia > cota:
+                    cota = diferencia
+            return cota
+
+        camino = a_estrella(grafo.vecinos_idx, i, j, heuristica)
+        return None if camino is None else [grafo.ids[n] for n in camino]
@@ -0,0 +1,47 @@
+import time
+from contextlib import contextmanager
+
+
+# Tiempos de arranque de la app (python main.py --profile-startup)
+#
+# Solo usa la biblioteca estandar para poder importarse antes que todo lo
+# demas y medir tambien los imports.
+
+class PerfilArranque:
+    """
+    Lista de fases (nombre, inicio, segundos) medidas desde que se creo
+    el perfil. Las fases pueden venir de distintos hilos (la carga de
+    datos corre en segundo plano), por eso se guarda el inicio relativo.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fases = []
+
+    @contextmanager
+    def fase(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - inicio, inicio)
+
+    def registrar(self, nombre, segundos, inicio=None):
+        if inicio is None:
+            inicio = time.perf_counter() - segundos
+        self.fases.append((nombre, inicio - self.inicio, segundos))
+
+    def transcurrido(self):
+        return time.perf_counter() - self.inicio
+
+    def reporte(self):
+        #Tabla de texto con cada fase ordenada por inicio
+        lineas = [f"{'fase':<32}{'inicio (s)':>12}{'duracion (s)':>14}"]
+        for nombre, inicio, segundos in sorted(self.fases, key=lambda f: f[1]):
+            lineas.append(f"{nombre:<32}{inicio:>12.4f}{segundos:>14.4f}")
+        lineas.append(f"{'TOTAL':<32}{'':>12}{self.transcurrido():>14.4f}")
+        return "\n".join(lineas)
+
+
+# Perfil del proceso actual (lo comparten main.py y datos_red.py)
+PERFIL = PerfilArranque()
@@ -0,0 +1,201 @@
+import heapq
+import random
+import time
+
+
+# Ranking de posts por likes
+#
+# RankingPosts es un max-heap indexado: ademas del arreglo del heap guarda
+# la posicion de cada post, asi sumar un like es O(log n) (se sube el post
+# en el heap) y el top-k se lee en O(k log k) sin ordenar todos los posts.
+# En empates gana el post que recibio likes primero, igual que el
+# MergeSort estable de grafos.py sobre el conteo por post.
+
+
+class RankingPosts:
+    """
+    Top-k de posts que se mantiene al dia con cada like.
+
+    - conteo: {id_post: cantidad_likes}
+    - heap: ids de post ordenados como max-heap por (likes, antiguedad)
+    - posicion: {id_post: indice en heap}
+    """
+
+    def __init__(self, conteo=None):
+        self.conteo = {}
+        self.heap = []
+        self.posicion = {}
+        self._orden = {}    # id_post -> orden de llegada (desempate)
+        if conteo:
+            for id_post, likes in conteo.items():
+                self.incrementar(id_post, likes)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, id_post):
+        return id_post in self.posicion
+
+    def _mayor(self, a, b):
+        #True si el post a va antes que b en el ranking
+        la, lb = self.conteo[a], self.conteo[b]
+        return la > lb or (la == lb and self._orden[a] < self._orden[b])
+
+    def _intercambiar(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.posicion[heap[i]] = i
+        self.posicion[heap[j]] = j
+
+    def _subir(self, i):
+        while i > 0:
+            padre = (i - 1) // 2
+            if not self._mayor(self.heap[i], self.heap[padre]):
+                break
+            self._intercambiar(i, padre)
+            i = padre
+
+    def _bajar(self, i):
+        n = len(self.heap)
+        while True:
+            mayor = i
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < n and self._mayor(self.heap[hijo], self.heap[mayor]):
+                    mayor = hijo
+            if mayor == i:
+                break
+            self._intercambiar(i, mayor)
+            i = mayor
+
+    # Actualizacion
+    def incrementar(self, id_post, cantidad=1):
+        """
+        Suma likes a un post (lo agrega si no estaba).
+        Retorna la nueva cantidad de likes del post.
+        """
+        if id_post not in self.posicion:
+            self._orden[id_post] = len(self._orden)
+            self.conteo[id_post] = 0
+            self.posicion[id_post] = len(self.heap)
+            self.heap.append(id_post)
+        self.conteo[id_post] += cantidad
+        i = self.posicion[id_post]
+        if cantidad >= 0:
+            self._subir(i)
+        else:
+            self._bajar(i)
+        return self.conteo[id_post]
+
+    # Consultas
+    def likes_de(self, id_post):
+        return self.conteo.get(id_post, 0)
+
+    def maximo(self):
+        #(id_post, likes) del post con mas likes, o None si no hay posts
+        if not self.heap:
+            return None
+        id_post = self.heap[0]
+        return id_post, self.conteo[id_post]
+
+    def top(self, k=5):
+        """
+        [(id_post, likes), ...] de mayor a menor sin modificar el heap:
+        se recorre el heap con una frontera de candidatos (a lo sumo k+1).
+        """
+        resultado = []
+        if not self.heap or k <= 0:
+            return resultado
+        heap, conteo, orden = self.heap, self.conteo, self._orden
+        n = len(heap)
+        frontera = [(-conteo[heap[0]], orden[heap[0]], 0)]
+        while frontera and len(resultado) < k:
+            _, _, i = heapq.heappop(frontera)
+            id_post = heap[i]
+            resultado.append((id_post, conteo[id_post]))
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < n:
+                    h = heap[hijo]
+                    heapq.heappush(frontera, (-conteo[h], orden[h], hijo))
+        return resultado
+
+
+# Top-k de una sola vez (sin mantener el ranking)
+def top_k_por_likes(items, k=5):
+    """
+    items: iterable de tuplas (id_post, likes)
+    Retorna los k con mas likes de mayor a menor, con un heap acotado de
+    tamaño k (O(n log k)). En empates respeta el orden de items.
+    """
+    return heapq.nlargest(k, items, key=lambda item: item[1])
+
+
+# Ordenamiento completo sin memoria extra
+def heapsort_por_likes(items):
+    """
+    Ordena en el lugar la lista de tuplas (id_post, likes) de MAYOR a
+    MENOR likes con HeapSort: no crea listas auxiliares ni usa recursion.
+    A diferencia del MergeSort no es estable (los empates pueden cambiar
+    de orden). Retorna la misma lista.
+    """
+    n = len(items)
+
+    def bajar(i, fin):
+        # Min-heap por likes: al sacar el minimo al final queda orden descendente
+        while True:
+            menor = i
+            izq = 2 * i + 1
+            der = izq + 1
+            if izq < fin and items[izq][1] < items[menor][1]:
+                menor = izq
+            if der < fin and items[der][1] < items[menor][1]:
+                menor = der
+            if menor == i:
+                return
+            items[i], items[menor] = items[menor], items[i]
+            i = menor
+
+    for i in range(n // 2 - 1, -1, -1):
+        bajar(i, n)
+    for fin in range(n - 1, 0, -1):
+        items[0], items[fin] = items[fin], items[0]
+        bajar(0, fin)
+    return items
+
+
+# Comparacion con las versiones Divide y Venceras de grafos.py
+def medir_rendimiento(n_posts=100000, n_likes=500000, k=5, semilla=0):
+    """
+    Compara max/top-k/orden completo entre las implementaciones de
+    referencia (Divide y Venceras) y las de este modulo sobre un conteo
+    aleatorio. Retorna [(operacion, implementacion, segundos), ...]
+    """
+    from grafos import max_post_por_likes_divide_venceras, merge_sort_posts_por_likes
+
+    rng = random.Random(semilla)
+    conteo = {}
+    for _ in range(n_likes):
+        id_post = rng.randrange(n_posts)
+        conteo[id_post] = conteo.get(id_post, 0) + 1
+    items = list(conteo.items())
+
+    def medir(funcion):
+        inicio = time.perf_counter()
+        funcion()
+        return time.perf_counter() - inicio
+
+    ranking = RankingPosts(conteo)
+    return [
+        ("maximo", "divide y venceras", medir(lambda: max_post_por_likes_divide_venceras(items))),
+        ("maximo", "RankingPosts", medir(ranking.maximo)),
+        (f"top {k}", "merge sort", medir(lambda: merge_sort_posts_por_likes(items)[:k])),
+        (f"top {k}", "heap acotado", medir(lambda: top_k_por_likes(items, k))),
+        (f"top {k}", "RankingPosts", medir(lambda: ranking.top(k))),
+        ("orden completo", "merge sort", medir(lambda: merge_sort_posts_por_likes(items))),
+        ("orden completo", "heapsort", medir(lambda: heapsort_por_likes(list(items)))),
+    ]
+
+
+if __name__ == "__main__":
+    print(f"{'operacion':<16}{'implementacion':<20}{'tiempo (s)':>12}")
+    for operacion, implementacion, segundos in medir_rendimiento():
+        print(f"{operacion:<16}{implementacion:<20}{segundos:>12.5f}")
@@ -0,0 +1,228 @@
+import os
+import pickle
+import time
+from array import array
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_datos import firma_contenido, NOMBRE_CARPETA_CACHE
+from grafos import recomendar_amigos
+
+
+# Recomendaciones precalculadas para todos los usuarios
+#
+# Archivo de resultados (.cache/recomendaciones.bin):
+#   cabecera pickle {version, firma, k, criterio, ids, tamaños}
+#   offsets (int32): offsets[i]..offsets[i+1] son las sugerencias de ids[i]
+#   candidatos (int32): posicion del usuario sugerido en ids
+#   puntajes (float32)
+
+VERSION_RECOMENDACIONES = 1
+K_POR_DEFECTO = 10
+
+
+# Trabajadores del pool de procesos
+# spawn y no fork, igual que en indice_distancias (el pool se crea desde un hilo de la app)
+_CONTEXTO = multiprocessing.get_context("spawn")
+_grafo = None
+
+
+def _inicializar_trabajador(grafo):
+    #El grafo llega una vez por proceso y solo se lee (un GrafoMapeado
+    #llega como la ruta de su archivo y cada proceso lo mapea)
+    global _grafo
+    _grafo = grafo
+
+
+def _recomendar_particion(tarea):
+    #Top-k de cada usuario de la particion, como indices del grafo
+    ids_usuarios, k, criterio = tarea
+    indice = _grafo.indice
+    resultado = []
+    for id_usuario in ids_usuarios:
+        ranking = recomendar_amigos(_grafo, id_usuario, k=k, criterio=criterio)
+        resultado.append([(indice[s], puntaje) for s, puntaje in ranking])
+    return resultado
+
+
+def _particionar(elementos, partes):
+    tam = max(1, -(-len(elementos) // partes))
+    return [elementos[i:i + tam] for i in range(0, len(elementos), tam)]
+
+
+class RecomendacionesPrecalculadas:
+    """
+    Top-k de sugerencias por usuario en arreglos planos, consultables en
+    O(k) sin recorrer el grafo.
+    """
+
+    def __init__(self, ids, offsets, candidatos, puntajes, k, criterio):
+        self.ids = ids
+        self.offsets = offsets
+        self.candidatos = candidatos
+        self.puntajes = puntajes
+        self.k = k
+        self.criterio = criterio
+        self.indice = {id_: i for i, id_ in enumerate(ids)}
+
+    @classmethod
+    def calcular(cls, grafo, ids_usuarios, k=K_POR_DEFECTO, criterio="comunes",
+                 procesos=None, particiones_por_proceso=4):
+        """
+        Calcula el top-k de todos los usuarios repartiendo el conjunto de
+        nodos entre un pool de procesos.
+
+        Args:
+            grafo: GrafoCSR o GrafoMapeado (se comparte de solo lectura con
+                   cada proceso; el mapeado sin copiar la adyacencia)
+            ids_usuarios: ids a calcular (p. ej. las claves de usuarios)
+            procesos: numero de procesos (None = todos los nucleos, 1 = sin pool)
+        """
+        ids = list(ids_usuarios)
+        trabajadores = procesos or os.cpu_count() or 1
+        tareas = [(parte, k, criterio)
+                  for parte in _particionar(ids, trabajadores * particiones_por_proceso)]
+
+        if procesos == 1:
+            _inicializar_trabajador(grafo)
+            resultados = list(map(_recomendar_particion, tareas))
+        else:
+            with ProcessPoolExecutor(max_workers=procesos,
+                                     mp_context=_CONTEXTO,
+                                     initializer=_inicializar_trabajador,
+                                     initargs=(grafo,)) as pool:
+                resultados = list(pool.map(_recomendar_particion, tareas))
+
+        # Los candidatos vienen como indices del grafo: pasarlos a indices de ids
+        posicion = {id_: i for i, id_ in enumerate(ids)}
+        extra = []
+        offsets = array("i", [0])
+        candidatos = array("i")
+        puntajes = array("f")
+        for parte in resultados:
+            for ranking in parte:
+                for j, puntaje in ranking:
+                    id_sugerido = grafo.ids[j]
+                    p = posicion.get(id_sugerido)
+                    if p is None:
+                        # Usuario del grafo que no esta en usuarios.xlsx
+                        p = posicion[id_sugerido] = len(ids) + len(extra)
+                        extra.append(id_sugerido)
+                    candidatos.append(p)
+                    puntajes.append(puntaje)
+                offsets.append(len(candidatos))
+
+        # Los ids extra no tienen sugerencias propias
+        for _ in extra:
+            offsets.append(len(candidatos))
+
+        return cls(ids + extra, offsets, candidatos, puntajes, k, criterio)
+
+    # Consultas
+    def obtener(self, id_usuario, k=None):
+        """
+        Retorna [(id_sugerido, puntaje), ...] o None si el usuario no fue
+        calculado o se piden mas de k sugerencias.
+        """
+        i = self.indice.get(id_usuario)
+        if i is None or (k is not None and k > self.k):
+            return None
+        inicio, fin = self.offsets[i], self.offsets[i + 1]
+        if k is not None:
+            fin = min(fin, inicio + k)
+
+        entero = self.criterio == "comunes"
+        return [(self.ids[self.candidatos[p]],
+                 int(self.puntajes[p]) if entero else self.puntajes[p])
+                for p in range(inicio, fin)]
+
+    # Persistencia
+    def guardar(self, ruta, firma):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        cabecera = {
+            "version": VERSION_RECOMENDACIONES,
+            "firma": firma,
+            "k": self.k,
+            "criterio": self.criterio,
+            "ids": self.ids,
+            "n_sugerencias": len(self.candidatos),
+        }
+        tmp = ruta + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(cabecera, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.offsets.tofile(f)
+            self.candidatos.tofile(f)
+            self.puntajes.tofile(f)
+        os.replace(tmp, ruta)
+
+    @classmethod
+    def cargar(cls, ruta, firma, criterio="comunes"):
+        #Retorna las recomendaciones guardadas o None si no son de este grafo y criterio
+        try:
+            with open(ruta, "rb") as f:
+                cabecera = pickle.load(f)
+                if (cabecera.get("version") != VERSION_RECOMENDACIONES
+                        or cabecera.get("firma") != firma
+                        or cabecera.get("criterio") != criterio):
+                    return None
+                offsets, candidatos, puntajes = array("i"), array("i"), array("f")
+                offsets.fromfile(f, len(cabecera["ids"]) + 1)
+                candidatos.fromfile(f, cabecera["n_sugerencias"])
+                puntajes.fromfile(f, cabecera["n_sugerencias"])
+        except Exception:
+            return None
+        return cls(cabecera["ids"], offsets, candidatos, puntajes,
+                   cabecera["k"], cabecera["criterio"])
+
+    @classmethod
+    def cargar_o_calcular(cls, grafo, ids_usuarios, archivo_xlsx, k=K_POR_DEFECTO,
+                          criterio="comunes", procesos=None):
+        #Reutiliza el archivo si amistades.xlsx no cambió y es del mismo criterio
+        ruta = os.path.join(os.path.dirname(archivo_xlsx), NOMBRE_CARPETA_CACHE,
+                            "recomendaciones.bin")
+        firma = firma_contenido(archivo_xlsx)
+
+        recomendaciones = cls.cargar(ruta, firma, criterio)
+        if recomendaciones is not None and recomendaciones.k >= k:
+            return recomendaciones
+
+        recomendaciones = cls.calcular(grafo, ids_usuarios, k=k, criterio=criterio,
+                                       procesos=procesos)
+        try:
+            recomendaciones.guardar(ruta, firma)
+        except OSError:
+            pass
+        return recomendaciones
+
+
+# Medicion de rendimiento
+def medir_rendimiento(grafo, ids_usuarios, lista_procesos=(1, 2, 4), k=K_POR_DEFECTO):
+    """
+    Calcula el lote completo con distinta cantidad de procesos.
+    Retorna [(procesos, segundos, usuarios_por_segundo), ...]
+    """
+    ids = list(ids_usuarios)
+    resultados = []
+    for procesos in lista_procesos:
+        inicio = time.perf_counter()
+        RecomendacionesPrecalculadas.calcular(grafo, ids, k=k, procesos=procesos)
+        segundos = time.perf_counter() - inicio
+        resultados.append((procesos, segundos, len(ids) / segundos if segundos else 0.0))
+    return resultados
+
+
+if __name__ == "__main__":
+    from grafos import cargar_grafo_csr, cargar_usuarios, DATASET_DIR
+
+    grafo = cargar_grafo_csr()
+    usuarios, _ = cargar_usuarios()
+
+    print(f"{'procesos':>9}{'tiempo (s)':>12}{'usuarios/s':>12}{'por proceso':>13}")
+    for procesos, segundos, throughput in medir_rendimiento(grafo, usuarios.keys()):
+        print(f"{procesos:>9}{segundos:>12.3f}{throughput:>12.0f}{throughput / procesos:>13.0f}")
+
+    archivo = os.path.join(DATASET_DIR, "amistades.xlsx")
+    ruta = os.path.join(DATASET_DIR, NOMBRE_CARPETA_CACHE, "recomendaciones.bin")
+    recomendaciones = RecomendacionesPrecalculadas.calcular(grafo, usuarios.keys())
+    recomendaciones.guardar(ruta, firma_contenido(archivo))
+    print(f"Resultados guardados en {ruta}")
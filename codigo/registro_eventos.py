@@ -0,0 +1,158 @@
+import os
+import json
+
+
+# Registro append-only para likes y posts
+#
+# En lugar de abrir y reescribir el Excel completo en cada like, cada
+# evento se agrega como una linea JSON al final de un .log junto al Excel.
+# El maximo id y las claves ya usadas (usuario, post) viven en memoria, asi
+# que registrar es O(1). Cada COMPACTAR_CADA eventos (y al cerrar la app)
+# el log se vuelca al Excel para mantener la compatibilidad.
+
+COMPACTAR_CADA = 1000
+
+
+class RegistroEventos:
+    """
+    Tabla de registros (id, campo1, campo2...) guardada como
+    Excel (base compactada) + log de eventos agregados despues.
+
+    Args:
+        archivo_xlsx: Excel de la tabla (puede no existir aun)
+        cargar_base: funcion que devuelve los registros del Excel como tuplas
+        encabezado: fila de titulos si hay que crear el Excel
+        titulo: nombre de la hoja si hay que crear el Excel
+        clave: funcion registro -> clave unica (None = sin duplicados a evitar)
+    """
+
+    def __init__(self, archivo_xlsx, cargar_base, encabezado, titulo, clave=None):
+        self.archivo_xlsx = archivo_xlsx
+        self.archivo_log = os.path.splitext(archivo_xlsx)[0] + ".log"
+        self.cargar_base = cargar_base
+        self.encabezado = encabezado
+        self.titulo = titulo
+        self.clave = clave
+
+        self._registros = None   # se cargan en el primer uso
+        self._pendientes = 0     # eventos en el log sin compactar
+        self._max_id = 0
+        self._claves = set()
+
+    # Carga
+    def _leer_log(self):
+        #Registros del log; una linea incompleta (corte de luz) se ignora
+        if not os.path.exists(self.archivo_log):
+            return []
+        registros = []
+        with open(self.archivo_log, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    registros.append(tuple(json.loads(linea)))
+                except ValueError:
+                    continue
+        return registros
+
+    def _reparar_log(self):
+        #Si la ultima linea quedo a medias, se cierra para no pegarle el siguiente evento
+        if not os.path.exists(self.archivo_log):
+            return
+        with open(self.archivo_log, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _cargar(self, base=None):
+        if self._registros is not None:
+            return
+        self._reparar_log()
+        if base is None:
+            base = self.cargar_base()
+        base = list(base)
+        max_base = max((r[0] for r in base), default=0)
+
+        # Eventos con id <= max_base ya fueron compactados al Excel
+        nuevos = [r for r in self._leer_log() if r[0] > max_base]
+
+        self._registros = base + nuevos
+        self._pendientes = len(nuevos)
+        self._max_id = max((r[0] for r in self._registros), default=0)
+        if self.clave is not None:
+            self._claves = {self.clave(r) for r in self._registros}
+
+    def usar_base(self, base):
+        #Carga la tabla con registros del Excel ya leidos (p. ej. en otro proceso)
+        self._registros = None
+        self._cargar(base)
+
+    def registros(self):
+        #Todos los registros: Excel + log
+        self._cargar()
+        return list(self._registros)
+
+    def eventos_posteriores(self, max_id):
+        #Eventos del log con id > max_id (aun no compactados), sin cargar el Excel
+        return [r for r in self._leer_log() if r[0] > max_id]
+
+    # Escritura
+    def contiene(self, clave):
+        self._cargar()
+        return clave in self._claves
+
+    def agregar(self, *campos):
+        """
+        Agrega un registro con id = maximo + 1.
+        Retorna el id nuevo, o None si la clave ya existia.
+        """
+        self._cargar()
+        nuevo_id = self._max_id + 1
+        registro = (nuevo_id,) + campos
+
+        if self.clave is not None:
+            clave = self.clave(registro)
+            if clave in self._claves:
+                return None
+            self._claves.add(clave)
+
+        with open(self.archivo_log, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+        self._registros.append(registro)
+        self._max_id = nuevo_id
+        self._pendientes += 1
+
+        if self._pendientes >= COMPACTAR_CADA:
+            self.compactar()
+        return nuevo_id
+
+    def compactar(self):
+        """
+        Vuelca los eventos del log al Excel y vacia el log.
+        Si se corta a mitad, al recargar se descartan los eventos del log
+        que ya estan en el Excel (por id), asi que no se duplican.
+        """
+        self._cargar()
+        if not self._pendientes:
+            return 0
+        from openpyxl import load_workbook, Workbook
+
+        if os.path.exists(self.archivo_xlsx):
+            wb = load_workbook(self.archivo_xlsx)
+            ws = wb.active
+        else:
+            wb = Workbook()
+            ws = wb.active
+            ws.title = self.titulo
+            ws.append(self.encabezado)
+
+        for registro in self._registros[-self._pendientes:]:
+            ws.append(list(registro))
+        wb.save(self.archivo_xlsx)
+
+        compactados = self._pendientes
+        os.remove(self.archivo_log)
+        self._pendientes = 0
+        return compactados
@@ -0,0 +1,187 @@
+import tkinter as tk
+
+
+FILAS_VISIBLES = 8
+ESPERA_TECLEO_MS = 120  # espera tras la ultima tecla antes de filtrar
+
+
+# Selector de usuario con busqueda incremental
+class SelectorUsuario(tk.Frame):
+    """
+    Reemplaza al ttk.Combobox con todos los nombres: un Entry donde se
+    escribe el comienzo del nombre y una lista de coincidencias debajo.
+
+    La lista es virtual: las coincidencias son un rango (inicio, fin) del
+    indice alfabetico de DirectorioUsuarios y solo las FILAS_VISIBLES de
+    la ventana actual se cargan en el Listbox. El scrollbar se maneja a
+    mano sobre el rango completo.
+
+    get() devuelve la etiqueta escrita/elegida, igual que Combobox.get().
+    Al elegir un usuario se genera el evento <<SeleccionUsuario>>.
+    directorio puede ser None mientras la app carga los datos.
+    """
+
+    def __init__(self, master, directorio, width=25, filas=FILAS_VISIBLES, **kwargs):
+        kwargs.setdefault("bg", "white")
+        super().__init__(master, **kwargs)
+        self.directorio = directorio
+        self.filas = filas
+
+        self._rango = (0, 0)        # coincidencias en el indice alfabetico
+        self._desplazamiento = 0    # primera coincidencia visible
+        self._pendiente = None      # after() del filtrado
+        self._silenciar = False     # cambios de texto hechos por el propio widget
+
+        self.texto = tk.StringVar()
+        self.entry = tk.Entry(self, textvariable=self.texto, width=width,
+                              font=("Arial", 10))
+        self.entry.grid(row=0, column=0, columnspan=2, sticky="ew")
+
+        self.lista = tk.Listbox(self, height=filas, width=width,
+                                font=("Arial", 10), exportselection=False,
+                                activestyle="dotbox")
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                      command=self._on_scrollbar)
+
+        self.texto.trace_add("write", self._on_texto)
+        self.entry.bind("<Down>", self._entrar_a_lista)
+        self.entry.bind("<Return>", self._aceptar_primera)
+        self.entry.bind("<Escape>", lambda e: self._ocultar_lista())
+
+        self.lista.bind("<ButtonRelease-1>", self._on_click)
+        self.lista.bind("<Return>", self._on_click)
+        self.lista.bind("<Escape>", lambda e: self._ocultar_lista())
+        self.lista.bind("<Down>", lambda e: self._mover_cursor(1))
+        self.lista.bind("<Up>", lambda e: self._mover_cursor(-1))
+        self.lista.bind("<MouseWheel>", self._on_rueda)
+        self.lista.bind("<Button-4>", lambda e: self._desplazar(-3))
+        self.lista.bind("<Button-5>", lambda e: self._desplazar(3))
+
+    # Interfaz tipo Combobox
+    def get(self):
+        return self.texto.get().strip()
+
+    def set(self, etiqueta):
+        self._silenciar = True
+        self.texto.set(etiqueta)
+        self._silenciar = False
+
+    # Filtrado
+    def _on_texto(self, *args):
+        if self._silenciar:
+            return
+        if self._pendiente is not None:
+            self.after_cancel(self._pendiente)
+        self._pendiente = self.after(ESPERA_TECLEO_MS, self._filtrar)
+
+    def _filtrar(self):
+        self._pendiente = None
+        if self.directorio is None:
+            return  # los datos todavia se estan cargando
+        self._rango = self.directorio.rango_prefijo(self.texto.get().strip())
+        self._desplazamiento = 0
+        self._mostrar_lista()
+        self._renderizar()
+
+    def _total(self):
+        inicio, fin = self._rango
+        return fin - inicio
+
+    def _renderizar(self, cursor=None):
+        #Carga en el Listbox solo la ventana visible de coincidencias
+        if self.directorio is None:
+            return
+        total = self._total()
+        inicio = self._rango[0] + self._desplazamiento
+        fin = min(self._rango[1], inicio + self.filas)
+        visibles = self.directorio.etiquetas_ordenadas(inicio, fin)
+
+        self.lista.delete(0, tk.END)
+        if visibles:
+            self.lista.insert(tk.END, *visibles)
+        else:
+            self.lista.insert(tk.END, "(sin coincidencias)")
+
+        if cursor is not None and visibles:
+            self.lista.selection_clear(0, tk.END)
+            self.lista.selection_set(cursor)
+            self.lista.activate(cursor)
+
+        if total:
+            self.scrollbar.set(self._desplazamiento / total,
+                               (self._desplazamiento + len(visibles)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # Desplazamiento virtual
+    def _desplazar(self, filas, cursor=None):
+        maximo = max(0, self._total() - self.filas)
+        nuevo = max(0, min(maximo, self._desplazamiento + filas))
+        if nuevo != self._desplazamiento or cursor is not None:
+            self._desplazamiento = nuevo
+            self._renderizar(cursor)
+        return "break"
+
+    def _on_scrollbar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            destino = int(float(cantidad) * self._total())
+            return self._desplazar(destino - self._desplazamiento)
+        paso = int(cantidad) * (self.filas if unidad == "pages" else 1)
+        return self._desplazar(paso)
+
+    def _on_rueda(self, event):
+        # En Windows suele ser 120 por notch
+        return self._desplazar(-int(event.delta / 120) * 3)
+
+    def _mover_cursor(self, paso):
+        #Flechas dentro de la lista; al llegar al borde se corre la ventana
+        seleccion = self.lista.curselection()
+        actual = seleccion[0] if seleccion else 0
+        nuevo = actual + paso
+        visibles = self.lista.size()
+        if 0 <= nuevo < visibles:
+            self.lista.selection_clear(0, tk.END)
+            self.lista.selection_set(nuevo)
+            self.lista.activate(nuevo)
+            return "break"
+        return self._desplazar(paso, cursor=actual)
+
+    # Mostrar / ocultar
+    def _mostrar_lista(self):
+        self.lista.grid(row=1, column=0, sticky="ew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+    def _ocultar_lista(self):
+        self.lista.grid_remove()
+        self.scrollbar.grid_remove()
+
+    # Eleccion
+    def _entrar_a_lista(self, event=None):
+        if not self.lista.winfo_ismapped():
+            self._filtrar()
+        self.lista.focus_set()
+        self._renderizar(cursor=0)
+        return "break"
+
+    def _aceptar_primera(self, event=None):
+        if self._pendiente is not None:
+            self.after_cancel(self._pendiente)
+            self._filtrar()
+        if self._total():
+            self._elegir(self.directorio.etiquetas_ordenadas(
+                self._rango[0] + self._desplazamiento,
+                self._rango[0] + self._desplazamiento + 1)[0])
+        return "break"
+
+    def _on_click(self, event=None):
+        seleccion = self.lista.curselection()
+        if seleccion and self._total():
+            self._elegir(self.lista.get(seleccion[0]))
+        return "break"
+
+    def _elegir(self, etiqueta):
+        self.set(etiqueta)
+        self._ocultar_lista()
+        self.entry.icursor(tk.END)
+        self.entry.focus_set()
+        self.event_generate("<<SeleccionUsuario>>")
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Los modulos de codigo/ se importan planos (from grafos import ...), como en main.py
+CODIGO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CODIGO not in sys.path:
+    sys.path.insert(0, CODIGO)
+
+# Dataset incluido en el repositorio
+DATASET = os.path.join(os.path.dirname(CODIGO), "dataset")
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from caminos import a_estrella, bfs_bidireccional, bfs_padres
+from grafo_csr import GrafoCSR
+from grafos import camino_mas_corto
+from oraculo_landmarks import SIN_CAMINO, elegir_landmarks
+
+
+def _grafo_aleatorio(semilla, n=60, m=90):
+    #Grafo disperso {id: [vecinos]} con varias componentes y nodos aislados
+    rnd = random.Random(semilla)
+    grafo = {str(i): [] for i in range(n)}
+    for _ in range(m):
+        a, b = rnd.sample(range(n), 2)
+        a, b = str(a), str(b)
+        if b not in grafo[a]:
+            grafo[a].append(b)
+            grafo[b].append(a)
+    return grafo
+
+
+def _es_camino(grafo, camino, inicio, destino):
+    return (camino[0] == inicio and camino[-1] == destino
+            and all(b in grafo[a] for a, b in zip(camino, camino[1:])))
+
+
+def _largo(camino):
+    return None if camino is None else len(camino)
+
+
+def _pares(grafo, semilla, cantidad=200):
+    rnd = random.Random(semilla)
+    nodos = sorted(grafo)
+    return [(rnd.choice(nodos), rnd.choice(nodos)) for _ in range(cantidad)]
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_bidireccional_mismo_largo_que_bfs(semilla):
+    grafo = _grafo_aleatorio(semilla)
+    for inicio, destino in _pares(grafo, semilla):
+        esperado = bfs_padres(grafo.__getitem__, inicio, destino)
+        camino = bfs_bidireccional(grafo.__getitem__, inicio, destino)
+        assert _largo(camino) == _largo(esperado)
+        if camino is not None:
+            assert _es_camino(grafo, camino, inicio, destino)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_a_estrella_mismo_largo_que_bfs(semilla):
+    grafo = _grafo_aleatorio(semilla)
+    csr = GrafoCSR.desde_adyacencia(grafo)
+    _, distancias = elegir_landmarks(csr, k=4)
+
+    for inicio, destino in _pares(grafo, semilla):
+        i, j = csr.indice[inicio], csr.indice[destino]
+
+        def heuristica(n):
+            #Cota inferior de los landmarks (admisible), como en OraculoLandmarks
+            return max((abs(fila[n] - fila[j]) for fila in distancias
+                        if fila[n] != SIN_CAMINO and fila[j] != SIN_CAMINO), default=0)
+
+        esperado = bfs_padres(csr.vecinos_idx, i, j)
+        for h in (heuristica, lambda n: 0):
+            camino = a_estrella(csr.vecinos_idx, i, j, h)
+            assert _largo(camino) == _largo(esperado)
+            if camino is not None:
+                ids = [csr.ids[n] for n in camino]
+                assert _es_camino(grafo, ids, inicio, destino)
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_camino_mas_corto_dict_y_csr(semilla):
+    grafo = _grafo_aleatorio(semilla)
+    csr = GrafoCSR.desde_adyacencia(grafo)
+    for inicio, destino in _pares(grafo, semilla, cantidad=100):
+        esperado = _largo(bfs_padres(grafo.__getitem__, inicio, destino))
+        for g in (grafo, csr):
+            for bidireccional in (True, False):
+                camino = camino_mas_corto(g, inicio, destino, bidireccional)
+                assert _largo(camino) == esperado
+
+
+def test_camino_mas_corto_nodos_inexistentes():
+    grafo = _grafo_aleatorio(0)
+    csr = GrafoCSR.desde_adyacencia(grafo)
+    for g in (grafo, csr):
+        assert camino_mas_corto(g, "0", "no existe") is None
+        assert camino_mas_corto(g, "no existe", "no existe") is None
+        assert camino_mas_corto(g, None, None) is None
+        assert camino_mas_corto(g, "0", "0") == ["0"]
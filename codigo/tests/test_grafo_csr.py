@@ -0,0 +1,120 @@
+import os
+import pickle
+import random
+from array import array
+from collections import defaultdict
+
+import pytest
+
+import grafo_csr
+import xlsx_stream
+from conftest import DATASET
+from grafo_csr import GrafoCSR
+from grafos import obtener_subgrafo
+
+
+def _aristas_aleatorias(semilla, n=40, m=120):
+    #Pares (id1, id2) con repetidos y lazos, como pueden venir en el Excel
+    rnd = random.Random(semilla)
+    return [(str(rnd.randrange(n)), str(rnd.randrange(n))) for _ in range(m)]
+
+
+def _adyacencia(aristas):
+    #Misma construccion que cargar_grafo
+    grafo = defaultdict(list)
+    for a, b in aristas:
+        grafo[a].append(b)
+        grafo[b].append(a)
+    return grafo
+
+
+def _como_dict(grafo):
+    return {id_: list(vecinos) for id_, vecinos in grafo.items()}
+
+
+def _mismo_csr(g1, g2):
+    return (list(g1.ids) == list(g2.ids) and list(g1.offsets) == list(g2.offsets)
+            and list(g1.vecinos) == list(g2.vecinos))
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_desde_aristas_igual_a_la_adyacencia(semilla):
+    aristas = _aristas_aleatorias(semilla)
+    grafo = _adyacencia(aristas)
+    csr = GrafoCSR.desde_aristas(aristas)
+
+    # Mismos nodos, en el mismo orden, y los vecinos en el mismo orden
+    assert _como_dict(csr) == _como_dict(grafo)
+    assert list(csr) == list(grafo)
+    assert len(csr) == len(grafo)
+    assert csr.num_aristas == len(aristas)
+    assert csr.grados() == {id_: len(v) for id_, v in grafo.items()}
+    for id_ in grafo:
+        assert id_ in csr
+        assert csr.get(id_) == grafo[id_]
+        assert csr.grado(id_) == len(grafo[id_])
+
+
+def test_nodo_desconocido_como_defaultdict():
+    csr = GrafoCSR.desde_aristas(_aristas_aleatorias(0))
+    assert "no existe" not in csr
+    assert csr["no existe"] == []
+    assert csr.get("no existe") is None
+    assert csr.grado("no existe") == 0
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_desde_adyacencia_ida_y_vuelta(semilla):
+    aristas = _aristas_aleatorias(semilla)
+    grafo = _adyacencia(aristas)
+    csr = GrafoCSR.desde_adyacencia(grafo)
+    assert _mismo_csr(csr, GrafoCSR.desde_aristas(aristas))
+    assert _como_dict(csr) == _como_dict(grafo)
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_desde_indices_igual_a_desde_arreglos(semilla, monkeypatch):
+    aristas = _aristas_aleatorias(semilla)
+    esperado = GrafoCSR.desde_aristas(aristas)
+    indice = esperado.indice
+    origen = array("i", [indice[a] for a, _ in aristas])
+    destino = array("i", [indice[b] for _, b in aristas])
+
+    por_conteo = GrafoCSR._desde_arreglos(esperado.ids, origen, destino)
+    assert _mismo_csr(por_conteo, esperado)
+    assert _mismo_csr(GrafoCSR.desde_indices(esperado.ids, origen, destino), esperado)
+
+    # Sin NumPy se usa el ordenamiento por conteo y da lo mismo
+    monkeypatch.setattr(grafo_csr, "np", None)
+    assert _mismo_csr(GrafoCSR.desde_indices(esperado.ids, origen, destino), esperado)
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_subgrafo_igual_que_obtener_subgrafo(semilla):
+    aristas = _aristas_aleatorias(semilla)
+    grafo = _adyacencia(aristas)
+    csr = GrafoCSR.desde_aristas(aristas)
+    centrales = ["0", "1", "no existe"]
+    for saltos in (1, 2):
+        sub_dict, incluidos_dict = obtener_subgrafo(grafo, centrales, saltos)
+        sub_csr, incluidos_csr = obtener_subgrafo(csr, centrales, saltos)
+        assert incluidos_csr == incluidos_dict
+        assert dict(sub_csr) == dict(sub_dict)
+
+
+def test_pickle_reconstruye_el_indice():
+    csr = GrafoCSR.desde_aristas(_aristas_aleatorias(0))
+    copia = pickle.loads(pickle.dumps(csr))
+    assert _mismo_csr(copia, csr)
+    assert copia.indice == csr.indice
+
+
+def test_amistades_del_dataset():
+    archivo = os.path.join(DATASET, "amistades.xlsx")
+    if not os.path.exists(archivo):
+        pytest.skip("amistades.xlsx no esta en el repositorio")
+    aristas = [(str(a).strip(), str(b).strip())
+               for a, b in xlsx_stream.filas(archivo, 2, 2)
+               if a is not None and b is not None]
+    csr = GrafoCSR.desde_aristas(aristas)
+    assert _como_dict(csr) == _como_dict(_adyacencia(aristas))
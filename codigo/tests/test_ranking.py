@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from grafos import (contar_likes_por_post, max_post_por_likes_divide_venceras,
+                    merge_sort_posts_por_likes, obtener_top_posts)
+from indice_likes import IndiceLikes
+from ranking import RankingPosts, heapsort_por_likes, top_k_por_likes
+
+
+def _likes_aleatorios(semilla, n_posts=30, n_likes=400):
+    #Likes con pocos posts para que haya muchos empates
+    rnd = random.Random(semilla)
+    return [{"id_like": i, "id_usuario_like": str(rnd.randrange(50)),
+             "id_post": rnd.randrange(n_posts)} for i in range(n_likes)]
+
+
+def _referencia(conteo):
+    #Orden de grafos.py: MergeSort estable sobre el conteo por post
+    return merge_sort_posts_por_likes(list(conteo.items()))
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_top_igual_que_merge_sort(semilla):
+    ranking = RankingPosts()
+    conteo = {}
+    for like in _likes_aleatorios(semilla):
+        id_post = like["id_post"]
+        ranking.incrementar(id_post)
+        conteo[id_post] = conteo.get(id_post, 0) + 1
+
+        # El ranking se mantiene al dia con cada like
+        esperado = _referencia(conteo)
+        assert ranking.top(5) == esperado[:5]
+        assert ranking.maximo() == esperado[0]
+
+    assert ranking.top(len(conteo)) == _referencia(conteo)
+    assert ranking.top(len(conteo) + 10) == _referencia(conteo)
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_top_con_likes_quitados(semilla):
+    rnd = random.Random(semilla)
+    ranking = RankingPosts()
+    conteo = {}
+    for like in _likes_aleatorios(semilla):
+        id_post = like["id_post"]
+        cantidad = -1 if conteo.get(id_post, 0) > 0 and rnd.random() < 0.3 else 1
+        ranking.incrementar(id_post, cantidad)
+        conteo[id_post] = conteo.get(id_post, 0) + cantidad
+    assert ranking.top(len(conteo)) == _referencia(conteo)
+
+
+def test_empates_gana_el_primero_en_recibir_likes():
+    ranking = RankingPosts()
+    for id_post in (7, 3, 9, 3, 7, 9):
+        ranking.incrementar(id_post)
+    assert ranking.top(3) == [(7, 2), (3, 2), (9, 2)]
+    assert ranking.top(3) == merge_sort_posts_por_likes([(7, 2), (3, 2), (9, 2)])
+
+
+def test_construido_desde_conteo():
+    conteo = contar_likes_por_post(_likes_aleatorios(0))
+    assert RankingPosts(conteo).top(10) == _referencia(conteo)[:10]
+
+
+def test_top_vacio():
+    ranking = RankingPosts()
+    assert ranking.top(5) == []
+    assert ranking.maximo() is None
+    ranking.incrementar(1)
+    assert ranking.top(0) == []
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_top_k_y_heapsort_igual_que_merge_sort(semilla):
+    conteo = contar_likes_por_post(_likes_aleatorios(semilla))
+    items = list(conteo.items())
+    esperado = merge_sort_posts_por_likes(items)
+
+    # top_k respeta el orden de items en los empates, como el MergeSort
+    for k in (1, 5, len(items)):
+        assert top_k_por_likes(items, k) == esperado[:k]
+
+    # HeapSort no es estable: solo se compara la secuencia de likes
+    ordenados = heapsort_por_likes(list(items))
+    assert sorted(ordenados) == sorted(items)
+    assert [likes for _, likes in ordenados] == [likes for _, likes in esperado]
+
+    assert max_post_por_likes_divide_venceras(items) == esperado[0]
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_indice_likes_igual_que_obtener_top_posts(semilla):
+    likes = _likes_aleatorios(semilla)
+    indice = IndiceLikes(likes)
+
+    # IndiceLikes descarta los likes repetidos de un mismo usuario al mismo post
+    pares, unicos = set(), []
+    for like in likes:
+        par = (like["id_usuario_like"], like["id_post"])
+        if par not in pares:
+            pares.add(par)
+            unicos.append(like)
+
+    assert indice.top(5) == obtener_top_posts(unicos, 5)
+    assert len(indice) == len(unicos)
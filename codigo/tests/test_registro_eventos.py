@@ -0,0 +1,120 @@
+import os
+import shutil
+
+import pytest
+
+import registro_eventos
+import xlsx_stream
+from registro_eventos import RegistroEventos
+
+
+def _registro(carpeta):
+    #Registro de likes como el de grafos._registro_likes, sobre una carpeta temporal
+    archivo = os.path.join(carpeta, "likes.xlsx")
+
+    def cargar_base():
+        if not os.path.exists(archivo):
+            return []
+        return [(int(a), str(b), int(c)) for a, b, c in xlsx_stream.filas(archivo, 3, 2)
+                if a is not None]
+
+    return RegistroEventos(archivo, cargar_base, ["id_like", "id_usuario_like", "id_post"],
+                           "Likes", clave=lambda r: (r[1], r[2]))
+
+
+def _agregar_varios(registro, pares):
+    return [registro.agregar(usuario, post) for usuario, post in pares]
+
+
+PARES = [("u1", 1), ("u2", 1), ("u1", 2), ("u3", 5), ("u2", 7)]
+
+
+def test_replay_del_log(tmp_path):
+    registro = _registro(tmp_path)
+    assert _agregar_varios(registro, PARES) == [1, 2, 3, 4, 5]
+
+    # Otra instancia (la app reabierta) reconstruye lo mismo desde el log
+    releido = _registro(tmp_path)
+    assert releido.registros() == registro.registros()
+    assert releido.registros() == [(i + 1, u, p) for i, (u, p) in enumerate(PARES)]
+    assert releido.agregar("u1", 1) is None
+    assert releido.agregar("u9", 9) == 6
+
+
+def test_linea_incompleta_se_ignora(tmp_path):
+    registro = _registro(tmp_path)
+    _agregar_varios(registro, PARES[:2])
+    with open(registro.archivo_log, "a", encoding="utf-8") as f:
+        f.write('[3, "u1"')  # corte a mitad de escritura
+
+    releido = _registro(tmp_path)
+    assert releido.registros() == registro.registros()
+    assert releido.agregar("u4", 4) == 3
+    assert _registro(tmp_path).registros()[-1] == (3, "u4", 4)
+
+
+def test_eventos_posteriores(tmp_path):
+    registro = _registro(tmp_path)
+    _agregar_varios(registro, PARES)
+    assert registro.eventos_posteriores(3) == registro.registros()[3:]
+    assert registro.eventos_posteriores(5) == []
+
+
+def test_compactar_es_idempotente(tmp_path):
+    pytest.importorskip("openpyxl")
+    registro = _registro(tmp_path)
+    _agregar_varios(registro, PARES[:3])
+    esperado = registro.registros()
+
+    assert registro.compactar() == 3
+    assert not os.path.exists(registro.archivo_log)
+    assert registro.compactar() == 0
+    assert _registro(tmp_path).registros() == esperado
+
+    # Compactar de nuevo sobre un Excel existente solo agrega lo nuevo
+    _agregar_varios(registro, PARES[3:])
+    assert registro.compactar() == 2
+    releido = _registro(tmp_path)
+    assert releido.registros() == registro.registros()
+    assert releido.compactar() == 0
+    assert releido.agregar("u1", 2) is None
+
+
+def test_compactacion_interrumpida_no_duplica(tmp_path):
+    pytest.importorskip("openpyxl")
+    registro = _registro(tmp_path)
+    _agregar_varios(registro, PARES)
+    copia_log = os.path.join(tmp_path, "copia.log")
+    shutil.copy(registro.archivo_log, copia_log)
+    registro.compactar()
+
+    # El Excel se escribio pero el log no llego a borrarse
+    shutil.copy(copia_log, registro.archivo_log)
+    releido = _registro(tmp_path)
+    assert releido.registros() == registro.registros()
+    assert releido.compactar() == 0
+    assert releido.agregar("u8", 8) == 6
+    assert _registro(tmp_path).registros() == releido.registros()
+
+
+def test_compactacion_automatica(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    monkeypatch.setattr(registro_eventos, "COMPACTAR_CADA", 3)
+    registro = _registro(tmp_path)
+    _agregar_varios(registro, PARES)
+
+    # A los 3 eventos se vuelca al Excel; quedan 2 en el log
+    assert registro.eventos_posteriores(0) == registro.registros()[3:]
+    assert _registro(tmp_path).registros() == registro.registros()
+
+
+def test_usar_base(tmp_path):
+    registro = _registro(tmp_path)
+    _agregar_varios(registro, PARES)
+    base = registro.registros()[:2]
+
+    # Base leida en otro proceso: los eventos del log con id <= 2 se descartan
+    otro = _registro(tmp_path)
+    otro.usar_base(base)
+    assert otro.registros() == registro.registros()
+    assert otro.agregar("u1", 1) is None
@@ -0,0 +1,62 @@
+import os
+from datetime import date, datetime
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+import xlsx_stream
+from conftest import DATASET
+
+
+def _filas_openpyxl(archivo, columnas):
+    wb = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        return [fila for fila in wb.active.iter_rows(max_col=columnas, values_only=True)
+                if any(v is not None for v in fila)]
+    finally:
+        wb.close()
+
+
+def _filas_stream(archivo, columnas):
+    return [fila for fila in xlsx_stream.filas(archivo, columnas)
+            if any(v is not None for v in fila)]
+
+
+@pytest.mark.parametrize("nombre, columnas", [
+    ("usuarios.xlsx", 3),
+    ("amistades.xlsx", 2),
+    ("comunidades.xlsx", 3),
+    ("posts.xlsx", 3),
+    ("likes.xlsx", 3),
+])
+def test_mismos_valores_que_openpyxl(nombre, columnas):
+    archivo = os.path.join(DATASET, nombre)
+    assert _filas_stream(archivo, columnas) == _filas_openpyxl(archivo, columnas)
+
+
+def test_rango_de_filas():
+    archivo = os.path.join(DATASET, "amistades.xlsx")
+    todas = list(xlsx_stream.filas(archivo, 2))
+    assert list(xlsx_stream.filas(archivo, 2, 10, 19)) == todas[9:19]
+
+
+def test_ultima_fila():
+    archivo = os.path.join(DATASET, "amistades.xlsx")
+    wb = openpyxl.load_workbook(archivo, read_only=True)
+    try:
+        assert xlsx_stream.ultima_fila(archivo) == wb.active.max_row
+    finally:
+        wb.close()
+
+
+def test_tipos_de_celda(tmp_path):
+    #Fechas ISO (t="d"), booleanos, floats, textos en linea y celdas vacias
+    archivo = str(tmp_path / "tipos.xlsx")
+    wb = openpyxl.Workbook(iso_dates=True)
+    ws = wb.active
+    ws.append(["texto", 1, 2.5, True, datetime(2024, 3, 5, 10, 20, 30), date(2024, 3, 5)])
+    ws.append([None, -7, 1e-3, False, None, "ñandú"])
+    wb.save(archivo)
+
+    assert _filas_stream(archivo, 6) == _filas_openpyxl(archivo, 6)
@@ -0,0 +1,190 @@
+import posixpath
+import re
+import zipfile
+from datetime import date, datetime, time
+from xml.etree.ElementTree import iterparse, parse
+
+
+# Lectura en streaming de la hoja activa de un .xlsx
+#
+# Un .xlsx es un zip con XML. En vez de armar el modelo de celdas de
+# openpyxl se recorre el XML de la hoja con iterparse y cada <row> se
+# descarta apenas se lee, asi la memoria no depende de la cantidad de
+# filas. La tabla de textos compartidos (sharedStrings.xml) solo se lee
+# si aparece una celda de tipo texto. Los valores son los mismos que da
+# openpyxl con data_only=True y values_only=True (enteros, floats,
+# textos, booleanos y fechas ISO de las celdas t="d"; las fechas guardadas
+# como numero con formato de fecha llegan como numero, porque no se leen
+# los estilos).
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PAQUETE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+TIPO_TEXTOS = "/sharedStrings"
+
+_REFERENCIA = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _columna(letras):
+    #"A" -> 1, "B" -> 2, "AA" -> 27
+    numero = 0
+    for letra in letras:
+        numero = numero * 26 + ord(letra) - 64
+    return numero
+
+
+def _ruta_en_zip(destino):
+    #Los destinos de xl/_rels/workbook.xml.rels son relativos a xl/ (o absolutos)
+    if destino.startswith("/"):
+        return destino[1:]
+    return posixpath.normpath(posixpath.join("xl", destino))
+
+
+def _partes(zf):
+    """
+    Retorna (ruta de la hoja activa, ruta de sharedStrings.xml o None).
+    La hoja activa es la de <workbookView activeTab>, como wb.active.
+    """
+    relaciones = {}
+    with zf.open("xl/_rels/workbook.xml.rels") as f:
+        raiz = parse(f).getroot()
+    for rel in raiz.iter(f"{NS_PAQUETE}Relationship"):
+        relaciones[rel.get("Id")] = (rel.get("Type"), _ruta_en_zip(rel.get("Target")))
+
+    with zf.open("xl/workbook.xml") as f:
+        libro = parse(f).getroot()
+    vista = libro.find(f"{NS}bookViews/{NS}workbookView")
+    activa = int(vista.get("activeTab", 0)) if vista is not None else 0
+    hojas = libro.findall(f"{NS}sheets/{NS}sheet")
+    hoja = relaciones[hojas[activa].get(f"{NS_REL}id")][1]
+
+    textos = None
+    for tipo, ruta in relaciones.values():
+        if tipo.endswith(TIPO_TEXTOS):
+            textos = ruta
+    return hoja, textos
+
+
+class _TextosCompartidos:
+    #Lista de sharedStrings.xml que se lee la primera vez que se pide un texto
+    def __init__(self, zf, ruta):
+        self.zf = zf
+        self.ruta = ruta
+        self._textos = None
+
+    def __getitem__(self, i):
+        if self._textos is None:
+            self._textos = self._leer()
+        return self._textos[i]
+
+    def _leer(self):
+        textos = []
+        if self.ruta is None:
+            return textos
+        with self.zf.open(self.ruta) as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f"{NS}si":
+                    textos.append(_texto(elem))
+                    elem.clear()
+        return textos
+
+
+def _texto(elem):
+    #Texto de un <si> o <is>: <t> directo o runs <r><t>, sin la fonetica (<rPh>)
+    t = elem.find(f"{NS}t")
+    if t is not None:
+        return t.text or ""
+    return "".join(r.findtext(f"{NS}t", "") for r in elem.findall(f"{NS}r"))
+
+
+def _fecha_iso(texto):
+    #Celda t="d": fecha, hora o fecha y hora ISO 8601 (como from_ISO8601 de openpyxl)
+    try:
+        if "T" in texto:
+            return datetime.fromisoformat(texto.rstrip("Z"))
+        if ":" in texto:
+            return time.fromisoformat(texto.rstrip("Z"))
+        return date.fromisoformat(texto)
+    except ValueError:
+        return texto  # formato que no se reconoce: el texto tal cual
+
+
+def _valor(celda, textos):
+    #Valor de una <c> convertido como lo hace openpyxl
+    tipo = celda.get("t", "n")
+    if tipo == "inlineStr":
+        elem = celda.find(f"{NS}is")
+        return None if elem is None else _texto(elem)
+    texto = celda.findtext(f"{NS}v")
+    if not texto:
+        return None  # openpyxl tambien trata <v></v> como celda vacia
+    if tipo == "s":
+        return textos[int(texto)]
+    if tipo == "b":
+        return texto == "1"
+    if tipo == "d":
+        return _fecha_iso(texto)
+    if tipo in ("str", "e"):
+        return texto
+    if "." in texto or "E" in texto or "e" in texto:
+        return float(texto)
+    return int(texto)
+
+
+def filas(archivo, columnas, fila_inicio=1, fila_fin=None):
+    """
+    Genera las filas fila_inicio..fila_fin de la hoja activa como tuplas
+    de `columnas` valores (None en las celdas vacias), igual que
+    ws.iter_rows(min_row, max_row, max_col=columnas, values_only=True)
+    salvo que las filas que no estan en el XML se saltean.
+
+    Las filas anteriores a fila_inicio se pasan sin convertir sus celdas
+    y la lectura termina al pasar fila_fin.
+    """
+    with zipfile.ZipFile(archivo) as zf:
+        ruta_hoja, ruta_textos = _partes(zf)
+        textos = _TextosCompartidos(zf, ruta_textos)
+
+        with zf.open(ruta_hoja) as f:
+            contenedor = None
+            numero = 0
+            for evento, elem in iterparse(f, events=("start", "end")):
+                if evento == "start":
+                    if elem.tag == f"{NS}sheetData":
+                        contenedor = elem
+                    continue
+                if elem.tag != f"{NS}row":
+                    continue
+
+                numero = int(elem.get("r", numero + 1))
+                if fila_fin is not None and numero > fila_fin:
+                    break
+                if numero >= fila_inicio:
+                    valores = [None] * columnas
+                    columna = 0
+                    for celda in elem.iter(f"{NS}c"):
+                        referencia = _REFERENCIA.match(celda.get("r", ""))
+                        columna = _columna(referencia.group(1)) if referencia else columna + 1
+                        if columna <= columnas:
+                            valores[columna - 1] = _valor(celda, textos)
+                    yield tuple(valores)
+
+                # La fila ya se leyo: se suelta para no acumular el arbol
+                if contenedor is not None:
+                    contenedor.clear()
+                else:
+                    elem.clear()
+
+
+def ultima_fila(archivo):
+    #Ultima fila segun <dimension ref="A1:B100"> de la hoja activa (None si no esta)
+    with zipfile.ZipFile(archivo) as zf:
+        ruta_hoja, _ = _partes(zf)
+        with zf.open(ruta_hoja) as f:
+            for evento, elem in iterparse(f, events=("start",)):
+                if elem.tag == f"{NS}dimension":
+                    numeros = _REFERENCIA.findall(elem.get("ref", ""))
+                    return int(numeros[-1][1]) if numeros else None
+                if elem.tag == f"{NS}sheetData":
+                    return None
+    return None